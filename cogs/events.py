@@ -1,6 +1,8 @@
 import os
 import json
-import random
+import time
+import asyncio
+from collections import Counter
 import discord
 from discord.ext import commands, tasks
 from datetime import datetime, timezone
@@ -10,21 +12,31 @@ from cogs.utils.pollUtils import (
     init_db,
     load_active_polls,
     PollView,
+    VoteState,
     record_poll_result,
-    purge_finished_polls,
+    archive_finished_polls,
+    POLL_ARCHIVE_SECONDS,
+    compact_vote_journal,
+    VOTE_JOURNAL_COMPACT_SECONDS,
+    POLL_VIEW_VERSION,
+    mark_poll_view_version,
 )
+from cogs.utils.content_bank import ContentBank, load_numbered_lines
+
+POLL_RESTORE_CONCURRENCY = 5
 
 class Events(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self._polls_restored = False
         self.anime_list_path = os.path.join(
             os.path.dirname(os.path.dirname(__file__)), "data", "animelist.txt"
         )
+        self.anime_titles = ContentBank(self.anime_list_path, fields=("title",), loader=load_numbered_lines, name="AnimeList")
         try:
-            with open(self.anime_list_path, "r", encoding="utf-8") as f:
-                self.anime_list = [line.split(". ")[1].strip() for line in f.readlines() if ". " in line]
-        except Exception:
-            self.anime_list = []
+            self.anime_titles.load()
+        except (OSError, ValueError) as e:
+            print(f"[AnimeList] Failed to load titles: {e}")
 
     async def _parse_options(self, raw) -> list:
         if raw is None:
@@ -82,30 +94,20 @@ class Events(commands.Cog):
         except Exception:
             return None
 
-    def _compute_results_from_votes(self, votes_raw: Dict[str, list[int]]) -> tuple[dict[str, int], list[str]]:
-        counts: dict[str, int] = {}
-        if not votes_raw:
-            return counts, []
-        for opt, uids in votes_raw.items():
-            try:
-                size = len(uids) if uids is not None else 0
-            except TypeError:
-                size = 0
-            counts[str(opt)] = int(size)
+    def _compute_results_from_votes(self, options: list, votes_raw: Dict[str, list[int]]) -> tuple[dict[str, int], list[str]]:
+        counts = VoteState.restore(options, votes_raw).results(options)
         winners = []
         if counts:
             max_votes = max(counts.values())
             winners = [opt for opt, c in counts.items() if c == max_votes]
         return counts, winners
 
-    async def _get_author_member(self, guild: discord.Guild, author_id: Optional[int]) -> discord.Member:
+    @staticmethod
+    def _get_author_member(guild: discord.Guild, author_id: Optional[int]) -> discord.abc.Snowflake:
+        # PollView only compares author ids, so an uncached author does not need a REST fetch.
         if author_id:
             try:
-                member = guild.get_member(int(author_id))
-                if not member:
-                    member = await guild.fetch_member(int(author_id))
-                if member:
-                    return member
+                return guild.get_member(int(author_id)) or discord.Object(id=int(author_id))
             except Exception:
                 pass
         return guild.me
@@ -114,15 +116,16 @@ class Events(commands.Cog):
         self,
         *,
         guild: Optional[discord.Guild],
-        msg: Optional[discord.Message],
+        msg: Optional[discord.PartialMessage],
         message_id: int,
         question: str,
         options: list,
         sanitized_votes: Dict[str, list[int]],
         end_time: Optional[float],
         author_id: Optional[int],
-    ) -> None:
-        counts, winners = self._compute_results_from_votes(sanitized_votes)
+        chart: bool = False,
+    ) -> str:
+        counts, winners = self._compute_results_from_votes(options, sanitized_votes)
         try:
             await record_poll_result(
                 message_id=message_id,
@@ -135,13 +138,13 @@ class Events(commands.Cog):
 
         if not msg:
             print(f"[Poll Reload] expired poll {message_id} finalized without message (no message to edit).")
-            return
+            return "finalized"
 
         try:
             assert guild is not None
-            author_member = await self._get_author_member(guild, author_id)
-            view = PollView(question=question or "Poll", options=options, author=author_member, timeout=None)
-            view.votes = {opt: set(uids) for opt, uids in sanitized_votes.items()}
+            author_member = self._get_author_member(guild, author_id)
+            view = PollView(question=question or "Poll", options=options, author=author_member, timeout=None, chart=chart)
+            view.votes = VoteState.restore(view.options, sanitized_votes)
             try:
                 view.end_time = datetime.fromtimestamp(float(end_time), timezone.utc) if end_time else None
             except Exception:
@@ -151,39 +154,47 @@ class Events(commands.Cog):
             print(f"[Poll Reload] finalized expired poll {message_id} (edited message).")
         except Exception as e:
             print(f"[Poll Reload] failed to finalize expired poll {message_id} via message edit: {e}")
+        return "finalized"
 
     async def _restore_active_poll(
         self,
         *,
         guild: discord.Guild,
-        msg: Optional[discord.Message],
+        msg: Optional[discord.PartialMessage],
         message_id: int,
         question: str,
         options: list,
         sanitized_votes: Dict[str, list[int]],
         remaining_seconds: Optional[int],
         author_id: Optional[int],
-    ) -> None:
+        legacy: bool,
+        chart: bool = False,
+    ) -> str:
         try:
-            author_member = await self._get_author_member(guild, author_id)
             view = PollView(
                 question=question or "Poll",
                 options=options,
-                author=author_member,
+                author=self._get_author_member(guild, author_id),
                 timeout=remaining_seconds,
+                chart=chart,
             )
-            view.votes = {opt: set(uids) for opt, uids in sanitized_votes.items()}
+            view.votes = VoteState.restore(view.options, sanitized_votes)
+            view.message = msg
+            self.bot.add_view(view, message_id=int(message_id))
+            if not legacy:
+                return "restored"
+            # Messages posted before custom_ids were fixed need their components replaced once.
             if msg:
-                view.message = msg
                 try:
                     await msg.edit(view=view)
+                    await mark_poll_view_version(message_id)
                 except Exception as e:
-                    print(f"[Poll Reload] failed to attach view to message {message_id}: {e}")
-            else:
-                print(f"[Poll Reload] message not found for active poll {message_id}; view created in memory only.")
-            print(f"♻️ Reloaded poll {message_id} (remaining: {remaining_seconds}s).")
+                    print(f"[Poll Reload] failed to attach view to legacy poll {message_id}: {e}")
+                    return "failed"
+            return "legacy"
         except Exception as e:
             print(f"[Poll Reload Error] failed to restore active poll {message_id}: {e}")
+            return "failed"
 
     @staticmethod
     def _is_expired(remaining_seconds: Optional[int]) -> bool:
@@ -203,20 +214,17 @@ class Events(commands.Cog):
             return None
 
     @staticmethod
-    async def _try_fetch_message(channel: Optional[discord.TextChannel], message_id: int) -> Optional[discord.Message]:
-        if not channel:
-            return None
-        try:
-            return await channel.fetch_message(int(message_id))
-        except Exception:
-            print(f"[Poll Reload] message {message_id} not found in channel {channel.id}.")
+    def _partial_message(channel: Optional[discord.abc.GuildChannel], message_id: int) -> Optional[discord.PartialMessage]:
+        getter = getattr(channel, "get_partial_message", None)
+        if getter is None:
             return None
+        return getter(int(message_id))
 
     async def _finalize_or_restore(
         self,
         *,
         guild: Optional[discord.Guild],
-        msg: Optional[discord.Message],
+        msg: Optional[discord.PartialMessage],
         message_id: int,
         question: str,
         options: list,
@@ -224,9 +232,11 @@ class Events(commands.Cog):
         remaining_seconds: Optional[int],
         end_time: Optional[float],
         author_id: Optional[int],
-    ) -> None:
+        legacy: bool,
+        chart: bool = False,
+    ) -> str:
         if self._is_expired(remaining_seconds):
-            await self._finalize_expired_poll(
+            return await self._finalize_expired_poll(
                 guild=guild,
                 msg=msg,
                 message_id=message_id,
@@ -235,12 +245,13 @@ class Events(commands.Cog):
                 sanitized_votes=sanitized_votes,
                 end_time=end_time,
                 author_id=author_id,
+                chart=chart,
             )
         else:
             if guild is None:
                 print(f"[Poll Reload] cannot restore active poll {message_id} without guild.")
-                return
-            await self._restore_active_poll(
+                return "skipped"
+            return await self._restore_active_poll(
                 guild=guild,
                 msg=msg,
                 message_id=message_id,
@@ -249,9 +260,11 @@ class Events(commands.Cog):
                 sanitized_votes=sanitized_votes,
                 remaining_seconds=remaining_seconds,
                 author_id=author_id,
+                legacy=legacy,
+                chart=chart,
             )
 
-    async def _reconstruct_poll(self, row: Dict[str, Any]) -> None:
+    async def _reconstruct_poll(self, row: Dict[str, Any]) -> str:
         try:
             message_id = row.get("message_id")
             guild_id = row.get("guild_id")
@@ -262,12 +275,14 @@ class Events(commands.Cog):
             votes_json = row.get("votes")
             end_time = row.get("end_time")
             ended = row.get("ended")
+            legacy = (row.get("view_version") or 0) < POLL_VIEW_VERSION
+            chart = bool(row.get("chart"))
         except Exception:
             print("[Poll Reload] skipping row due to unexpected shape:", row)
-            return
+            return "skipped"
 
         if ended:
-            return
+            return "skipped"
 
         options = await self._parse_options(options_json)
         votes_raw = await self._parse_votes(votes_json)
@@ -278,7 +293,7 @@ class Events(commands.Cog):
         if not guild:
             print(f"[Poll Reload] guild {guild_id} not found for poll {message_id}, skipping restore.")
             if self._is_expired(remaining_seconds):
-                await self._finalize_expired_poll(
+                return await self._finalize_expired_poll(
                     guild=None,
                     msg=None,
                     message_id=message_id,
@@ -288,13 +303,13 @@ class Events(commands.Cog):
                     end_time=end_time,
                     author_id=author_id,
                 )
-            return
+            return "skipped"
 
         channel = self._get_channel(guild, channel_id)
         if not channel:
             print(f"[Poll Reload] channel {channel_id} not found in guild {guild.id} for poll {message_id}, skipping.")
             if self._is_expired(remaining_seconds):
-                await self._finalize_expired_poll(
+                return await self._finalize_expired_poll(
                     guild=guild,
                     msg=None,
                     message_id=message_id,
@@ -304,10 +319,10 @@ class Events(commands.Cog):
                     end_time=end_time,
                     author_id=author_id,
                 )
-            return
+            return "skipped"
 
-        msg = await self._try_fetch_message(channel, message_id)
-        await self._finalize_or_restore(
+        msg = self._partial_message(channel, message_id)
+        return await self._finalize_or_restore(
             guild=guild,
             msg=msg,
             message_id=message_id,
@@ -317,8 +332,30 @@ class Events(commands.Cog):
             remaining_seconds=remaining_seconds,
             end_time=end_time,
             author_id=author_id,
+            legacy=legacy,
+            chart=chart,
         )
 
+    async def _restore_polls(self, rows: list):
+        started = time.perf_counter()
+        outcomes: Counter = Counter()
+        # Only legacy edits and expired polls touch the REST API; the semaphore keeps those
+        # bursts within Discord's per-route limits while the rest attach instantly.
+        slots = asyncio.Semaphore(POLL_RESTORE_CONCURRENCY)
+
+        async def restore(row):
+            async with slots:
+                try:
+                    outcomes[await self._reconstruct_poll(row)] += 1
+                except Exception as e:
+                    outcomes["failed"] += 1
+                    print(f"[Poll Reload] unexpected error reconstructing a poll: {e}")
+
+        await asyncio.gather(*(restore(row) for row in rows))
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{outcomes[k]} {k}" for k in ("restored", "legacy", "finalized", "skipped", "failed") if outcomes[k])
+        print(f"♻️ Restored {len(rows)} poll(s) in {elapsed:.2f}s ({summary or 'nothing to do'}).")
+
     @commands.Cog.listener()
     async def on_ready(self):
         try:
@@ -326,32 +363,30 @@ class Events(commands.Cog):
         except Exception as e:
             print(f"[DB Init Error] {e}")
 
-        try:
-            rows = await load_active_polls()
-        except Exception as e:
-            print(f"[Poll Reload Error - load_active_polls] {e}")
-            rows = []
-
-        for row in rows:
+        if not self._polls_restored:
+            self._polls_restored = True
             try:
-                await self._reconstruct_poll(row)
+                rows = await load_active_polls()
             except Exception as e:
-                print(f"[Poll Reload] unexpected error reconstructing a poll: {e}")
+                print(f"[Poll Reload Error - load_active_polls] {e}")
+                rows = []
+            await self._restore_polls(rows)
 
-        try:
-            await purge_finished_polls()
-        except Exception as e:
-            print(f"[Poll Reload] failed to purge finished polls: {e}")
+        if not self.poll_archive_task.is_running():
+            self.poll_archive_task.start()
 
+        if not self.vote_journal_task.is_running():
+            self.vote_journal_task.start()
         if not self.status_task.is_running():
             self.status_task.start()
-        print(f"🟣 Presence rotation started as {self.bot.user} | {len(self.anime_list)} titles loaded")
+        print(f"🟣 Presence rotation started as {self.bot.user} | {len(self.anime_titles)} titles loaded")
 
     @tasks.loop(seconds=1200)
     async def status_task(self):
-        if not self.anime_list:
+        picked = self.anime_titles.draw("presence")
+        if not picked:
             return
-        anime = random.choice(self.anime_list)
+        anime = picked["title"]
         try:
             await self.bot.change_presence(
                 activity=discord.Activity(type=discord.ActivityType.watching, name=anime)
@@ -359,9 +394,27 @@ class Events(commands.Cog):
         except Exception:
             pass
 
+    @tasks.loop(seconds=VOTE_JOURNAL_COMPACT_SECONDS)
+    async def vote_journal_task(self):
+        try:
+            await compact_vote_journal()
+        except Exception as e:
+            print(f"[Poll DB] vote journal compaction failed: {e}")
+
+    @tasks.loop(seconds=POLL_ARCHIVE_SECONDS)
+    async def poll_archive_task(self):
+        try:
+            archived = await archive_finished_polls()
+            if archived:
+                print(f"[Poll DB] archived {archived} finished poll(s).")
+        except Exception as e:
+            print(f"[Poll DB] poll archival failed: {e}")
+
     def cog_unload(self):
         try:
             self.status_task.cancel()
+            self.vote_journal_task.cancel()
+            self.poll_archive_task.cancel()
         except Exception:
             pass
 
@@ -1,17 +1,16 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import aiohttp
 import asyncio
 import random
-import json
 import os
 import time
-from itertools import cycle
 from typing import Dict, Optional, Any
 from cogs.utils.pollUtils import PollInputModal
+from cogs.utils.content_bank import ContentBank
 
 FALSE_GAMBLE_SESSION = "⚠️ This is not your gamble session."
+WAIFU_URL = os.getenv("MINORI_WAIFU_URL", "https://api.waifu.pics/sfw/waifu")
 
 class Fun(commands.Cog):
     def __init__(self, bot):
@@ -25,20 +24,11 @@ class Fun(commands.Cog):
         self.GAMBLE_COOLDOWN_SECONDS = 5 * 60  
 
         self.data_path = os.path.join(os.path.dirname(__file__), "..", "data", "quotes.json")
+        self.quote_bank = ContentBank(self.data_path, fields=("quote", "character"), category_field="anime", name="QuoteBank")
         try:
-            with open(self.data_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            data = {}
-
-        if isinstance(data, dict):
-            self.quotes_dict = data
-        elif isinstance(data, list):
-            self.quotes_dict = {"Mixed": data}
-        else:
-            self.quotes_dict = {"Mixed": []}
-
-        self.used_quotes = set()
+            self.quote_bank.load()
+        except (OSError, ValueError) as e:
+            print(f"[QuoteBank] Failed to load quotes: {e}")
 
     async def _send(
         self,
@@ -96,40 +86,16 @@ class Fun(commands.Cog):
     def _get_active_view(self, guild_id: int, user_id: int) -> Optional["Fun.GambleView"]:
         return self.active_views.get(guild_id, {}).get(user_id)
 
-    def get_balanced_quotes(self, num_quotes: int):
-        titles = list(self.quotes_dict.keys())
-        if not titles:
-            return []
-
-        random.shuffle(titles)
-        quotes = []
-        title_cycle = cycle(titles)
-
-        while len(quotes) < num_quotes:
-            title = next(title_cycle)
-            cat_list = self.quotes_dict.get(title, [])
-            available = [q for q in cat_list if q.get("quote") and q["quote"] not in self.used_quotes]
-            if available:
-                q = random.choice(available)
-                self.used_quotes.add(q["quote"])
-                quotes.append({"anime": title, **q})
-
-            total_quotes = sum(len(qs) for qs in self.quotes_dict.values())
-            if total_quotes and len(self.used_quotes) >= total_quotes:
-                self.used_quotes.clear()
-
-        return quotes
+    def get_balanced_quotes(self, num_quotes: int, channel_id: Optional[int] = None):
+        return self.quote_bank.sample(channel_id or 0, num_quotes)
 
     @commands.hybrid_command(name="waifu", description="Get a random waifu image")
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def waifu(self, ctx):
-        url = "https://api.waifu.pics/sfw/waifu"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return await ctx.send("❌ Couldn't fetch a waifu image. Try again.")
-                data = await resp.json()
+        async with self.bot.http_session.get(WAIFU_URL) as resp:
+            if resp.status != 200:
+                return await ctx.send("❌ Couldn't fetch a waifu image. Try again.")
+            data = await resp.json()
 
         image_url = data.get("url")
         if not image_url:
@@ -141,8 +107,11 @@ class Fun(commands.Cog):
 
     @commands.hybrid_command(name="poll", description="Create a poll with custom options")
     @commands.guild_only()
-    @app_commands.describe(duration="How long should the poll last in minutes?")
-    async def poll(self, ctx: commands.Context, duration: int):
+    @app_commands.describe(
+        duration="How long should the poll last in minutes?",
+        chart="Show results as a rendered chart image instead of emoji bars",
+    )
+    async def poll(self, ctx: commands.Context, duration: int, chart: bool = False):
         if not getattr(ctx, "interaction", None):
             return await ctx.send(
                 "<:MinoriConfused:1415707082988060874> Please use the slash (/) version of this command so the bot can open modals."
@@ -160,7 +129,7 @@ class Fun(commands.Cog):
             )
 
         timeout_seconds = duration * 60
-        poll_modal = PollInputModal(ctx, timeout_seconds=timeout_seconds)
+        poll_modal = PollInputModal(ctx, timeout_seconds=timeout_seconds, chart=chart)
         await ctx.interaction.response.send_modal(poll_modal)
 
     async def _process_gamble(
@@ -191,31 +160,11 @@ class Fun(commands.Cog):
             except (discord.HTTPException, discord.Forbidden, discord.NotFound):
                 pass
 
-        async def _settle_win(pre_balance_val: int) -> Optional[str]:
-            try:
-                await progression_cog.add_coins(user_id, guild_id, amount * 2)
-                if amount == pre_balance_val:
-                    return "<:MinoriAmazed:1416024121837490256> WOOOAA JACKPOT! You just doubled everything you own!"
-                return f"<:MinoriAmazed:1416024121837490256> You won {amount} <:Coins:1415353285270966403>!"
-            except Exception:
-                try:
-                    await progression_cog.add_coins(user_id, guild_id, amount)
-                except Exception:
-                    pass
-                await self._send(
-                    ctx,
-                    interaction,
-                    "❌ An error occurred while settling your win. We've attempted to refund your bet; contact an admin.",
-                    ephemeral=True,
-                )
-                return None
-
-        async def _refresh_prompt_with_balance() -> None:
+        async def _refresh_prompt_with_balance(updated: int) -> None:
             try:
                 vo_inner = self._get_active_view(guild_id, user_id)
                 if not vo_inner or not vo_inner.message:
                     return
-                updated = await progression_cog.get_coins(user_id, guild_id)
                 await vo_inner.message.edit(
                     content=f"You have {updated} <:Coins:1415353285270966403>. Select amount to gamble:",
                     view=vo_inner,
@@ -231,32 +180,41 @@ class Fun(commands.Cog):
         if view_obj:
             view_obj.reset_timeout()
 
-        pre_balance = await progression_cog.get_coins(user_id, guild_id)
-        reserved = await progression_cog.reserve_coins(user_id, guild_id, amount)
-        if not reserved:
+        def _roll(pre_balance_val: int) -> bool:
+            base_chance = 0.5
+            bet_ratio = (amount / pre_balance_val) if pre_balance_val else 1
+            win_chance = max(0.201, base_chance - bet_ratio * 0.5)
+            return random.random() < win_chance
+
+        try:
+            settled = await progression_cog.settle_bet(user_id, guild_id, amount, _roll)
+        except Exception:
+            await self._send(
+                ctx,
+                interaction,
+                "❌ An error occurred while settling your bet. No coins were taken; please try again.",
+                ephemeral=True,
+            )
+            return
+        if settled is None:
             await _insufficient_funds()
             return
+        won, pre_balance, new_balance = settled
 
-        base_chance = 0.5
-        bet_ratio = (amount / pre_balance) if pre_balance else 1
-        win_chance = max(0.201, base_chance - bet_ratio * 0.5)
-        won = random.random() < win_chance
-
-        if won:
-            result_text = await _settle_win(pre_balance)
-            if result_text is None:
-                return
-        else:
+        if not won:
             result_text = f"<:MinoriDissapointed:1416016691430821958> You lost {amount} <:Coins:1415353285270966403>."
+        elif amount == pre_balance:
+            result_text = "<:MinoriAmazed:1416024121837490256> WOOOAA JACKPOT! You just doubled everything you own!"
+        else:
+            result_text = f"<:MinoriAmazed:1416024121837490256> You won {amount} <:Coins:1415353285270966403>!"
 
-        new_balance = await progression_cog.get_coins(user_id, guild_id)
         await self._send(
             ctx,
             interaction,
             f"{result_text} Your new balance: {new_balance:,} <:Coins:1415353285270966403>.",
         )
 
-        await _refresh_prompt_with_balance()
+        await _refresh_prompt_with_balance(new_balance)
 
         count = self._count_attempt(guild_id, user_id)
         if count >= self.GAMBLE_MAX_ATTEMPTS:
@@ -600,11 +558,10 @@ class Fun(commands.Cog):
 
     @commands.hybrid_command(name="animequotes", description="Give a random anime quote")
     async def animequotes(self, ctx: commands.Context):
-        async with self.lock:
-            result = self.get_balanced_quotes(1)
-            if not result:
-                return await ctx.send("❌ No quotes available.")
-            q = result[0]
+        result = self.get_balanced_quotes(1, ctx.channel.id if ctx.channel else None)
+        if not result:
+            return await ctx.send("❌ No quotes available.")
+        q = result[0]
 
         quote_text = q.get("quote", "")[:1900]
         character = q.get("character", "Unknown")
@@ -1,49 +1,39 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import random
 import asyncio
-import json
 import os
-from itertools import cycle
 
-from cogs.utils.anime_api import fetch_random_character, build_character_select_options
+from cogs.utils.anime_api import fetch_random_character, build_character_select_options, character_select_options
+from cogs.utils.character_pool import CharacterPool
+from cogs.utils.trivia_bank import TriviaBank
 from cogs.utils.game_text import random_win_message, random_lose_message, compute_rewards, award_rewards
 
 class Games(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.data_path = os.path.join(os.path.dirname(__file__), "..", "data", "trivia.json")
-        with open(self.data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        self.trivia_bank = TriviaBank(self.data_path)
 
-        if isinstance(data, dict):
-            self.trivia_dict = data
-        elif isinstance(data, list):
-            self.trivia_dict = {"Mixed": data}
-        else:
-            self.trivia_dict = {"Mixed": []}
-
-        self.used_questions = set()
+        self.character_pool = CharacterPool()
+        self.character_pool.load()
+        self.refresh_character_pool.start()
 
-    def get_balanced_questions(self, num_questions: int):
-        titles = list(self.trivia_dict.keys())
-        random.shuffle(titles)
-        questions = []
-        title_cycle = cycle(titles)
+    async def cog_unload(self):
+        self.refresh_character_pool.cancel()
 
-        while len(questions) < num_questions:
-            title = next(title_cycle)
-            available = [q for q in self.trivia_dict[title] if q["question"] not in self.used_questions]
-            if available:
-                q = random.choice(available)
-                self.used_questions.add(q["question"])
-                questions.append(q)
+    @tasks.loop(hours=6)
+    async def refresh_character_pool(self):
+        if self.character_pool.is_stale():
+            await self.character_pool.refill(session=self.bot.http_session)
 
-            if len(self.used_questions) >= sum(len(qs) for qs in self.trivia_dict.values()):
-                self.used_questions.clear()
+    @refresh_character_pool.before_loop
+    async def before_refresh_character_pool(self):
+        await self.bot.wait_until_ready()
 
-        return questions
+    def get_balanced_questions(self, num_questions: int, guild_id: int = None):
+        return self.trivia_bank.sample(guild_id, num_questions)
 
     async def _handle_correct_answer(
         self,
@@ -84,7 +74,7 @@ class Games(commands.Cog):
     ])
     async def animequiz(self, ctx, questions: app_commands.Choice[int]):
         num_questions = questions.value
-        quiz_questions = self.get_balanced_questions(num_questions)
+        quiz_questions = self.get_balanced_questions(num_questions, ctx.guild.id)
         score = 0
 
         for idx, question in enumerate(quiz_questions, 1):
@@ -148,21 +138,25 @@ class Games(commands.Cog):
     @commands.hybrid_command(name="guesscharacter", description="Guess a random popular anime character")
     @commands.guild_only()
     async def guesscharacter(self, ctx):
-        try:
-            character = await fetch_random_character(prefer="AniList")
-        except Exception:
-            return await ctx.send("❌ Couldn't fetch characters from any API. Please try again later.")
+        picked = self.character_pool.pick_game()
+        if picked:
+            character, wrong_names = picked
+            options_list = character_select_options(character["name"], wrong_names)
+        else:
+            try:
+                character = await fetch_random_character(prefer="AniList", session=self.bot.http_session)
+            except Exception:
+                return await ctx.send("❌ Couldn't fetch characters from any API. Please try again later.")
+            try:
+                options_list = await build_character_select_options(character["name"], character["source"], session=self.bot.http_session)
+            except Exception:
+                return await ctx.send("❌ Failed to fetch options for the quiz. Please try again.")
 
         correct_name = character["name"]
         image = character["image"]
         anime_title = character["anime"]
         source = character["source"]
 
-        try:
-            options_list = await build_character_select_options(correct_name, source)
-        except Exception:
-            return await ctx.send("❌ Failed to fetch options for the quiz. Please try again.")
-
         embed = discord.Embed(title="Guess the character!", description=f"From **{anime_title}**")
         embed.set_image(url=image)
         embed.set_footer(text=f"Source: {source}")
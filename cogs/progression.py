@@ -7,12 +7,20 @@ import asyncio
 import traceback
 import io
 from discord import MessageReference
-from cogs.utils.progUtils import render_profile_image, get_title, get_title_emoji, TITLE_COLORS, create_leaderboard_image
-from cogs.utils.constants import BG_PATH, EMOJI_PATH, FONTS, TITLE_EMOJI_FILES
+from typing import Optional, Tuple
+from cogs.utils.progUtils import render_profile_image, render_animated_profile_image, create_leaderboard_image
+from cogs.utils.titles import get_title, get_title_emoji, has_badge, TITLE_COLORS, TITLE_EMOJI_FILES
+from cogs.utils.constants import BG_PATH, EMOJI_PATH, FONTS
+from cogs.utils.avatar_fetch import AvatarFetcher
+from cogs.utils.ledger import Ledger, LedgerEntry
 from cogs.trading import format_coins
 
 
 PROFILE_PNG = "profile.png"
+PROFILE_GIF = "profile.gif"
+PROFILE_RENDER_DEADLINE = 5.0
+AVATAR_FETCH_TIMEOUT = 3.0
+AVATAR_FETCH_MIN_TIMEOUT = 0.5
 ATTACHMENT_PROFILE = f"attachment://{PROFILE_PNG}"
 SQL_INSERT_OR_IGNORE_USER_COINS_ZERO = "INSERT OR IGNORE INTO user_coins (user_id, guild_id, coins) VALUES (?, ?, 0)"
 COINS_EMOJI = "<:Coins:1415353285270966403>"
@@ -101,7 +109,7 @@ class SubThemeSelect(discord.ui.Select):
         title_name = get_title(level)
         next_exp = None if level >= self.cog.MAX_LEVEL else 50 * level + 20 * level**2
 
-        avatar_bytes = await member.display_avatar.with_size(128).read()
+        avatar_bytes = await self.cog._fetch_avatar_bytes(member, size=128)
 
         img_bytes = await asyncio.to_thread(
             render_profile_image,
@@ -146,6 +154,9 @@ class Progression(commands.Cog):
         self.db_path = data_path
         self.conn: aiosqlite.Connection | None = None
         self.db_lock = asyncio.Lock()
+        self.ledger: Ledger | None = None
+        self._animated_render_slot = asyncio.Semaphore(1)
+        self.avatar_fetcher = AvatarFetcher()
 
     async def cog_load(self):
         self.conn = await aiosqlite.connect(self.db_path)
@@ -177,9 +188,13 @@ class Progression(commands.Cog):
         )
         """)
         await self.conn.commit()
+        self.ledger = Ledger(self.conn, self.db_lock)
+        await self.ledger.init()
 
     async def cog_unload(self):
         try:
+            if self.ledger:
+                await self.ledger.close()
             if self.conn:
                 await self.conn.close()
         except Exception:
@@ -200,27 +215,63 @@ class Progression(commands.Cog):
             return await ctx.send(*args, **kwargs)
     
     async def _fetch_avatar_bytes(self, member_or_user, size=128, timeout=3.0):
-        try:
-            return await asyncio.wait_for(member_or_user.display_avatar.with_size(size).read(), timeout=timeout)
-        except Exception as e:
-            print(f"[avatar_fetch] failed for {getattr(member_or_user,'id',None)}: {e}")
-            return b""
+        return await self.avatar_fetcher.fetch(member_or_user, size=size, deadline=timeout)
+
+    async def _render_animated_profile(self, member, deadline, title_name, level, exp, next_exp, theme_name, bg_file, font_color, user_rank):
+        """Returns (gif_bytes, avatar_bytes); the avatar bytes are kept so a static fallback needn't refetch."""
+        avatar = member.display_avatar
+        if not avatar.is_animated() or self._animated_render_slot.locked():
+            return None, None
+        loop = asyncio.get_running_loop()
+        avatar_bytes = None
+        async with self._animated_render_slot:
+            try:
+                avatar_bytes = await asyncio.wait_for(
+                    avatar.with_format("gif").with_size(128).read(),
+                    timeout=max(0.0, min(AVATAR_FETCH_TIMEOUT, deadline - loop.time()))
+                )
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None, avatar_bytes
+                # The renderer enforces time_budget between frames, so the worker thread
+                # winds down near the deadline instead of encoding on after we give up.
+                gif_bytes = await asyncio.wait_for(
+                    asyncio.to_thread(
+                        render_animated_profile_image,
+                        avatar_bytes,
+                        member.display_name,
+                        title_name,
+                        level,
+                        exp,
+                        next_exp,
+                        FONTS,
+                        TITLE_EMOJI_FILES,
+                        bg_file=bg_file,
+                        theme_name=theme_name,
+                        font_color=font_color,
+                        user_rank=user_rank,
+                        time_budget=remaining
+                    ),
+                    timeout=remaining
+                )
+                return gif_bytes, avatar_bytes
+            except Exception as e:
+                print(f"[profile] animated render fell back to static for {member.id}: {e!r}")
+                return None, avatar_bytes
 
     async def _build_rows_data(self, ctx, rows, avatar_size=128, avatar_timeout=3.0):
         meta = [(idx, user_id, level, exp) for idx, (user_id, level, exp) in enumerate(rows, start=1)]
 
+        infos = await self.bot.member_cache.resolve_many(ctx.guild, [user_id for _, user_id, _, _ in meta])
+
         async def get_name_and_avatar(user_id: int) -> tuple[str, bytes]:
-            member = ctx.guild.get_member(user_id)
-            if member:
-                name = member.display_name
-                return name, await self._fetch_avatar_bytes(member, size=avatar_size, timeout=avatar_timeout)
-            try:
-                user = await self.bot.fetch_user(user_id)
-                name = user.name
-                return name, await self._fetch_avatar_bytes(user, size=avatar_size, timeout=avatar_timeout)
-            except Exception as e:
-                print(f"[avatar_fetch] failed for user {user_id}: {e}")
-                return f"User {user_id}", b""
+            info = infos.get(user_id)
+            if info is None:
+                return f"User {user_id}", self.avatar_fetcher.placeholder(user_id)
+            avatar_bytes = await self.avatar_fetcher.fetch_asset(
+                info.avatar.with_size(avatar_size), user_id=user_id, deadline=avatar_timeout
+            )
+            return info.display_name, avatar_bytes
 
         tasks = [get_name_and_avatar(user_id) for _, user_id, _, _ in meta]
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -256,51 +307,60 @@ class Progression(commands.Cog):
                 return 0
             return int(row[0])
 
-    async def add_coins(self, user_id: int, guild_id: int, amount: int):
+    async def add_coins(self, user_id: int, guild_id: int, amount: int, kind: str = "reward"):
+        amount = int(amount)
         if amount == 0:
             return
+        if amount < 0:
+            await self.try_debit(user_id, guild_id, -amount, kind=kind)
+            return
+        await self.ledger.post(LedgerEntry(user_id, guild_id, kind, coins=amount))
+
+    async def credit(self, user_id: int, guild_id: int, amount: int, kind: str = "reward") -> int:
+        results = await self.ledger.transact([LedgerEntry(user_id, guild_id, kind, coins=int(amount))])
+        return results[0]
+
+    async def try_debit(self, user_id: int, guild_id: int, amount: int, kind: str = "spend") -> Optional[int]:
         amount = int(amount)
-        async with self.db_lock:
-            await self.conn.execute(
-                SQL_INSERT_OR_IGNORE_USER_COINS_ZERO,
-                (user_id, guild_id)
-            )
-            await self.conn.execute(
-                """
-                INSERT INTO user_coins (user_id, guild_id, coins) VALUES (?, ?, ?)
-                ON CONFLICT(user_id, guild_id) DO UPDATE SET coins = coins + ?
-                """,
-                (user_id, guild_id, amount, amount)
-            )
-            await self.conn.commit()
-        
-    async def ensure_user_row(self, user_id: int, guild_id: int):
-        async with self.db_lock:
-            await self.conn.execute(
-                SQL_INSERT_OR_IGNORE_USER_COINS_ZERO,
-                (user_id, guild_id)
-            )
-            await self.conn.commit()
+        if amount <= 0:
+            return None
+        results = await self.ledger.transact([LedgerEntry(user_id, guild_id, kind, coins=-amount)])
+        return results[0] if results else None
 
-    async def remove_coins(self, user_id: int, guild_id: int, amount: int) -> bool:
+    async def settle_bet(self, user_id: int, guild_id: int, amount: int, decide) -> Optional[Tuple[bool, int, int]]:
         amount = int(amount)
         if amount <= 0:
-            return False
+            return None
+        outcome = {}
+
+        def payout(results):
+            pre_balance = results[0] + amount
+            won = bool(decide(pre_balance))
+            outcome["bet"] = (won, pre_balance)
+            return [LedgerEntry(user_id, guild_id, "gamble", coins=amount * 2, ref="payout")] if won else []
+
+        results = await self.ledger.transact(
+            [LedgerEntry(user_id, guild_id, "gamble", coins=-amount, ref="stake")],
+            then=payout,
+        )
+        if results is None:
+            return None
+        won, pre_balance = outcome["bet"]
+        return won, pre_balance, results[-1]
 
+    async def ensure_user_row(self, user_id: int, guild_id: int):
         async with self.db_lock:
             await self.conn.execute(
                 SQL_INSERT_OR_IGNORE_USER_COINS_ZERO,
                 (user_id, guild_id)
             )
-            async with self.conn.execute(
-                "UPDATE user_coins SET coins = coins - ? WHERE user_id = ? AND guild_id = ? AND coins >= ?",
-                (amount, user_id, guild_id, amount)
-            ) as cur:
-                await self.conn.commit()
-                return cur.rowcount > 0
+            await self.conn.commit()
+
+    async def remove_coins(self, user_id: int, guild_id: int, amount: int) -> bool:
+        return await self.try_debit(user_id, guild_id, amount) is not None
 
     async def reserve_coins(self, user_id: int, guild_id: int, amount: int) -> bool:
-        return await self.remove_coins(user_id, guild_id, amount)
+        return await self.try_debit(user_id, guild_id, amount) is not None
 
     async def get_user_theme(self, user_id: int):
         async with self.db_lock:
@@ -402,7 +462,7 @@ class Progression(commands.Cog):
         guild = self.bot.get_guild(guild_id)
         if not guild:
             return
-        member = guild.get_member(user_id)
+        member = await self.bot.member_cache.resolve_member(guild, user_id)
         if not member:
             return
         old_title = get_title(old_level)
@@ -455,35 +515,46 @@ class Progression(commands.Cog):
             title_name = get_title(level)
             next_exp = None if level >= self.MAX_LEVEL else (50 * level + 20 * level**2)
 
-            avatar_bytes = await self._fetch_avatar_bytes(member, size=128, timeout=3.0)
-
             theme_name, bg_file, font_color = await self.get_user_theme(member.id)
             user_rank = await self.get_rank(member.id, ctx.guild.id)
 
-            img_bytes = await asyncio.to_thread(
-                render_profile_image,
-                avatar_bytes,
-                member.display_name,
-                title_name,
-                level,
-                exp,
-                next_exp,
-                FONTS,
-                TITLE_EMOJI_FILES,
-                bg_file=bg_file,
-                theme_name=theme_name,
-                font_color=font_color,
-                user_rank=user_rank
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + PROFILE_RENDER_DEADLINE
+            img_bytes, avatar_bytes = await self._render_animated_profile(
+                member, deadline, title_name, level, exp, next_exp, theme_name, bg_file, font_color, user_rank
             )
+            filename = PROFILE_GIF
+
+            if not img_bytes:
+                if not avatar_bytes:
+                    remaining = deadline - loop.time()
+                    avatar_bytes = await self._fetch_avatar_bytes(
+                        member, size=128, timeout=min(AVATAR_FETCH_TIMEOUT, max(AVATAR_FETCH_MIN_TIMEOUT, remaining))
+                    )
+                img_bytes = await asyncio.to_thread(
+                    render_profile_image,
+                    avatar_bytes,
+                    member.display_name,
+                    title_name,
+                    level,
+                    exp,
+                    next_exp,
+                    FONTS,
+                    TITLE_EMOJI_FILES,
+                    bg_file=bg_file,
+                    theme_name=theme_name,
+                    font_color=font_color,
+                    user_rank=user_rank
+                )
+                filename = PROFILE_PNG
 
             if not img_bytes:
                 await ctx.send("❌ Failed to generate profile image — check bot logs.")
                 return
 
-            file = discord.File(io.BytesIO(img_bytes), filename=PROFILE_PNG)
+            file = discord.File(io.BytesIO(img_bytes), filename=filename)
 
-            badge_path = TITLE_EMOJI_FILES.get(title_name)
-            badge_text = "" if (badge_path and os.path.exists(badge_path)) else get_title_emoji(level)
+            badge_text = "" if has_badge(title_name) else get_title_emoji(level)
             content = f"{member.display_name} {badge_text}".strip()
 
             await self.safe_send(ctx, content=content if badge_text else None, file=file)
@@ -522,26 +593,17 @@ class Progression(commands.Cog):
 
         async def build_rows_data(rows):
             try:
-                return await self._build_rows_data(ctx, rows, avatar_size=128, avatar_timeout=3.0)
+                return await self._build_rows_data(ctx, rows, avatar_size=128, avatar_timeout=2.5)
             except Exception as e:
                 print("[leaderboard] _build_rows_data failed:", e, traceback.format_exc())
                 data = []
                 for idx, (user_id, level, exp) in enumerate(rows, start=1):
-                    try:
-                        member = ctx.guild.get_member(user_id)
-                        if member:
-                            name = member.display_name
-                            avatar_bytes = await asyncio.wait_for(member.display_avatar.with_size(128).read(), timeout=2.0)
-                        else:
-                            user = await self.bot.fetch_user(user_id)
-                            name = user.name
-                            avatar_bytes = await asyncio.wait_for(user.display_avatar.with_size(128).read(), timeout=2.0)
-                    except Exception:
-                        name, avatar_bytes = f"User {user_id}", b""
+                    info = self.bot.member_cache.get(ctx.guild, user_id)
+                    name = info.display_name if info else f"User {user_id}"
                     next_exp = None if level >= self.MAX_LEVEL else (50 * level + 20 * level**2)
                     data.append({
                         "rank": idx,
-                        "avatar_bytes": avatar_bytes,
+                        "avatar_bytes": self.avatar_fetcher.placeholder(user_id),
                         "name": self.truncate(name, self.MAX_NAME_WIDTH),
                         "level": level,
                         "title": get_title(level),
@@ -640,11 +702,7 @@ class Progression(commands.Cog):
         title_name = get_title(level)
         next_exp = 50 * level + 20 * level**2 if level < self.MAX_LEVEL else None
 
-        avatar_asset = ctx.author.display_avatar.with_size(128)
-        buffer_avatar = io.BytesIO()
-        await avatar_asset.save(buffer_avatar)
-        buffer_avatar.seek(0)
-        avatar_bytes = buffer_avatar.getvalue()
+        avatar_bytes = await self._fetch_avatar_bytes(ctx.author, size=128)
 
         theme_name, bg_file, font_color = await self.get_user_theme(ctx.author.id)
 
@@ -682,11 +740,7 @@ class Progression(commands.Cog):
             exp, level = await self.get_user(ctx.author.id, ctx.guild.id)
             title_name = get_title(level)
             next_exp = 50 * level + 20 * level**2 if level < self.MAX_LEVEL else None
-            avatar_asset = ctx.author.display_avatar.with_size(128)
-            buffer_avatar = io.BytesIO()
-            await avatar_asset.save(buffer_avatar)
-            buffer_avatar.seek(0)
-            avatar_bytes = buffer_avatar.getvalue()
+            avatar_bytes = await self._fetch_avatar_bytes(ctx.author, size=128)
             img_bytes = await asyncio.to_thread(
                 render_profile_image,
                 avatar_bytes,
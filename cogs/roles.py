@@ -3,13 +3,7 @@ from collections import defaultdict
 from typing import Optional, List, Dict
 import discord
 from discord.ext import commands, tasks
-from cogs.utils.progUtils import get_title, TITLE_COLORS
-
-TITLE_ORDER = [
-    "Novice", "Warrior", "Elite", "Champion", "Hero", "Legend", "Mythic",
-    "Ascendant", "Immortal", "Celestial", "Transcendent", "Aetherborn",
-    "Cosmic", "Divine", "Eternal", "Enlightened"
-]
+from cogs.utils.titles import get_title, TITLE_COLORS, TITLE_ORDER, TITLE_NAMES_LOWER
 
 
 class Roles(commands.Cog):
@@ -35,9 +29,11 @@ class Roles(commands.Cog):
             except Exception:
                 return
         try:
-            member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+            member = await self.bot.member_cache.resolve_member(guild, user_id)
         except Exception:
             return
+        if member is None:
+            return
         await self.update_roles(member, level)
 
     async def _find_role_by_name(self, guild: discord.Guild, title: str) -> Optional[discord.Role]:
@@ -143,11 +139,6 @@ class Roles(commands.Cog):
         if member.bot:
             return
         try:
-            try:
-                member = await member.guild.fetch_member(member.id)
-            except Exception:
-                pass
-
             guild = member.guild
             title = get_title(level)
 
@@ -173,8 +164,7 @@ class Roles(commands.Cog):
             except Exception as e:
                 print(f"[Roles] Error editing role color for {role.name}: {e}")
 
-            title_names = {t.strip().lower() for t in TITLE_ORDER}
-            roles_to_remove = [r for r in member.roles if r.name and r.name.strip().lower() in title_names and r != role]
+            roles_to_remove = [r for r in member.roles if r.name and r.name.strip().lower() in TITLE_NAMES_LOWER and r != role]
             if roles_to_remove:
                 try:
                     await member.remove_roles(*roles_to_remove, reason="Level update")
@@ -206,7 +196,7 @@ class Roles(commands.Cog):
         )
 
         member_title_names = {r.name.strip().lower() for r in member.roles if r.name}
-        other_title_names = {t.lower() for t in TITLE_ORDER} - {desired_norm}
+        other_title_names = TITLE_NAMES_LOWER - {desired_norm}
         has_other_titles = any(n in other_title_names for n in member_title_names)
 
         already_ok = (desired_role is not None and desired_role in member.roles and not has_other_titles)
@@ -225,8 +215,7 @@ class Roles(commands.Cog):
             already_ok, _ = self._compute_member_role_state(guild, member, desired_title)
             if not already_ok:
                 try:
-                    fresh_member = await guild.fetch_member(member.id)
-                    await self.update_roles(fresh_member, level)
+                    await self.update_roles(member, level)
                 except discord.Forbidden:
                     print(f"[Roles] Missing perms to update roles for {member.id} in guild {guild.id}")
                 except discord.HTTPException as he:
@@ -290,9 +279,8 @@ class Roles(commands.Cog):
         if before_role_ids == after_role_ids:
             return
 
-        title_names = {t.lower() for t in TITLE_ORDER}
-        added_roles = [r for r in after.roles if r.id not in before_role_ids and r.name and r.name.strip().lower() in title_names]
-        removed_roles = [r for r in before.roles if r.id not in after_role_ids and r.name and r.name.strip().lower() in title_names]
+        added_roles = [r for r in after.roles if r.id not in before_role_ids and r.name and r.name.strip().lower() in TITLE_NAMES_LOWER]
+        removed_roles = [r for r in before.roles if r.id not in after_role_ids and r.name and r.name.strip().lower() in TITLE_NAMES_LOWER]
 
         if not added_roles and not removed_roles:
             return
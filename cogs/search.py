@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 from discord.ui import View, Select
 import aiohttp
+import asyncio
 import os
 from dotenv import load_dotenv
 from collections import OrderedDict
@@ -12,15 +13,15 @@ from cogs.utils.anime_api import (
     is_image_url_ok,
     google_image_search,
     first_reachable_image,
+    search_anime_media,
 )
+from cogs.utils.http_client import IMAGE_CHECK_TIMEOUT
 
 load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 SEARCH_ENGINE_ID = os.getenv("SEARCH_ENGINE_ID")
 
-ANILIST_API = "https://graphql.anilist.co"
-
 class Search(commands.Cog):
     NOISE_WORDS = {"pfp", "pfps", "hd", "avatar", "icon", "anime", "wallpaper", "image", "picture", "pic", "profile"}
     CACHE_MAX_KEYS = 200
@@ -29,6 +30,10 @@ class Search(commands.Cog):
         self.bot = bot
         self._anilist_cache: OrderedDict[str, dict] = OrderedDict()
 
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self.bot.http_session
+
     def _cache_get(self, key: str) -> dict:
         entry = self._anilist_cache.get(key)
         if entry is None:
@@ -56,9 +61,16 @@ class Search(commands.Cog):
     async def _find_official_image(self, original_query: str, timeout: aiohttp.ClientTimeout):
         cleaned_query = self._strip_noise(original_query)
 
-        char = await fetch_character_by_name(original_query, prefer="AniList")
-        if char and char.get("source") == "AniList" and not char_has_anime_media(char) and cleaned_query != original_query:
-            alt = await fetch_character_by_name(cleaned_query, prefer="AniList")
+        if cleaned_query != original_query:
+            # Issued together so the AniList batcher folds both lookups into one request.
+            char, alt = await asyncio.gather(
+                fetch_character_by_name(original_query, prefer="AniList", session=self.session),
+                fetch_character_by_name(cleaned_query, prefer="AniList", session=self.session),
+            )
+        else:
+            char = await fetch_character_by_name(original_query, prefer="AniList", session=self.session)
+            alt = None
+        if char and char.get("source") == "AniList" and not char_has_anime_media(char):
             if alt and char_has_anime_media(alt):
                 char = alt
 
@@ -70,20 +82,18 @@ class Search(commands.Cog):
             candidate = (char.get("image") or {}).get("large") or (char.get("image") or {}).get("medium")
             if candidate:
                 try:
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        ok = await is_image_url_ok(session, candidate, timeout)
+                    ok = await is_image_url_ok(self.session, candidate, timeout)
                     if ok:
                         official_image = candidate
                 except Exception:
                     official_image = None
 
         if not char or not official_image:
-            jikan_char = await fetch_character_by_name(original_query, prefer="Jikan")
+            jikan_char = await fetch_character_by_name(original_query, prefer="Jikan", session=self.session, fallback=False)
             if jikan_char and not official_image:
                 candidate = (jikan_char.get("image") or {}).get("large") or (jikan_char.get("image") or {}).get("medium")
                 if candidate:
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        ok = await is_image_url_ok(session, candidate, timeout)
+                    ok = await is_image_url_ok(self.session, candidate, timeout)
                     if ok:
                         char = jikan_char
                         official_image = candidate
@@ -94,7 +104,7 @@ class Search(commands.Cog):
         if not GOOGLE_API_KEY or not SEARCH_ENGINE_ID:
             return None
 
-        links = await google_image_search(f"{character_name} anime pfp", GOOGLE_API_KEY, SEARCH_ENGINE_ID)
+        links = await google_image_search(f"{character_name} anime pfp", GOOGLE_API_KEY, SEARCH_ENGINE_ID, session=self.session)
         if not links:
             return None
 
@@ -104,7 +114,7 @@ class Search(commands.Cog):
             unsent = [l for l in links if l not in entry["google"] and l not in entry["anilist_images"]]
             candidates = unsent or [l for l in links if l not in entry["anilist_images"]]
 
-        chosen = await first_reachable_image(candidates, timeout)
+        chosen = await first_reachable_image(candidates, timeout, session=self.session)
         if chosen and cache_key:
             self._cache_add_google(cache_key, chosen)
         return chosen
@@ -112,42 +122,9 @@ class Search(commands.Cog):
     @commands.hybrid_command(name="anime", description="Search for an anime by name")
     @commands.cooldown(1, 15, commands.BucketType.user)
     async def anime(self, ctx: commands.Context, *, query: str):
-        query_str = """
-        query ($search: String) {
-        Page(perPage: 5) {
-            media(search: $search, type: ANIME) {
-            id
-            title { romaji english native }
-            description(asHtml: false)
-            episodes
-            status
-            duration
-            startDate { year month day }
-            endDate { year month day }
-            season
-            averageScore
-            popularity
-            favourites
-            format
-            source
-            studios(isMain: true) { nodes { name } }
-            genres
-            coverImage { large medium }
-            bannerImage
-            siteUrl
-            }
-        }
-        }
-        """
-        variables = {"search": query}
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(ANILIST_API, json={"query": query_str, "variables": variables}) as resp:
-                if resp.status != 200:
-                    return await ctx.send("❌ Could not fetch anime info right now.")
-                data = await resp.json()
-
-        results = data.get("data", {}).get("Page", {}).get("media", [])
+        results = await search_anime_media(query, session=self.session)
+        if results is None:
+            return await ctx.send("❌ Could not fetch anime info right now.")
         if not results:
             return await ctx.send(f"❌ No results found for `{query}`.")
 
@@ -231,7 +208,7 @@ class Search(commands.Cog):
         if not name:
             return await ctx.send("❌ Please provide a character name.")
 
-        per_call_timeout = aiohttp.ClientTimeout(total=10)
+        per_call_timeout = IMAGE_CHECK_TIMEOUT
 
         interaction = getattr(ctx, "interaction", None)
         deferred = False
@@ -4,6 +4,9 @@ import os
 import random
 from datetime import datetime, timedelta, timezone
 import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+from cogs.utils.ledger import LedgerEntry, SQL_CREATE_USER_INVENTORY
 
 COG_PATH = os.path.dirname(os.path.abspath(__file__))
 ROOT_PATH = os.path.dirname(COG_PATH)
@@ -19,12 +22,7 @@ EXP_EMOJI = "<:EXP:1415642038589984839>"
 POTION_ITEMS = (SMALL_EXP_POTION, MEDIUM_EXP_POTION, LARGE_EXP_POTION, LEVEL_SKIP_TOKEN)
 
 SQL_USER_INV_SELECT = "SELECT item_name, quantity FROM user_inventory WHERE user_id = ? AND guild_id = ?"
-SQL_UPSERT_USER_INV = """
-INSERT INTO user_inventory (user_id, guild_id, item_name, quantity)
-VALUES (?, ?, ?, ?)
-ON CONFLICT(user_id, guild_id, item_name) DO UPDATE SET quantity = quantity + ?
-"""
-SQL_SELECT_PRICE_EMOJI = "SELECT price, emoji FROM shop_items WHERE name = ?"
+DEFAULT_ITEM_EMOJI = "📦"
 
 def format_coins(coins: int) -> str:
     if coins < 1_000:
@@ -36,6 +34,90 @@ def format_coins(coins: int) -> str:
     else:
         return f"{coins / 1_000_000_000:.2f}B".rstrip("0").rstrip(".")
     
+class ShopCatalog:
+    VERSION_CHECK_SECONDS = 30.0
+
+    def __init__(self, conn, lock: asyncio.Lock):
+        self.conn = conn
+        self.lock = lock
+        self.items: List[Tuple[str, str, int, str]] = []
+        self._by_name: Dict[str, Tuple[str, str, int, str]] = {}
+        self.version = -1
+        self._checked_at = 0.0
+
+    async def install_versioning(self):
+        # Any write to shop_items bumps shop_meta.version, so edits made outside the bot are picked up too.
+        await self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS shop_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        await self.conn.execute("INSERT OR IGNORE INTO shop_meta (id, version) VALUES (1, 0)")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            await self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS shop_items_version_{event.lower()}
+                AFTER {event} ON shop_items
+                BEGIN
+                    UPDATE shop_meta SET version = version + 1 WHERE id = 1;
+                END
+            """)
+        await self.conn.commit()
+
+    async def _read_version(self) -> int:
+        async with self.conn.execute("SELECT version FROM shop_meta WHERE id = 1") as cur:
+            row = await cur.fetchone()
+        return int(row[0]) if row else 0
+
+    async def load(self):
+        async with self.lock:
+            version = await self._read_version()
+            async with self.conn.execute("SELECT name, type, price, emoji FROM shop_items ORDER BY id") as cur:
+                rows = await cur.fetchall()
+        self.items = [(name, type_, int(price), emoji or DEFAULT_ITEM_EMOJI) for name, type_, price, emoji in rows]
+        self._by_name = {item[0]: item for item in self.items}
+        self.version = version
+        self._checked_at = time.monotonic()
+        print(f"[Shop] Catalog v{version} loaded with {len(self.items)} items.")
+
+    async def ensure_fresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.VERSION_CHECK_SECONDS:
+            return
+        self._checked_at = now
+        if await self._read_version() != self.version:
+            await self.load()
+
+    def get(self, name: str) -> Optional[Tuple[str, str, int, str]]:
+        return self._by_name.get(name)
+
+    def emoji(self, name: str) -> str:
+        item = self._by_name.get(name)
+        return item[3] if item else DEFAULT_ITEM_EMOJI
+
+    def join_inventory(self, rows) -> List[Tuple[str, int, str]]:
+        return [(name, qty, self.emoji(name)) for name, qty in rows if qty > 0]
+
+    def shop_embed(self, coins: int) -> discord.Embed:
+        embed = discord.Embed(
+            title="Minori Bargains",
+            description=f"Your Coins: **{format_coins(coins)}**",
+            color=discord.Color.dark_purple()
+        )
+        embed.set_thumbnail(url=SHOP_ICON_URL)
+        for name, _, price, emoji in self.items:
+            embed.add_field(name=f"{emoji} {name}", value=f"{price} coins", inline=False)
+        return embed
+
+    def select_options(self) -> List[discord.SelectOption]:
+        return [
+            discord.SelectOption(label=name,
+                                description=f"Buy {name} for {price} coins",
+                                emoji=emoji,
+                                value=name)
+            for name, _, price, emoji in self.items
+        ]
+
 class CloseButton(discord.ui.Button):
     def __init__(self, owner_id: int, close_text: str, label: str = "Close", menu_type: str = None, cog=None, guild_id: int = None):
         self.guild_id = guild_id
@@ -102,11 +184,11 @@ class InventorySelect(discord.ui.Select):
             conn = self.cog.progression_cog.conn
             lock = self.cog.progression_cog.db_lock
 
-            async with lock:
-                async with conn.execute(SQL_SELECT_PRICE_EMOJI, (selected_item,)) as cur:
-                    row = await cur.fetchone()
-                selected_emoji = row[1] if row and row[1] else "📦"
+            catalog = self.cog.catalog
+            await catalog.ensure_fresh()
+            selected_emoji = catalog.emoji(selected_item)
 
+            async with lock:
                 async with conn.execute(
                     "SELECT quantity FROM user_inventory WHERE user_id = ? AND guild_id = ? AND item_name = ?",
                     (self.user_id, self.guild_id, selected_item)
@@ -123,15 +205,12 @@ class InventorySelect(discord.ui.Select):
                         await interaction.followup.send(f"<:MinoriWink:1414899695209418762> You’ve already reached the max level! You can’t use {EXP_EMOJI} items anymore.", ephemeral=True)
                         return
 
-                await conn.execute(
-                    "UPDATE user_inventory SET quantity = quantity - 1 WHERE user_id = ? AND guild_id = ? AND item_name = ?",
-                    (self.user_id, self.guild_id, selected_item)
-                )
-                await conn.execute(
-                    "DELETE FROM user_inventory WHERE user_id = ? AND guild_id = ? AND item_name = ? AND quantity <= 0",
-                    (self.user_id, self.guild_id, selected_item)
-                )
-                await conn.commit()
+            used = await self.cog.progression_cog.ledger.transact(
+                [LedgerEntry(self.user_id, self.guild_id, "use", item=selected_item, qty=-1)]
+            )
+            if used is None:
+                await interaction.followup.send("❌ You don't own this item anymore.", ephemeral=True)
+                return
 
             feedback_msg = f"You used {selected_emoji} **{selected_item}**!"
 
@@ -146,29 +225,14 @@ class InventorySelect(discord.ui.Select):
             if selected_item == MYSTERY_BOX_NAME:
                 rewards = await self.cog.apply_mystery_box(self.user_id, self.guild_id)
                 if rewards:
-                    reward_lines = []
-                    lock = self.cog.progression_cog.db_lock
-                    async with lock:
-                        async with conn.execute("SELECT name, emoji FROM shop_items") as cur:
-                            emap = {name: emoji for name, emoji in await cur.fetchall()}
-                    for item, qty in rewards:
-                        emoji = emap.get(item, "📦")
-                        reward_lines.append(f"{qty}x {emoji} {item}")
+                    reward_lines = [f"{qty}x {catalog.emoji(item)} {item}" for item, qty in rewards]
                     feedback_msg = f"<:MysteryBox:1415707555325415485> You opened a {MYSTERY_BOX_NAME} and got:\n" + "\n".join(reward_lines)
 
             lock = self.cog.progression_cog.db_lock
             async with lock:
                 async with conn.execute(SQL_USER_INV_SELECT, (self.user_id, self.guild_id)) as cur:
                     raw_items = await cur.fetchall()
-
-                items = []
-                for name, qty in raw_items:
-                    if qty <= 0:
-                        continue
-                    async with conn.execute("SELECT emoji FROM shop_items WHERE name = ?", (name,)) as cur:
-                        erow = await cur.fetchone()
-                    emoji = erow[0] if erow else "📦"
-                    items.append((name, qty, emoji))
+            items = catalog.join_inventory(raw_items)
 
             if not items:
                 await interaction.edit_original_response(embed=None, view=None, content="🧯 Your inventory is now empty.")
@@ -249,64 +313,24 @@ class ShopSelect(discord.ui.Select):
             
         selected_item = self.values[0]
 
-        conn = self.progression_cog.conn
-        async with conn.execute(SQL_SELECT_PRICE_EMOJI, (selected_item,)) as cur:
-            row = await cur.fetchone()
-       
-        if not row:
+        catalog = self.parent_view.parent_cog.catalog
+        await catalog.ensure_fresh()
+        item = catalog.get(selected_item)
+        if not item:
             await interaction.response.send_message("❌ This item no longer exists in the shop.", ephemeral=True)
             return
-        price, emoji = row
+        _, _, price, selected_emoji = item
 
-        coins = await self.progression_cog.get_coins(self.user_id, self.guild_id)
-        if coins < price:
-            await interaction.response.send_message("❌ You don't have enough coins.", ephemeral=True)
-            return
-
-        ok = await self.progression_cog.remove_coins(self.user_id, self.guild_id, price)
-        if not ok:
+        bought = await self.progression_cog.ledger.transact(
+            [LedgerEntry(self.user_id, self.guild_id, "buy", coins=-price, item=selected_item, qty=1)]
+        )
+        if bought is None:
             await interaction.response.send_message("❌ You don't have enough coins.", ephemeral=True)
             return
 
-        lock = self.progression_cog.db_lock
-        async with lock:
-            await conn.execute("""
-                INSERT INTO user_inventory (user_id, guild_id, item_name, quantity)
-                VALUES (?, ?, ?, 1)
-                ON CONFLICT(user_id, guild_id, item_name) DO UPDATE SET quantity = quantity + 1
-            """, (self.user_id, self.guild_id, selected_item))
-            await conn.commit()
-
-        new_balance = await self.progression_cog.get_coins(self.user_id, self.guild_id)
-        async with conn.execute(SQL_SELECT_PRICE_EMOJI, (selected_item,)) as cur:
-            row = await cur.fetchone()
-        if not row:
-            await interaction.response.send_message("❌ This item no longer exists in the shop.", ephemeral=True)
-            return
-
-        price, selected_emoji = row  
-        
-        async with conn.execute("SELECT name, price, emoji FROM shop_items") as cur:
-            items = await cur.fetchall()
-
-        embed = discord.Embed(
-            title="🛒 Minori Bargains",
-            description=f"Your Coins: **{format_coins(new_balance)}**",
-            color=discord.Color.dark_purple()
-        )
-        embed.set_thumbnail(url=SHOP_ICON_URL)
-        for name, price, emoji in items:
-            embed.add_field(name=f"{emoji} {name}", value=f"{price} coins", inline=False)
-
-        new_options = []
-        for name, price, emoji in items:
-            new_options.append(discord.SelectOption(
-                label=name,
-                description=f"Buy {name} for {price} coins",
-                emoji=emoji,
-                value=name,
-            ))
-        self.options = new_options
+        embed = catalog.shop_embed(bought[0])
+        embed.title = "🛒 Minori Bargains"
+        self.options = catalog.select_options()
 
         msg_to_edit = getattr(self, "message", None) or getattr(self.parent_view, "message", None)
         await interaction.response.defer()
@@ -374,6 +398,7 @@ class Trading(commands.Cog):
         self.donate_cooldowns = {}
         self.open_inventories = {}
         self.open_shops = {} 
+        self.catalog: Optional[ShopCatalog] = None
 
     async def cog_load(self):
         self.progression_cog = self.bot.get_cog("Progression")
@@ -391,15 +416,7 @@ class Trading(commands.Cog):
                 emoji TEXT
             )
         """)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS user_inventory (
-                user_id INTEGER,
-                guild_id INTEGER,
-                item_name TEXT,
-                quantity INTEGER,
-                PRIMARY KEY(user_id, guild_id, item_name)
-            )
-        """)
+        await conn.execute(SQL_CREATE_USER_INVENTORY)
         await conn.commit()
 
         default_items = [
@@ -409,12 +426,16 @@ class Trading(commands.Cog):
             (LEVEL_SKIP_TOKEN, "consumable", 1500, "<:LevelSkipToken:1415349457511383161>"),
             (MYSTERY_BOX_NAME, "consumable", 3000, "<:MysteryBox:1415707555325415485>"),
         ]
+        catalog = ShopCatalog(conn, self.progression_cog.db_lock)
+        await catalog.install_versioning()
         for name, type_, price, emoji in default_items:
             await conn.execute(
                 "INSERT OR IGNORE INTO shop_items (name, type, price, emoji) VALUES (?, ?, ?, ?)",
                 (name, type_, price, emoji)
             )
         await conn.commit()
+        await catalog.load()
+        self.catalog = catalog
 
     async def apply_potion_effect(self, user_id: int, guild_id: int, item_name: str, channel: discord.TextChannel = None):
         potion_effects = {
@@ -447,42 +468,19 @@ class Trading(commands.Cog):
         return gain, extra_msg
     
     async def apply_mystery_box(self, user_id: int, guild_id: int):
-        conn = self.progression_cog.conn
-        lock = self.progression_cog.db_lock
         rewards = []
-
-        async with lock:
-            if random.random() < 0.15:
-                amount = random.randint(1, 3)
-                await conn.execute(
-                    SQL_UPSERT_USER_INV,
-                    (user_id, guild_id, LEVEL_SKIP_TOKEN, amount, amount)
-                )
-                rewards.append((LEVEL_SKIP_TOKEN, amount))
-
-            if random.random() < 0.20:
-                amount = random.randint(1, 3)
-                await conn.execute(
-                    SQL_UPSERT_USER_INV,
-                    (user_id, guild_id, LARGE_EXP_POTION, amount, amount)
-                )
-                rewards.append((LARGE_EXP_POTION, amount))
-
-            if random.random() < 0.50:
-                amount = random.randint(1, 3)
-                await conn.execute(
-                    SQL_UPSERT_USER_INV,
-                    (user_id, guild_id, MEDIUM_EXP_POTION, amount, amount)
-                )
-                rewards.append((MEDIUM_EXP_POTION, amount))
-
-            await conn.execute(
-                SQL_UPSERT_USER_INV,
-                (user_id, guild_id, SMALL_EXP_POTION, 3, 3)
-            )
-            rewards.append((SMALL_EXP_POTION, 3))
-
-            await conn.commit()
+        if random.random() < 0.15:
+            rewards.append((LEVEL_SKIP_TOKEN, random.randint(1, 3)))
+        if random.random() < 0.20:
+            rewards.append((LARGE_EXP_POTION, random.randint(1, 3)))
+        if random.random() < 0.50:
+            rewards.append((MEDIUM_EXP_POTION, random.randint(1, 3)))
+        rewards.append((SMALL_EXP_POTION, 3))
+
+        await self.progression_cog.ledger.post(*(
+            LedgerEntry(user_id, guild_id, "reward", item=item, qty=qty, ref=MYSTERY_BOX_NAME)
+            for item, qty in rewards
+        ))
         return rewards
 
 
@@ -500,30 +498,14 @@ class Trading(commands.Cog):
             await ctx.send("⚠️ You already have a shop open! Close it first.", ephemeral=True)
             return
 
-        conn = self.progression_cog.conn
-        async with conn.execute("SELECT name, price, emoji FROM shop_items") as cur:
-            items = await cur.fetchall()
-        if not items:
+        await self.catalog.ensure_fresh()
+        if not self.catalog.items:
             await ctx.send("Shop is empty.")
             return
 
         user_coins = await self.progression_cog.get_coins(user_id, guild_id)
-        embed = discord.Embed(
-            title="Minori Bargains",
-            description=f"Your Coins: **{format_coins(user_coins)}**",
-            color=discord.Color.dark_purple()
-        )
-        embed.set_thumbnail(url=SHOP_ICON_URL)
-        for name, price, emoji in items:
-            embed.add_field(name=f"{emoji} {name}", value=f"{price} coins", inline=False)
-
-        options = [
-            discord.SelectOption(label=name,
-                                description=f"Buy {name} for {price} coins",
-                                emoji=emoji,
-                                value=name)
-            for name, price, emoji in items
-        ]
+        embed = self.catalog.shop_embed(user_coins)
+        options = self.catalog.select_options()
 
         view = ShopView(self.progression_cog, user_id, guild_id, options, parent_cog=self, timeout=180)
         msg = await ctx.send(embed=embed, view=view)
@@ -549,15 +531,8 @@ class Trading(commands.Cog):
         conn = self.progression_cog.conn
         async with conn.execute(SQL_USER_INV_SELECT, (user_id, guild_id)) as cur:
             raw_items = await cur.fetchall()
-
-        items = []
-        for name, qty in raw_items:
-            if qty <= 0:
-                continue
-            async with conn.execute("SELECT emoji FROM shop_items WHERE name = ?", (name,)) as cur:
-                row = await cur.fetchone()
-            emoji = row[0] if row else "📦"
-            items.append((name, qty, emoji))
+        await self.catalog.ensure_fresh()
+        items = self.catalog.join_inventory(raw_items)
 
         if not items:
             await ctx.send("Your inventory is empty.")
@@ -605,9 +580,8 @@ class Trading(commands.Cog):
             await ctx.send("🧯 Your inventory is empty, cannot donate.")
             return
 
-        async with conn.execute("SELECT name, emoji FROM shop_items") as cur:
-            emoji_map = {name: emoji for name, emoji in await cur.fetchall()}
-
+        await self.catalog.ensure_fresh()
+        catalog = self.catalog
         
         caps = {
             MYSTERY_BOX_NAME: 1,
@@ -621,7 +595,7 @@ class Trading(commands.Cog):
             discord.SelectOption(
                 label=name,
                 description=f"You have {qty}",
-                emoji=emoji_map.get(name, "📦"),
+                emoji=catalog.emoji(name),
                 value=name
             ) for name, qty in items
         ]
@@ -687,31 +661,20 @@ class Trading(commands.Cog):
                     await interaction.response.send_modal(DonateAmountModal(selected_item, max_cap))
 
         async def finalize_donate(item_name, amount, interaction):
-            lock = self.progression_cog.db_lock
-            async with lock:
-                async with conn.execute("SELECT quantity FROM user_inventory WHERE user_id = ? AND guild_id = ? AND item_name = ?", (donor_id, guild_id, item_name)) as cur:
-                    row = await cur.fetchone()
-                if not row or row[0] < amount:
-                    await interaction.response.send_message("❌ You don't have enough of this item.", ephemeral=True)
-                    return
-
-                await conn.execute("UPDATE user_inventory SET quantity = quantity - ? WHERE user_id = ? AND guild_id = ? AND item_name = ?",
-                        (amount, donor_id, guild_id, item_name))
-                await conn.execute("DELETE FROM user_inventory WHERE user_id = ? AND guild_id = ? AND item_name = ? AND quantity <= 0",
-                        (donor_id, guild_id, item_name))
-
-                await conn.execute("""INSERT INTO user_inventory (user_id, guild_id, item_name, quantity)
-                            VALUES (?, ?, ?, ?)
-                            ON CONFLICT(user_id, guild_id, item_name) DO UPDATE SET quantity = quantity + ?""",
-                        (receiver_id, guild_id, item_name, amount, amount))
-                await conn.commit()
+            moved = await self.progression_cog.ledger.transact([
+                LedgerEntry(donor_id, guild_id, "donate", item=item_name, qty=-amount, ref=str(receiver_id)),
+                LedgerEntry(receiver_id, guild_id, "donate", item=item_name, qty=amount, ref=str(donor_id)),
+            ])
+            if moved is None:
+                await interaction.response.send_message("❌ You don't have enough of this item.", ephemeral=True)
+                return
 
             self.donate_cooldowns[donor_id] = datetime.now(timezone.utc) + timedelta(hours=2)
 
             for child in view.children:
                 child.disabled = True
             await interaction.response.edit_message(
-                content=f"You donated {amount}x {emoji_map.get(item_name, '📦')} {item_name} to {member.display_name}!",
+                content=f"You donated {amount}x {catalog.emoji(item_name)} {item_name} to {member.display_name}!",
                 view=view
             )
 
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import aiohttp
+from cogs.utils.http_client import DEFAULT_TIMEOUT
+from cogs.utils.rate_limit import guarded
+
+ANILIST_URL = os.getenv("MINORI_ANILIST_URL", "https://graphql.anilist.co")
+
+
+class AniListNotFound(LookupError):
+    """Raised for an aliased field AniList reported as not found."""
+
+
+class Lookup(NamedTuple):
+    field: str
+    selection: str
+    variables: Dict[str, Tuple[str, Any]]
+
+
+_VAR_RE = re.compile(r"\$(\w+)")
+
+
+def build_batch_query(lookups: List[Lookup]) -> Tuple[str, Dict[str, Any]]:
+    var_defs, fields, variables = [], [], {}
+    for i, lookup in enumerate(lookups):
+        prefix = f"q{i}_"
+        for name, (gql_type, value) in lookup.variables.items():
+            var_defs.append(f"${prefix}{name}: {gql_type}")
+            variables[prefix + name] = value
+        text = f"{lookup.field} {lookup.selection}"
+        fields.append(f"q{i}: " + _VAR_RE.sub(lambda m: f"${prefix}{m.group(1)}", text))
+    header = f"query ({', '.join(var_defs)})" if var_defs else "query"
+    return header + " {\n" + "\n".join(fields) + "\n}", variables
+
+
+class AniListBatcher:
+    def __init__(self, window: float = 0.03, max_batch: int = 8):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Lookup, asyncio.Future, Optional[aiohttp.ClientSession]]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.stats = {"lookups": 0, "requests": 0}
+
+    async def lookup(self, lookup: Lookup, session: Optional[aiohttp.ClientSession] = None) -> Any:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((lookup, fut, session))
+        self.stats["lookups"] += 1
+        if len(self._pending) >= self.max_batch:
+            self._schedule_now()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._schedule_now)
+        return await fut
+
+    def _schedule_now(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._flush(batch))
+
+    async def _flush(self, batch):
+        lookups = [b[0] for b in batch]
+        futures = [b[1] for b in batch]
+        session = next((b[2] for b in batch if b[2] is not None and not b[2].closed), None)
+        query, variables = build_batch_query(lookups)
+        owns = session is None
+        if owns:
+            session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
+        try:
+            async with guarded("anilist") as guard:
+                self.stats["requests"] += 1
+                async with session.post(ANILIST_URL, json={"query": query, "variables": variables}) as resp:
+                    guard.observe(resp)
+                    # Partial misses come back as 404 with per-alias errors alongside the data.
+                    if resp.status not in (200, 404):
+                        resp.raise_for_status()
+                    payload = await resp.json()
+        except Exception as e:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        finally:
+            if owns:
+                await session.close()
+
+        data = payload.get("data") or {}
+        errors: Dict[str, dict] = {}
+        global_error = None
+        for err in payload.get("errors") or []:
+            path = err.get("path") or []
+            if path:
+                errors[str(path[0])] = err
+            else:
+                global_error = err
+        for i, fut in enumerate(futures):
+            if fut.done():
+                continue
+            alias = f"q{i}"
+            value = data.get(alias)
+            err = errors.get(alias)
+            if value is not None:
+                fut.set_result(value)
+            elif err is None and global_error is not None:
+                fut.set_exception(RuntimeError(f"AniList: {global_error.get('message')}"))
+            elif err is None or err.get("status") == 404:
+                fut.set_exception(AniListNotFound(alias))
+            else:
+                fut.set_exception(RuntimeError(f"AniList: {err.get('message')}"))
+
+
+_BATCHER: Optional[AniListBatcher] = None
+
+
+def get_batcher() -> AniListBatcher:
+    global _BATCHER
+    if _BATCHER is None:
+        _BATCHER = AniListBatcher()
+    return _BATCHER
+
+async def anilist_lookup(field: str, selection: str, variables: Dict[str, Tuple[str, Any]],
+                         session: Optional[aiohttp.ClientSession] = None) -> Any:
+    return await get_batcher().lookup(Lookup(field, selection, variables), session=session)
@@ -1,13 +1,28 @@
+import asyncio
+import os
 import random
-from typing import Dict, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import aiohttp
 import discord
+from cogs.utils.http_client import DEFAULT_TIMEOUT
+from cogs.utils.anilist_batch import ANILIST_URL, AniListNotFound, anilist_lookup
+from cogs.utils.response_cache import cached_call
+from cogs.utils.rate_limit import CircuitBreaker, RateLimitedError, get_guard, guarded, rank_providers
 
-ANILIST_URL = "https://graphql.anilist.co"
-JIKAN_TOP_CHAR_URL = "https://api.jikan.moe/v4/top/characters"
-JIKAN_SEARCH_CHAR_URL = "https://api.jikan.moe/v4/characters"
+JIKAN_BASE_URL = os.getenv("MINORI_JIKAN_URL", "https://api.jikan.moe/v4").rstrip("/")
+JIKAN_TOP_CHAR_URL = f"{JIKAN_BASE_URL}/top/characters"
+JIKAN_SEARCH_CHAR_URL = f"{JIKAN_BASE_URL}/characters"
+GOOGLE_CSE_URL = os.getenv("MINORI_GOOGLE_CSE_URL", "https://www.googleapis.com/customsearch/v1")
 
-DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+HEDGE_DELAY_DEFAULT = 0.8
+HEDGE_DELAY_MIN = 0.3
+HEDGE_DELAY_MAX = 2.0
+
+URL_OK_TTL = 30 * 60
+URL_BAD_TTL = 5 * 60
+URL_VALIDITY_MAX = 2000
+_URL_VALIDITY: Dict[str, Tuple[float, bool]] = {}
 
 FALLBACK_NAMES = [
     "Naruto Uzumaki", "Monkey D. Luffy", "Goku", "Light Yagami", "Eren Yeager", "Levi Ackerman",
@@ -15,117 +30,184 @@ FALLBACK_NAMES = [
 ]
 
 
-async def fetch_random_character(prefer: str = "AniList", session: Optional[aiohttp.ClientSession] = None) -> Dict:
-    providers = [prefer, "Jikan" if prefer == "AniList" else "AniList"]
+def _hedge_delay(provider: str) -> float:
+    guard = get_guard(provider)
+    if guard.breaker.state == CircuitBreaker.HALF_OPEN:
+        return 0.0
+    if guard.latency is None:
+        return HEDGE_DELAY_DEFAULT
+    return min(HEDGE_DELAY_MAX, max(HEDGE_DELAY_MIN, guard.latency * 1.5))
+
+async def _race_providers(providers: List[str], call: Callable[[str], Awaitable[Any]], hedged: bool = True) -> Any:
+    order = rank_providers(providers)
+    if not hedged:
+        last_err = None
+        for provider in order:
+            try:
+                result = await call(provider)
+                if result:
+                    return result
+            except Exception as e:
+                last_err = e
+        if last_err:
+            raise last_err
+        return None
+
+    tasks: Dict[asyncio.Task, str] = {}
     last_err = None
-    for provider in providers:
-        try:
-            if provider == "AniList":
-                data = await _fetch_anilist_character_random(session=session)
-                data["source"] = "AniList"
-                return data
-            else:
-                data = await _fetch_jikan_character_random(session=session)
-                data["source"] = "Jikan (MAL)"
-                return data
-        except Exception as e:
-            last_err = e
-            continue
-    raise last_err or RuntimeError("Failed to fetch character from providers")
+    next_idx = 0
 
-async def _fetch_anilist_character_random(session: Optional[aiohttp.ClientSession] = None) -> Dict:
-    query = '''
-    query ($page: Int, $perPage: Int) {
-        Page(page: $page, perPage: $perPage) {
-            characters(sort: FAVOURITES_DESC) {
-                id
-                name { full }
-                image { large }
-                media { nodes { title { romaji } } }
-            }
-        }
-    }
-    '''
-    variables = {"page": random.randint(1, 20), "perPage": 50}
-    owns = session is None
-    if owns:
-        session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
-    try:
-        async with session.post(ANILIST_URL, json={"query": query, "variables": variables}) as resp:
-            resp.raise_for_status()
-            payload = await resp.json()
-        chars = payload.get("data", {}).get("Page", {}).get("characters", [])
-        if not chars:
-            raise RuntimeError("AniList: no characters")
-        ch = random.choice(chars)
-        nodes = ch.get("media", {}).get("nodes", [])
-        anime_title = nodes[0]["title"]["romaji"] if nodes else "Unknown Anime"
-        return {"name": ch["name"]["full"], "image": ch["image"]["large"], "anime": anime_title}
-    finally:
-        if owns:
-            await session.close()
+    def launch():
+        nonlocal next_idx
+        provider = order[next_idx]
+        next_idx += 1
+        tasks[asyncio.create_task(call(provider))] = provider
 
-async def _fetch_jikan_character_random(session: Optional[aiohttp.ClientSession] = None) -> Dict:
-    page = random.randint(1, 10)
-    url = f"{JIKAN_TOP_CHAR_URL}?page={page}"
-    owns = session is None
-    if owns:
-        session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
+    launch()
     try:
-        async with session.get(url) as resp:
-            resp.raise_for_status()
-            payload = await resp.json()
-        chars = payload.get("data", [])
-        if not chars:
-            raise RuntimeError("Jikan: no characters")
-        ch = random.choice(chars)
-        anime_nodes = ch.get("anime", [])
-        anime_title = (anime_nodes[0]["title"] if anime_nodes else "Unknown Anime")
-        return {"name": ch["name"], "image": ch["images"]["jpg"]["image_url"], "anime": anime_title}
+        while tasks:
+            timeout = _hedge_delay(order[0]) if next_idx < len(order) else None
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                launch()
+                continue
+            for t in done:
+                tasks.pop(t)
+                if t.exception() is not None:
+                    last_err = t.exception()
+                elif t.result():
+                    return t.result()
+            if not tasks and next_idx < len(order):
+                launch()
+        if last_err:
+            raise last_err
+        return None
     finally:
-        if owns:
-            await session.close()
+        for t in tasks:
+            t.cancel()
 
-async def fetch_character_by_name(name: str, prefer: str = "AniList", session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict]:
-    providers = [prefer, "Jikan" if prefer == "AniList" else "AniList"]
-    for prov in providers:
-        if prov == "AniList":
-            char = await _fetch_anilist_character_by_name(name, session=session)
-            if char:
-                char["source"] = "AniList"
-                return char
+async def fetch_random_character(prefer: str = "AniList", session: Optional[aiohttp.ClientSession] = None, hedged: bool = True) -> Dict:
+    async def call(provider: str) -> Dict:
+        if provider == "AniList":
+            data = await _fetch_anilist_character_random(session=session)
+            data["source"] = "AniList"
         else:
-            char = await _fetch_jikan_character_by_name(name, session=session)
-            if char:
-                char["source"] = "Jikan (MAL)"
-                return char
-    return None
+            data = await _fetch_jikan_character_random(session=session)
+            data["source"] = "Jikan (MAL)"
+        return data
 
-async def _fetch_anilist_character_by_name(name: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict]:
-    query = """
-    query ($search: String) {
-        Character(search: $search) {
+    data = await _race_providers([prefer, "Jikan" if prefer == "AniList" else "AniList"], call, hedged=hedged)
+    if not data:
+        raise RuntimeError("Failed to fetch character from providers")
+    return data
+
+async def _fetch_anilist_character_page(page: int, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+    selection = """{
+        characters(sort: FAVOURITES_DESC) {
             id
             name { full }
-            image { large medium }
-            media { nodes { id type format } }
+            image { large }
+            media { nodes { title { romaji } } }
         }
     }"""
-    variables = {"search": name}
+    variables = {"page": ("Int", page), "perPage": ("Int", 50)}
+    try:
+        result = await anilist_lookup("Page(page: $page, perPage: $perPage)", selection, variables, session=session)
+    except AniListNotFound:
+        return []
+    return result.get("characters", []) or []
+
+async def _get_anilist_character_page(page: int, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+    return await cached_call("anilist", "character_page", page, lambda: _fetch_anilist_character_page(page, session=session))
+
+def _normalize_anilist_character(ch: Dict) -> Dict:
+    nodes = ch.get("media", {}).get("nodes", [])
+    anime_title = nodes[0]["title"]["romaji"] if nodes else "Unknown Anime"
+    return {"name": ch["name"]["full"], "image": ch["image"]["large"], "anime": anime_title}
+
+async def _fetch_anilist_character_random(session: Optional[aiohttp.ClientSession] = None) -> Dict:
+    chars = await _get_anilist_character_page(random.randint(1, 20), session=session)
+    if not chars:
+        raise RuntimeError("AniList: no characters")
+    return _normalize_anilist_character(random.choice(chars))
+
+async def _fetch_jikan_character_page(page: int, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+    url = f"{JIKAN_TOP_CHAR_URL}?page={page}"
     owns = session is None
     if owns:
         session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
     try:
-        async with session.post(ANILIST_URL, json={"query": query, "variables": variables}) as resp:
-            if resp.status != 200:
-                return None
-            data = await resp.json()
-        ch = (data.get("data") or {}).get("Character")
-        return ch or None
+        async with guarded("jikan") as guard:
+            async with session.get(url) as resp:
+                guard.observe(resp)
+                resp.raise_for_status()
+                payload = await resp.json()
+        return payload.get("data", []) or []
     finally:
         if owns:
             await session.close()
 
+async def _get_jikan_character_page(page: int, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+    return await cached_call("jikan", "character_page", page, lambda: _fetch_jikan_character_page(page, session=session))
+
+def _normalize_jikan_character(ch: Dict) -> Dict:
+    anime_nodes = ch.get("anime", [])
+    anime_title = (anime_nodes[0]["title"] if anime_nodes else "Unknown Anime")
+    return {"name": ch["name"], "image": ch["images"]["jpg"]["image_url"], "anime": anime_title}
+
+async def _fetch_jikan_character_random(session: Optional[aiohttp.ClientSession] = None) -> Dict:
+    chars = await _get_jikan_character_page(random.randint(1, 10), session=session)
+    if not chars:
+        raise RuntimeError("Jikan: no characters")
+    return _normalize_jikan_character(random.choice(chars))
+
+async def fetch_character_page(provider: str, page: int, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+    if provider == "AniList":
+        chars = await _get_anilist_character_page(page, session=session)
+        normalize, source = _normalize_anilist_character, "AniList"
+    else:
+        chars = await _get_jikan_character_page(page, session=session)
+        normalize, source = _normalize_jikan_character, "Jikan (MAL)"
+    out = []
+    for ch in chars:
+        try:
+            out.append({**normalize(ch), "source": source})
+        except (KeyError, IndexError, TypeError):
+            continue
+    return out
+
+async def fetch_character_by_name(name: str, prefer: str = "AniList", session: Optional[aiohttp.ClientSession] = None,
+                                  hedged: bool = True, fallback: bool = True) -> Optional[Dict]:
+    async def call(provider: str) -> Optional[Dict]:
+        if provider == "AniList":
+            char = await cached_call("anilist", "character", name, lambda: _fetch_anilist_character_by_name(name, session=session))
+            source = "AniList"
+        else:
+            char = await cached_call("jikan", "character", name, lambda: _fetch_jikan_character_by_name(name, session=session))
+            source = "Jikan (MAL)"
+        if char:
+            char["source"] = source
+        return char
+
+    providers = [prefer, "Jikan" if prefer == "AniList" else "AniList"] if fallback else [prefer]
+    try:
+        return await _race_providers(providers, call, hedged=hedged)
+    except Exception:
+        return None
+
+async def _fetch_anilist_character_by_name(name: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict]:
+    selection = """{
+        id
+        name { full }
+        image { large medium }
+        media { nodes { id type format } }
+    }"""
+    try:
+        ch = await anilist_lookup("Character(search: $search)", selection, {"search": ("String", name)}, session=session)
+    except AniListNotFound:
+        return None
+    return ch or None
+
 async def _fetch_jikan_character_by_name(name: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict]:
     from urllib.parse import quote
     url = f"{JIKAN_SEARCH_CHAR_URL}?q={quote(name)}&limit=1"
@@ -133,10 +215,13 @@ async def _fetch_jikan_character_by_name(name: str, session: Optional[aiohttp.Cl
     if owns:
         session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
     try:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                return None
-            data = await resp.json()
+        async with guarded("jikan") as guard:
+            async with session.get(url) as resp:
+                guard.observe(resp)
+                if resp.status == 404:
+                    return None
+                resp.raise_for_status()
+                data = await resp.json()
         results = data.get("data") or []
         if not results:
             return None
@@ -176,90 +261,83 @@ def get_fallback_wrong_options(correct_name: str, pool: Optional[List[str]] = No
     return random.sample(names, k=k) if k > 0 else []
 
 async def _get_anilist_wrong_options(correct_name: str, session: Optional[aiohttp.ClientSession] = None) -> List[str]:
-    query = '''
-    query ($page: Int, $perPage: Int) {
-        Page(page: $page, perPage: $perPage) {
-            characters(sort: FAVOURITES_DESC) { name { full } }
-        }
-    }
-    '''
-    variables = {"page": random.randint(1, 20), "perPage": 50}
-    owns = session is None
-    if owns:
-        session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
-    try:
-        async with session.post(ANILIST_URL, json={"query": query, "variables": variables}) as resp:
-            if resp.status != 200:
-                return get_fallback_wrong_options(correct_name)
-            payload = await resp.json()
-        chars = payload.get("data", {}).get("Page", {}).get("characters", [])
-        wrong = [c["name"]["full"] for c in chars if c["name"]["full"] != correct_name]
-        k = min(3, len(wrong))
-        return random.sample(wrong, k=k) if k > 0 else get_fallback_wrong_options(correct_name)
-    finally:
-        if owns:
-            await session.close()
+    chars = await _get_anilist_character_page(random.randint(1, 20), session=session)
+    wrong = [c["name"]["full"] for c in chars if c["name"]["full"] != correct_name]
+    k = min(3, len(wrong))
+    return random.sample(wrong, k=k) if k > 0 else get_fallback_wrong_options(correct_name)
 
 async def _get_jikan_wrong_options(correct_name: str, session: Optional[aiohttp.ClientSession] = None) -> List[str]:
-    page = random.randint(1, 10)
-    url = f"{JIKAN_TOP_CHAR_URL}?page={page}"
-    owns = session is None
-    if owns:
-        session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
-    try:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                return get_fallback_wrong_options(correct_name)
-            payload = await resp.json()
-        chars = payload.get("data", [])
-        wrong = [c["name"] for c in chars if c["name"] != correct_name]
-        k = min(3, len(wrong))
-        return random.sample(wrong, k=k) if k > 0 else get_fallback_wrong_options(correct_name)
-    finally:
-        if owns:
-            await session.close()
+    chars = await _get_jikan_character_page(random.randint(1, 10), session=session)
+    wrong = [c["name"] for c in chars if c["name"] != correct_name]
+    k = min(3, len(wrong))
+    return random.sample(wrong, k=k) if k > 0 else get_fallback_wrong_options(correct_name)
 
-async def build_character_select_options(correct_name: str, source: str, session: Optional[aiohttp.ClientSession] = None) -> List[discord.SelectOption]:
+def character_select_options(correct_name: str, wrong: List[str]) -> List[discord.SelectOption]:
     opts = [correct_name]
-    wrong = await get_wrong_names(source, correct_name, session=session)
     opts.extend(wrong)
     random.shuffle(opts)
     return [discord.SelectOption(label=o, value=o) for o in opts]
 
+async def build_character_select_options(correct_name: str, source: str, session: Optional[aiohttp.ClientSession] = None) -> List[discord.SelectOption]:
+    wrong = await get_wrong_names(source, correct_name, session=session)
+    return character_select_options(correct_name, wrong)
+
+
+def _cached_validity(url: str) -> Optional[bool]:
+    entry = _URL_VALIDITY.get(url)
+    if entry is None:
+        return None
+    expires, ok = entry
+    if expires < time.monotonic():
+        _URL_VALIDITY.pop(url, None)
+        return None
+    return ok
+
+def _remember_validity(url: str, ok: bool):
+    if len(_URL_VALIDITY) >= URL_VALIDITY_MAX:
+        _URL_VALIDITY.pop(next(iter(_URL_VALIDITY)))
+    _URL_VALIDITY[url] = (time.monotonic() + (URL_OK_TTL if ok else URL_BAD_TTL), ok)
 
 async def is_image_url_ok(session: aiohttp.ClientSession, url: str, timeout_obj: aiohttp.ClientTimeout) -> bool:
     if not url:
         return False
+    cached = _cached_validity(url)
+    if cached is not None:
+        return cached
+    ok = False
     try:
-        async with session.head(url, timeout=timeout_obj) as resp:
+        # Only the status and headers are needed; the body is never read.
+        async with session.get(url, timeout=timeout_obj, headers={"Range": "bytes=0-0"}, allow_redirects=True) as resp:
             ct = resp.headers.get("Content-Type", "")
-            if resp.status == 200 and ct and ct.startswith("image"):
-                return True
+            ok = resp.status in (200, 206) and ct.startswith("image")
+    except asyncio.CancelledError:
+        raise
     except Exception:
-        pass
-    try:
-        async with session.get(url, timeout=timeout_obj) as resp:
-            ct = resp.headers.get("Content-Type", "")
-            return resp.status == 200 and ct and ct.startswith("image")
-    except Exception:
-        return False
+        ok = False
+    _remember_validity(url, ok)
+    return ok
 
 async def google_image_search(query: str, api_key: str, cx: str, session: Optional[aiohttp.ClientSession] = None) -> List[str]:
     from urllib.parse import quote
     url = (
-        f"https://www.googleapis.com/customsearch/v1?"
+        f"{GOOGLE_CSE_URL}?"
         f"key={api_key}&cx={cx}&searchType=image&q={quote(query)}"
     )
     owns = session is None
     if owns:
         session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
     try:
-        async with session.get(url) as resp:
-            data = {}
-            try:
-                data = await resp.json()
-            except Exception:
-                pass
+        data = {}
+        try:
+            async with guarded("google") as guard:
+                async with session.get(url) as resp:
+                    guard.observe(resp)
+                    try:
+                        data = await resp.json()
+                    except Exception:
+                        pass
+        except RateLimitedError as e:
+            print(f"[google_image_search] skipped: {e}")
         items = data.get("items") or []
         links = [
             item.get("link") for item in items
@@ -270,15 +348,71 @@ async def google_image_search(query: str, api_key: str, cx: str, session: Option
         if owns:
             await session.close()
 
-async def first_reachable_image(links: List[str], timeout: aiohttp.ClientTimeout) -> Optional[str]:
+async def first_reachable_image(links: List[str], timeout: aiohttp.ClientTimeout, session: Optional[aiohttp.ClientSession] = None,
+                                concurrency: int = 4) -> Optional[str]:
     if not links:
         return None
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        for link in links:
+    for link in links:
+        if _cached_validity(link):
+            return link
+    owns = session is None
+    if owns:
+        session = aiohttp.ClientSession(timeout=timeout)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def probe(link: str) -> Optional[str]:
+        async with sem:
+            return link if await is_image_url_ok(session, link, timeout) else None
+
+    tasks = [asyncio.create_task(probe(link)) for link in dict.fromkeys(links)]
+    try:
+        for fut in asyncio.as_completed(tasks):
             try:
-                ok = await is_image_url_ok(session, link, timeout)
-                if ok:
-                    return link
+                link = await fut
             except Exception:
                 continue
-    return None
\ No newline at end of file
+            if link:
+                return link
+        return None
+    finally:
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+        if owns:
+            await session.close()
+
+async def search_anime_media(search: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[List[Dict]]:
+    try:
+        return await cached_call("anilist", "media_search", search, lambda: _fetch_anime_media(search, session=session))
+    except Exception:
+        return None
+
+async def _fetch_anime_media(search: str, session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+    selection = """{
+        media(search: $search, type: ANIME) {
+        id
+        title { romaji english native }
+        description(asHtml: false)
+        episodes
+        status
+        duration
+        startDate { year month day }
+        endDate { year month day }
+        season
+        averageScore
+        popularity
+        favourites
+        format
+        source
+        studios(isMain: true) { nodes { name } }
+        genres
+        coverImage { large medium }
+        bannerImage
+        siteUrl
+        }
+    }"""
+    try:
+        result = await anilist_lookup("Page(perPage: 5)", selection, {"search": ("String", search)}, session=session)
+    except AniListNotFound:
+        return []
+    return result.get("media", []) or []
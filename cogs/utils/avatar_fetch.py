@@ -0,0 +1,106 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional
+import discord
+
+
+class AvatarFetcher:
+    def __init__(
+        self,
+        max_concurrency: int = 6,
+        deadline: float = 2.5,
+        hedge_delay: float = 0.8,
+        attempt_timeout: float = 8.0,
+        cache_size: int = 512,
+    ):
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.attempt_timeout = attempt_timeout
+        self.cache_size = cache_size
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._by_url: "OrderedDict[str, bytes]" = OrderedDict()
+        self._last_good: "OrderedDict[int, bytes]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "deduped": 0, "hedged": 0, "placeholders": 0}
+
+    def _remember(self, cache: OrderedDict, key, data: bytes):
+        cache[key] = data
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def placeholder(self, user_id: Optional[int]) -> bytes:
+        # Empty bytes mean "no avatar": the profile card and leaderboard rows draw a gray disc instead.
+        if user_id is not None and user_id in self._last_good:
+            return self._last_good[user_id]
+        return b""
+
+    async def fetch(self, user, size: int = 128, deadline: Optional[float] = None) -> bytes:
+        user_id = getattr(user, "id", None)
+        try:
+            asset = user.display_avatar.with_size(size)
+        except Exception as e:
+            print(f"[avatar_fetch] no avatar asset for {user_id}: {e}")
+            return self.placeholder(user_id)
+        return await self.fetch_asset(asset, user_id=user_id, deadline=deadline)
+
+    async def fetch_asset(self, asset: discord.Asset, user_id: Optional[int] = None, deadline: Optional[float] = None) -> bytes:
+        url = str(asset.url)
+        cached = self._by_url.get(url)
+        if cached is not None:
+            self._by_url.move_to_end(url)
+            self.stats["hits"] += 1
+            return cached
+
+        task = self._inflight.get(url)
+        if task is None:
+            self.stats["misses"] += 1
+            task = asyncio.create_task(self._download(asset, url, user_id))
+            self._inflight[url] = task
+            task.add_done_callback(lambda t, u=url: self._on_done(u, t))
+        else:
+            self.stats["deduped"] += 1
+
+        try:
+            # Shielded so a deadline miss leaves the download running to warm the cache.
+            data = await asyncio.wait_for(asyncio.shield(task), timeout=deadline or self.deadline)
+        except Exception as e:
+            self.stats["placeholders"] += 1
+            print(f"[avatar_fetch] using placeholder for {user_id}: {type(e).__name__}")
+            return self.placeholder(user_id)
+        return data or self.placeholder(user_id)
+
+    def _on_done(self, url: str, task: asyncio.Task):
+        self._inflight.pop(url, None)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[avatar_fetch] download failed for {url}: {task.exception()}")
+
+    async def _attempt(self, asset: discord.Asset) -> bytes:
+        async with self._sem:
+            return await asyncio.wait_for(asset.read(), timeout=self.attempt_timeout)
+
+    async def _download(self, asset: discord.Asset, url: str, user_id: Optional[int]) -> bytes:
+        attempts = [asyncio.create_task(self._attempt(asset))]
+        last_error: Optional[BaseException] = None
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=self.hedge_delay)
+            if not done or attempts[0].exception() is not None:
+                self.stats["hedged"] += 1
+                attempts.append(asyncio.create_task(self._attempt(asset)))
+
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if t.exception() is None:
+                        data = t.result()
+                        self._remember(self._by_url, url, data)
+                        if user_id is not None:
+                            self._remember(self._last_good, user_id, data)
+                        return data
+                    last_error = t.exception()
+            raise last_error
+        finally:
+            for t in attempts:
+                if not t.done():
+                    t.cancel()
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+import aiohttp
+from cogs.utils.anime_api import fetch_character_page
+from cogs.utils.rate_limit import CircuitBreaker, get_guard
+
+POOL_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "data", "character_pool.json")
+
+ANILIST_PAGES = 40
+JIKAN_PAGES = 10
+PAGE_DELAY_SECONDS = 1.0
+# The refill shares provider buckets with user commands, so it spends at most this share of
+# a provider's rate and only starts a page while this fraction of the bucket is still full.
+REFILL_RATE_SHARE = 0.25
+REFILL_RESERVE = 0.5
+REFILL_BACKOFF_SECONDS = 5.0
+
+
+class CharacterPool:
+    def __init__(self, path: str = POOL_FILE, max_age: float = 24 * 3600, min_size: int = 200):
+        self.path = os.path.abspath(path)
+        self.max_age = max_age
+        self.min_size = min_size
+        self.updated_at = 0.0
+        self._chars: List[Dict] = []
+        self._names: List[str] = []
+        self._refill_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._chars)
+
+    def is_stale(self) -> bool:
+        return len(self._chars) < self.min_size or time.time() - self.updated_at > self.max_age
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        chars = [c for c in data.get("characters", []) if c.get("name") and c.get("image")]
+        self._set_chars(chars)
+        self.updated_at = float(data.get("updated_at", 0))
+        print(f"[CharacterPool] Loaded {len(chars)} characters from disk.")
+
+    def _save(self, chars: List[Dict], updated_at: float):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"updated_at": updated_at, "characters": chars}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def _set_chars(self, chars: List[Dict]):
+        self._chars = chars
+        self._names = list(dict.fromkeys(c["name"] for c in chars))
+
+    def pick_game(self, decoys: int = 3) -> Optional[Tuple[Dict, List[str]]]:
+        # Decoys come from the distinct names, so a duplicate-heavy pool returns None instead of spinning.
+        if len(self._names) <= decoys:
+            return None
+        answer = random.choice(self._chars)
+        wrong = [n for n in random.sample(self._names, decoys + 1) if n != answer["name"]]
+        return answer, wrong[:decoys]
+
+    @staticmethod
+    async def _wait_for_headroom(provider: str):
+        guard = get_guard(provider)
+        while True:
+            wait = guard.bucket.wait_time()
+            if (wait == 0 and guard.breaker.state == CircuitBreaker.CLOSED
+                    and guard.bucket.tokens >= guard.bucket.capacity * REFILL_RESERVE):
+                return
+            await asyncio.sleep(max(wait, REFILL_BACKOFF_SECONDS))
+
+    async def refill(self, session: Optional[aiohttp.ClientSession] = None) -> int:
+        if self._refill_lock.locked():
+            return len(self._chars)
+        async with self._refill_lock:
+            seen = {}
+            plan = [("AniList", p) for p in range(1, ANILIST_PAGES + 1)] + [("Jikan", p) for p in range(1, JIKAN_PAGES + 1)]
+            for provider, page in plan:
+                await self._wait_for_headroom(provider)
+                try:
+                    chars = await fetch_character_page(provider, page, session=session)
+                except Exception as e:
+                    print(f"[CharacterPool] {provider} page {page} failed: {e}")
+                    continue
+                for c in chars:
+                    seen.setdefault(c["name"], c)
+                guard = get_guard(provider)
+                await asyncio.sleep(max(PAGE_DELAY_SECONDS, 1.0 / (guard.bucket.per_second * REFILL_RATE_SHARE)))
+
+            if len(seen) < self.min_size and self._chars:
+                print(f"[CharacterPool] Refill only found {len(seen)} characters; keeping existing pool.")
+                return len(self._chars)
+
+            chars = list(seen.values())
+            updated_at = time.time()
+            await asyncio.to_thread(self._save, chars, updated_at)
+            self._set_chars(chars)
+            self.updated_at = updated_at
+            print(f"[CharacterPool] Refilled with {len(chars)} characters.")
+            return len(chars)
@@ -0,0 +1,269 @@
+import json
+import os
+import random
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+
+def load_grouped_json(path: str) -> Dict[str, list]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return data
+    if isinstance(data, list):
+        return {"Mixed": data}
+    return {"Mixed": []}
+
+
+def load_numbered_lines(path: str) -> Dict[str, list]:
+    with open(path, "r", encoding="utf-8") as f:
+        titles = [line.split(". ", 1)[1].strip() for line in f if ". " in line]
+    return {"Mixed": [{"title": t} for t in titles if t]}
+
+
+def _mix32(x: int) -> int:
+    x ^= x >> 16
+    x = (x * 0x45D9F3B) & 0xFFFFFFFF
+    x ^= x >> 16
+    x = (x * 0x45D9F3B) & 0xFFFFFFFF
+    return x ^ (x >> 16)
+
+
+class _Cursor:
+    """Walks 0..n-1 through a keyed Feistel permutation; O(1) state, new keys every pass."""
+
+    ROUNDS = 8
+    __slots__ = ("n", "half", "mask", "keys", "i")
+
+    def __init__(self, n: int):
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.mask = (1 << self.half) - 1
+        self.reshuffle()
+
+    def reshuffle(self):
+        self.i = 0
+        self.keys = tuple(random.getrandbits(32) for _ in range(self.ROUNDS))
+
+    def _permute(self, x: int) -> int:
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (_mix32(right ^ key) & self.mask)
+        return (left << self.half) | right
+
+    def next(self) -> int:
+        if self.i >= self.n:
+            self.reshuffle()
+        x = self._permute(self.i)
+        self.i += 1
+        # Cycle-walk back into range; the domain is under 4n, so this averages a few steps.
+        while x >= self.n:
+            x = self._permute(x)
+        return x
+
+
+class _Scope:
+    __slots__ = ("cursors", "recent", "recent_set", "next_category")
+
+    def __init__(self, recent_size: int):
+        self.cursors: Dict[int, _Cursor] = {}
+        self.recent: Deque[int] = deque(maxlen=recent_size)
+        self.recent_set: Set[int] = set()
+        self.next_category: Optional[int] = None
+
+    def remap(self, mapping: Dict[int, int]):
+        kept = [mapping[idx] for idx in self.recent if idx in mapping]
+        self.recent.clear()
+        self.recent.extend(kept)
+        self.recent_set = set(kept)
+        self.cursors.clear()
+
+    def remember(self, idx: int):
+        recent = self.recent
+        if recent.maxlen == 0:
+            return
+        if len(recent) == recent.maxlen:
+            self.recent_set.discard(recent[0])
+        recent.append(idx)
+        self.recent_set.add(idx)
+
+
+class ContentBank:
+    RELOAD_CHECK_SECONDS = 5.0
+
+    def __init__(
+        self,
+        path: str,
+        fields: Sequence[str],
+        loader: Callable[[str], Dict[str, list]] = load_grouped_json,
+        category_field: Optional[str] = None,
+        recent_size: int = 32,
+        max_scopes: int = 1024,
+        name: str = "ContentBank",
+    ):
+        self.path = path
+        self.fields = tuple(fields)
+        self.loader = loader
+        self.category_field = category_field
+        self.recent_size = recent_size
+        self.max_scopes = max_scopes
+        self.name = name
+        # Items live in one flat tuple list; a category is a [start, start + length) slice of it.
+        self._items: List[tuple] = []
+        self._names: List[str] = []
+        self._starts = array("I")
+        self._lengths = array("I")
+        self._scopes: "OrderedDict[Hashable, _Scope]" = OrderedDict()
+        self._mtime = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        groups = self.loader(self.path)
+        interned: Dict[str, str] = {}
+        items: List[tuple] = []
+        names: List[str] = []
+        starts, lengths = array("I"), array("I")
+        for name, entries in groups.items():
+            start = len(items)
+            for entry in entries or []:
+                if not isinstance(entry, dict):
+                    continue
+                row = tuple(self._compact(entry.get(f), interned) for f in self.fields)
+                if row[0] in (None, ""):
+                    continue
+                items.append(row)
+            if len(items) > start:
+                names.append(interned.setdefault(name, name))
+                starts.append(start)
+                lengths.append(len(items) - start)
+        order = list(range(len(names)))
+        random.shuffle(order)
+        with self._lock:
+            if self._scopes:
+                # Keep each scope's recent picks across a reload: entries that survived are
+                # re-pointed at their new positions, and cursors restart over the new layout.
+                position = {self._row_key(row): i for i, row in enumerate(items)}
+                mapping = {}
+                for old, row in enumerate(self._items):
+                    new = position.get(self._row_key(row))
+                    if new is not None:
+                        mapping[old] = new
+                for scope in self._scopes.values():
+                    scope.remap(mapping)
+                    scope.next_category = None
+            self._items = items
+            self._names = [names[i] for i in order]
+            self._starts = array("I", (starts[i] for i in order))
+            self._lengths = array("I", (lengths[i] for i in order))
+            self._mtime = os.path.getmtime(self.path)
+        print(f"[{self.name}] Loaded {len(items)} entries in {len(names)} categories.")
+
+    @staticmethod
+    def _row_key(row: tuple) -> str:
+        # Rows may hold dicts or lists from the JSON, so identity across reloads goes by a canonical dump.
+        return json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def _compact(value, interned: Dict[str, str]):
+        if isinstance(value, str):
+            return interned.setdefault(value, value)
+        if isinstance(value, list):
+            return tuple(interned.setdefault(v, v) if isinstance(v, str) else v for v in value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self._names)
+
+    def maybe_reload(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < self.RELOAD_CHECK_SECONDS:
+            return False
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        try:
+            self.load()
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[{self.name}] Reload failed, keeping previous entries: {e}")
+            self._mtime = mtime
+            return False
+        return True
+
+    def _scope(self, key: Hashable) -> _Scope:
+        scope = self._scopes.get(key)
+        if scope is None:
+            scope = self._scopes[key] = _Scope(self.recent_size)
+            if len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+        else:
+            self._scopes.move_to_end(key)
+        return scope
+
+    def _row(self, idx: int, category: int) -> dict:
+        row = dict(zip(self.fields, self._items[idx]))
+        if self.category_field:
+            row[self.category_field] = self._names[category]
+        return row
+
+    def _draw_index(self, scope: _Scope, category: int) -> int:
+        cursor = scope.cursors.get(category)
+        if cursor is None:
+            cursor = scope.cursors[category] = _Cursor(self._lengths[category])
+        start = self._starts[category]
+        # The cursor never repeats within a pass, so only a pass boundary or a neighbouring
+        # category can hit the recent ring; a bounded number of skips resolves it.
+        idx = start + cursor.next()
+        for _ in range(min(cursor.n, self.recent_size) - 1):
+            if idx not in scope.recent_set:
+                break
+            idx = start + cursor.next()
+        scope.remember(idx)
+        return idx
+
+    def draw(self, scope_key: Hashable = 0, category: Optional[str] = None) -> Optional[dict]:
+        self.maybe_reload()
+        with self._lock:
+            if not self._names:
+                return None
+            scope = self._scope(scope_key)
+            if category is None:
+                cat = scope.next_category
+                if cat is None:
+                    cat = random.randrange(len(self._names))
+                scope.next_category = (cat + 1) % len(self._names)
+            else:
+                try:
+                    cat = self._names.index(category)
+                except ValueError:
+                    return None
+            return self._row(self._draw_index(scope, cat), cat)
+
+    def sample(self, scope_key: Hashable, k: int) -> List[dict]:
+        self.maybe_reload()
+        with self._lock:
+            if not self._names or k <= 0:
+                return []
+            scope = self._scope(scope_key)
+            n = len(self._names)
+            start = scope.next_category
+            if start is None:
+                start = random.randrange(n)
+            picked = []
+            for i in range(k):
+                cat = (start + i) % n
+                picked.append(self._row(self._draw_index(scope, cat), cat))
+            scope.next_category = (start + k) % n
+            return picked
@@ -0,0 +1,25 @@
+import aiohttp
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=4, sock_read=8)
+IMAGE_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=6, connect=3, sock_read=4)
+
+POOL_LIMIT = 64
+POOL_LIMIT_PER_HOST = 8
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+USER_AGENT = "MinoriBot (discord.py; aiohttp)"
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=DEFAULT_TIMEOUT,
+        headers={"User-Agent": USER_AGENT},
+    )
@@ -0,0 +1,266 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+LEDGER_BATCH_WINDOW = 0.05
+LEDGER_MAX_BATCH = 256
+
+SQL_CREATE_USER_INVENTORY = """
+    CREATE TABLE IF NOT EXISTS user_inventory (
+        user_id INTEGER,
+        guild_id INTEGER,
+        item_name TEXT,
+        quantity INTEGER,
+        PRIMARY KEY(user_id, guild_id, item_name)
+    )
+"""
+SQL_CREATE_LEDGER = """
+    CREATE TABLE IF NOT EXISTS ledger (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        guild_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        coins_delta INTEGER NOT NULL DEFAULT 0,
+        item_name TEXT,
+        item_delta INTEGER NOT NULL DEFAULT 0,
+        ref TEXT,
+        created_at REAL NOT NULL
+    )
+"""
+SQL_INSERT_LEDGER = """
+    INSERT INTO ledger (user_id, guild_id, kind, coins_delta, item_name, item_delta, ref, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_DEBIT_COINS = "UPDATE user_coins SET coins = coins - ? WHERE user_id = ? AND guild_id = ? AND coins >= ? RETURNING coins"
+SQL_CREDIT_COINS = """
+    INSERT INTO user_coins (user_id, guild_id, coins) VALUES (?, ?, ?)
+    ON CONFLICT(user_id, guild_id) DO UPDATE SET coins = coins + excluded.coins
+    RETURNING coins
+"""
+SQL_ADD_COINS = """
+    INSERT INTO user_coins (user_id, guild_id, coins) VALUES (?, ?, ?)
+    ON CONFLICT(user_id, guild_id) DO UPDATE SET coins = coins + excluded.coins
+"""
+SQL_TAKE_ITEM = """
+    UPDATE user_inventory SET quantity = quantity - ?
+    WHERE user_id = ? AND guild_id = ? AND item_name = ? AND quantity >= ?
+    RETURNING quantity
+"""
+SQL_GIVE_ITEM = """
+    INSERT INTO user_inventory (user_id, guild_id, item_name, quantity) VALUES (?, ?, ?, ?)
+    ON CONFLICT(user_id, guild_id, item_name) DO UPDATE SET quantity = quantity + excluded.quantity
+    RETURNING quantity
+"""
+SQL_ADD_ITEM = """
+    INSERT INTO user_inventory (user_id, guild_id, item_name, quantity) VALUES (?, ?, ?, ?)
+    ON CONFLICT(user_id, guild_id, item_name) DO UPDATE SET quantity = quantity + excluded.quantity
+"""
+SQL_DROP_EMPTY_ITEM = "DELETE FROM user_inventory WHERE user_id = ? AND guild_id = ? AND item_name = ? AND quantity <= 0"
+
+
+class LedgerEntry(NamedTuple):
+    user_id: int
+    guild_id: int
+    kind: str
+    coins: int = 0
+    item: Optional[str] = None
+    qty: int = 0
+    ref: Optional[str] = None
+
+
+class Ledger:
+    """Append-only record of coin and item changes; user_coins and user_inventory are its running totals."""
+
+    def __init__(self, conn, lock: asyncio.Lock, window: float = LEDGER_BATCH_WINDOW, max_batch: int = LEDGER_MAX_BATCH):
+        self.conn = conn
+        self.lock = lock
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Sequence[LedgerEntry], asyncio.Future]] = []
+        self._pending_count = 0
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats = {"batches": 0, "entries": 0}
+
+    async def init(self):
+        await self.conn.execute(SQL_CREATE_USER_INVENTORY)
+        await self.conn.execute(SQL_CREATE_LEDGER)
+        await self.conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_user ON ledger(guild_id, user_id, seq)")
+        async with self.conn.execute("SELECT 1 FROM ledger LIMIT 1") as cur:
+            started = await cur.fetchone()
+        if not started:
+            # Balances that predate the ledger become one opening entry each, so replay starts from them.
+            now = time.time()
+            await self.conn.execute("""
+                INSERT INTO ledger (user_id, guild_id, kind, coins_delta, created_at)
+                SELECT user_id, guild_id, 'opening', coins, ? FROM user_coins WHERE coins != 0
+            """, (now,))
+            await self.conn.execute("""
+                INSERT INTO ledger (user_id, guild_id, kind, item_name, item_delta, created_at)
+                SELECT user_id, guild_id, 'opening', item_name, quantity, ? FROM user_inventory WHERE quantity > 0
+            """, (now,))
+        await self.conn.commit()
+        drift = await self.replay()
+        if drift["coins"] or drift["items"]:
+            print(f"[Ledger] Balances drifted from the ledger: {drift['coins']} coin and {drift['items']} item row(s).")
+
+    @staticmethod
+    def _rows(entries: Iterable[LedgerEntry], now: float) -> List[tuple]:
+        return [(e.user_id, e.guild_id, e.kind, e.coins, e.item, e.qty, e.ref, now) for e in entries]
+
+    async def post(self, *entries: LedgerEntry):
+        """Queues credits for the next group commit and waits until they are settled."""
+        for e in entries:
+            if e.coins < 0 or e.qty < 0:
+                raise ValueError("Ledger.post only accepts credits; use transact for debits")
+        if not entries:
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((entries, fut))
+        self._pending_count += len(entries)
+        if self._pending_count >= self.max_batch:
+            await self.flush()
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+        await fut
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        await self.flush()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        async with self.lock:
+            await self._settle()
+
+    async def _settle(self):
+        # Caller holds the lock. One transaction appends the batch and folds it into the balances.
+        batch, self._pending, self._pending_count = self._pending, [], 0
+        if not batch:
+            return
+        entries = [e for group, _ in batch for e in group]
+        coins: Dict[Tuple[int, int], int] = defaultdict(int)
+        items: Dict[Tuple[int, int, str], int] = defaultdict(int)
+        for e in entries:
+            if e.coins:
+                coins[(e.user_id, e.guild_id)] += e.coins
+            if e.item and e.qty:
+                items[(e.user_id, e.guild_id, e.item)] += e.qty
+        try:
+            await self.conn.executemany(SQL_INSERT_LEDGER, self._rows(entries, time.time()))
+            if coins:
+                await self.conn.executemany(SQL_ADD_COINS, [(u, g, c) for (u, g), c in coins.items()])
+            if items:
+                await self.conn.executemany(SQL_ADD_ITEM, [(u, g, name, q) for (u, g, name), q in items.items()])
+            await self.conn.commit()
+        except Exception as e:
+            await self.conn.rollback()
+            print(f"[Ledger] Failed to settle {len(entries)} entries: {e}")
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self.stats["batches"] += 1
+        self.stats["entries"] += len(entries)
+        for _, fut in batch:
+            if not fut.done():
+                fut.set_result(None)
+
+    async def _apply(self, entries: Sequence[LedgerEntry]) -> Optional[List[int]]:
+        results = []
+        for e in entries:
+            balance = None
+            if e.coins < 0:
+                async with self.conn.execute(SQL_DEBIT_COINS, (-e.coins, e.user_id, e.guild_id, -e.coins)) as cur:
+                    row = await cur.fetchone()
+                if not row:
+                    return None
+                balance = int(row[0])
+            elif e.coins > 0:
+                async with self.conn.execute(SQL_CREDIT_COINS, (e.user_id, e.guild_id, e.coins)) as cur:
+                    balance = int((await cur.fetchone())[0])
+            if e.item and e.qty < 0:
+                async with self.conn.execute(SQL_TAKE_ITEM, (-e.qty, e.user_id, e.guild_id, e.item, -e.qty)) as cur:
+                    row = await cur.fetchone()
+                if not row:
+                    return None
+                await self.conn.execute(SQL_DROP_EMPTY_ITEM, (e.user_id, e.guild_id, e.item))
+                if balance is None:
+                    balance = int(row[0])
+            elif e.item and e.qty > 0:
+                async with self.conn.execute(SQL_GIVE_ITEM, (e.user_id, e.guild_id, e.item, e.qty)) as cur:
+                    row = await cur.fetchone()
+                if balance is None:
+                    balance = int(row[0])
+            results.append(balance if balance is not None else 0)
+        return results
+
+    async def transact(
+        self,
+        entries: Sequence[LedgerEntry],
+        then: Optional[Callable[[List[int]], Iterable[LedgerEntry]]] = None,
+    ) -> Optional[List[int]]:
+        """Applies entries atomically, debits only if covered; returns each entry's new coin (or item) balance, or None."""
+        async with self.lock:
+            await self._settle()
+            try:
+                results = await self._apply(entries)
+                if results is not None and then is not None:
+                    extra = list(then(results) or ())
+                    more = await self._apply(extra)
+                    if more is None:
+                        results = None
+                    else:
+                        entries = list(entries) + extra
+                        results += more
+                if results is None:
+                    await self.conn.rollback()
+                    return None
+                await self.conn.executemany(SQL_INSERT_LEDGER, self._rows(entries, time.time()))
+                await self.conn.commit()
+            except Exception:
+                await self.conn.rollback()
+                raise
+        return results
+
+    async def replay(self, apply: bool = False) -> Dict[str, int]:
+        """Recomputes balances from the ledger; with apply=True the tables are rewritten to match."""
+        async with self.lock:
+            await self._settle()
+            async with self.conn.execute(
+                "SELECT user_id, guild_id, SUM(coins_delta) FROM ledger WHERE coins_delta != 0 GROUP BY user_id, guild_id"
+            ) as cur:
+                want_coins = {(u, g): int(total) for u, g, total in await cur.fetchall()}
+            async with self.conn.execute("SELECT user_id, guild_id, coins FROM user_coins") as cur:
+                have_coins = {(u, g): int(c or 0) for u, g, c in await cur.fetchall()}
+            async with self.conn.execute(
+                "SELECT user_id, guild_id, item_name, SUM(item_delta) FROM ledger "
+                "WHERE item_name IS NOT NULL GROUP BY user_id, guild_id, item_name"
+            ) as cur:
+                want_items = {(u, g, n): int(total) for u, g, n, total in await cur.fetchall()}
+            async with self.conn.execute("SELECT user_id, guild_id, item_name, quantity FROM user_inventory") as cur:
+                have_items = {(u, g, n): int(q or 0) for u, g, n, q in await cur.fetchall()}
+
+            coin_drift = [k for k in want_coins.keys() | have_coins.keys() if want_coins.get(k, 0) != have_coins.get(k, 0)]
+            item_drift = [
+                k for k in want_items.keys() | have_items.keys()
+                if max(want_items.get(k, 0), 0) != max(have_items.get(k, 0), 0)
+            ]
+            if apply and (coin_drift or item_drift):
+                await self.conn.executemany(
+                    "INSERT INTO user_coins (user_id, guild_id, coins) VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id, guild_id) DO UPDATE SET coins = excluded.coins",
+                    [(u, g, want_coins.get((u, g), 0)) for u, g in coin_drift],
+                )
+                await self.conn.executemany(
+                    "INSERT INTO user_inventory (user_id, guild_id, item_name, quantity) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(user_id, guild_id, item_name) DO UPDATE SET quantity = excluded.quantity",
+                    [(u, g, n, want_items.get((u, g, n), 0)) for u, g, n in item_drift],
+                )
+                await self.conn.execute("DELETE FROM user_inventory WHERE quantity <= 0")
+                await self.conn.commit()
+        return {"coins": len(coin_drift), "items": len(item_drift)}
+
+    async def close(self):
+        await self.flush()
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+import discord
+
+
+class MemberInfo(NamedTuple):
+    display_name: str
+    avatar: discord.Asset
+    avatar_key: str
+
+
+def _info_for(user) -> MemberInfo:
+    avatar = user.display_avatar
+    return MemberInfo(user.display_name, avatar, avatar.key)
+
+
+class MemberCache:
+    QUERY_CHUNK = 100
+
+    def __init__(self, bot: discord.Client, ttl: float = 900.0, max_entries: int = 20000):
+        self.bot = bot
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[int, int], Tuple[float, MemberInfo]] = {}
+        self._guild_locks: Dict[int, asyncio.Lock] = {}
+        self.stats = {"gateway": 0, "hits": 0, "queried": 0, "unresolved": 0}
+
+    def remember(self, member: discord.Member):
+        if len(self._entries) >= self.max_entries:
+            self._evict_expired()
+        self._entries[(member.guild.id, member.id)] = (time.monotonic() + self.ttl, _info_for(member))
+
+    def forget(self, guild_id: int, user_id: int):
+        self._entries.pop((guild_id, user_id), None)
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    def get(self, guild: discord.Guild, user_id: int) -> Optional[MemberInfo]:
+        member = guild.get_member(user_id)
+        if member is not None:
+            self.stats["gateway"] += 1
+            return _info_for(member)
+        entry = self._entries.get((guild.id, user_id))
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[(guild.id, user_id)]
+            return None
+        self.stats["hits"] += 1
+        return entry[1]
+
+    async def _query(self, guild: discord.Guild, user_ids: list) -> Dict[int, discord.Member]:
+        found: Dict[int, discord.Member] = {}
+        lock = self._guild_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            for i in range(0, len(user_ids), self.QUERY_CHUNK):
+                chunk = user_ids[i:i + self.QUERY_CHUNK]
+                try:
+                    members = await guild.query_members(user_ids=chunk, cache=True)
+                except (asyncio.TimeoutError, discord.ClientException) as e:
+                    print(f"[member_cache] query_members failed in guild {guild.id}: {e}")
+                    continue
+                self.stats["queried"] += len(chunk)
+                for m in members:
+                    self.remember(m)
+                    found[m.id] = m
+        return found
+
+    async def resolve_many(self, guild: discord.Guild, user_ids: Iterable[int]) -> Dict[int, MemberInfo]:
+        resolved: Dict[int, MemberInfo] = {}
+        misses = []
+        for uid in user_ids:
+            info = self.get(guild, uid)
+            if info is not None:
+                resolved[uid] = info
+            else:
+                misses.append(uid)
+        if misses:
+            for uid, member in (await self._query(guild, misses)).items():
+                resolved[uid] = _info_for(member)
+            for uid in misses:
+                if uid in resolved:
+                    continue
+                user = self.bot.get_user(uid)
+                if user is not None:
+                    resolved[uid] = _info_for(user)
+                else:
+                    self.stats["unresolved"] += 1
+        return resolved
+
+    async def resolve_member(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        return (await self._query(guild, [user_id])).get(user_id)
+
+    async def on_member_join(self, member: discord.Member):
+        self.remember(member)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        self.remember(after)
+
+    async def on_member_remove(self, member: discord.Member):
+        self.forget(member.guild.id, member.id)
+
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        for guild_id, user_id in [k for k in self._entries if k[1] == after.id]:
+            self.forget(guild_id, user_id)
@@ -1,18 +1,32 @@
 import aiosqlite
 import asyncio
+import heapq
 import discord
+import io
 import json
+from array import array
 from datetime import datetime, timedelta, timezone 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from discord import ui
 from discord.ext import commands
+from cogs.utils.progUtils import poll_chart_key, render_poll_chart
 import os
+import time
 
 DB_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "data", "minori.db")
 
 _DB: Optional[aiosqlite.Connection] = None
 _DB_LOCK = asyncio.Lock()
 MODAL_PLACEHOLDER = "Leave empty if not needed"
+RENDER_COALESCE_SECONDS = 1.5
+VOTE_JOURNAL_COMPACT_SECONDS = 300
+POLL_ARCHIVE_SECONDS = 600
+POLL_TIMEOUT_BATCH_SIZE = 25
+# Bumped whenever PollView components change; older messages get one edit on restore.
+POLL_VIEW_VERSION = 1
+POLL_CHART_FILENAME = "poll_chart.png"
+# Discord rejects embeds with more than 25 fields; one is always the status line.
+EMBED_MAX_FIELDS = 25
 
 async def get_db() -> aiosqlite.Connection:
     global _DB
@@ -62,18 +76,102 @@ async def init_db():
                     await conn.commit()
                 except aiosqlite.Error:
                     pass
+            if "chart" not in col_names:
+                try:
+                    await conn.execute("ALTER TABLE polls ADD COLUMN chart INTEGER DEFAULT 0")
+                    await conn.commit()
+                except aiosqlite.Error:
+                    pass
+            if "view_version" not in col_names:
+                try:
+                    await conn.execute("ALTER TABLE polls ADD COLUMN view_version INTEGER DEFAULT 0")
+                    await conn.commit()
+                except aiosqlite.Error:
+                    pass
 
         await conn.execute("UPDATE polls SET options='[]' WHERE options IS NULL")
         await conn.execute("UPDATE polls SET votes='{}' WHERE votes IS NULL")
+
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS poll_votes (
+                message_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                option_idx INTEGER NOT NULL,
+                PRIMARY KEY (message_id, user_id)
+            ) WITHOUT ROWID
+        """)
+        # One row per vote or removal (option_idx NULL); folded into poll_votes by compact_vote_journal.
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS poll_vote_journal (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                option_idx INTEGER
+            )
+        """)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS poll_results (
+                message_id INTEGER PRIMARY KEY,
+                guild_id INTEGER,
+                channel_id INTEGER,
+                author_id INTEGER,
+                question TEXT,
+                counts TEXT,
+                winners TEXT,
+                total_votes INTEGER,
+                end_time REAL,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await conn.execute("CREATE INDEX IF NOT EXISTS idx_poll_results_guild ON poll_results(guild_id)")
         await conn.commit()
+        await _backfill_poll_votes(conn)
+
+async def _backfill_poll_votes(conn: aiosqlite.Connection):
+    async with conn.execute("""
+        SELECT message_id, options, votes FROM polls
+        WHERE ended = 0 AND votes IS NOT NULL AND votes != '{}'
+    """) as cur:
+        rows = await cur.fetchall()
+    if not rows:
+        return
+    migrated = 0
+    for message_id, options_json, votes_json in rows:
+        try:
+            options = json.loads(options_json or "[]")
+            votes = json.loads(votes_json or "{}")
+        except ValueError:
+            continue
+        entries = []
+        for opt, uids in votes.items():
+            if opt not in options:
+                continue
+            idx = options.index(opt)
+            for uid in uids or []:
+                try:
+                    entries.append((message_id, int(uid), idx))
+                except (TypeError, ValueError):
+                    continue
+        async with _DB_LOCK:
+            await conn.executemany(
+                "INSERT OR IGNORE INTO poll_votes (message_id, user_id, option_idx) VALUES (?, ?, ?)", entries
+            )
+            await conn.execute("UPDATE polls SET votes='{}' WHERE message_id=?", (message_id,))
+            await conn.commit()
+        migrated += 1
+    print(f"[Poll DB] Migrated votes for {migrated} poll(s) into poll_votes.")
 
-async def save_active_poll(message_id, guild_id, channel_id, author_id, question, options, votes, end_time):
+async def save_active_poll(message_id, guild_id, channel_id, author_id, question, options, end_time, chart=False):
     conn = await get_db()
     async with _DB_LOCK:
         await conn.execute("""
-            INSERT OR REPLACE INTO polls 
-            (message_id, guild_id, channel_id, author_id, question, options, votes, end_time, ended)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+            INSERT INTO polls
+            (message_id, guild_id, channel_id, author_id, question, options, votes, end_time, ended, view_version, chart)
+            VALUES (?, ?, ?, ?, ?, ?, '{}', ?, 0, ?, ?)
+            ON CONFLICT(message_id) DO UPDATE SET
+                question=excluded.question,
+                options=excluded.options,
+                end_time=excluded.end_time
         """, (
             message_id,
             guild_id,
@@ -81,11 +179,50 @@ async def save_active_poll(message_id, guild_id, channel_id, author_id, question
             author_id,
             question,
             json.dumps(options),
-            json.dumps({k: list(v) for k, v in votes.items()}),
-            end_time.timestamp() if end_time else None
+            end_time.timestamp() if end_time else None,
+            POLL_VIEW_VERSION,
+            1 if chart else 0
         ))
         await conn.commit()
 
+async def mark_poll_view_version(message_id: int):
+    conn = await get_db()
+    async with _DB_LOCK:
+        await conn.execute("UPDATE polls SET view_version=? WHERE message_id=?", (POLL_VIEW_VERSION, message_id))
+        await conn.commit()
+
+async def record_vote(message_id: int, user_id: int, option_idx: Optional[int]):
+    conn = await get_db()
+    async with _DB_LOCK:
+        await conn.execute(
+            "INSERT INTO poll_vote_journal (message_id, user_id, option_idx) VALUES (?, ?, ?)",
+            (message_id, user_id, option_idx),
+        )
+        await conn.commit()
+
+async def compact_vote_journal() -> int:
+    conn = await get_db()
+    async with _DB_LOCK:
+        async with conn.execute(
+            "SELECT seq, message_id, user_id, option_idx FROM poll_vote_journal ORDER BY seq"
+        ) as cur:
+            rows = await cur.fetchall()
+        if not rows:
+            return 0
+        latest = {}
+        for _, message_id, user_id, option_idx in rows:
+            latest[(message_id, user_id)] = option_idx
+        upserts = [(m, u, idx) for (m, u), idx in latest.items() if idx is not None]
+        removals = [(m, u) for (m, u), idx in latest.items() if idx is None]
+        await conn.executemany("""
+            INSERT INTO poll_votes (message_id, user_id, option_idx) VALUES (?, ?, ?)
+            ON CONFLICT(message_id, user_id) DO UPDATE SET option_idx=excluded.option_idx
+        """, upserts)
+        await conn.executemany("DELETE FROM poll_votes WHERE message_id=? AND user_id=?", removals)
+        await conn.execute("DELETE FROM poll_vote_journal WHERE seq <= ?", (rows[-1][0],))
+        await conn.commit()
+    return len(rows)
+
 async def record_poll_result(message_id, winners, counts, total_votes):
     conn = await get_db()
     async with _DB_LOCK:
@@ -102,6 +239,7 @@ async def record_poll_result(message_id, winners, counts, total_votes):
         await conn.commit()
 
 async def load_active_polls():
+    await compact_vote_journal()
     conn = await get_db()
     query = """
         SELECT
@@ -111,41 +249,240 @@ async def load_active_polls():
             author_id,
             question,
             options,
-            votes,
             end_time,
-            ended
+            ended,
+            view_version,
+            chart
         FROM polls
         WHERE ended = 0
     """
     async with conn.execute(query) as cursor:
         rows = await cursor.fetchall()
-        cols = ["message_id","guild_id","channel_id","author_id","question","options","votes","end_time","ended"]
-        return [dict(zip(cols, row)) for row in rows]
-
-async def purge_finished_polls():
+    cols = ["message_id","guild_id","channel_id","author_id","question","options","end_time","ended","view_version","chart"]
+    polls = [dict(zip(cols, row)) for row in rows]
+
+    async with conn.execute("""
+        SELECT v.message_id, v.user_id, v.option_idx
+        FROM poll_votes v JOIN polls p ON p.message_id = v.message_id
+        WHERE p.ended = 0
+    """) as cursor:
+        vote_rows = await cursor.fetchall()
+    by_poll = {}
+    for message_id, user_id, option_idx in vote_rows:
+        by_poll.setdefault(message_id, []).append((user_id, option_idx))
+
+    for poll in polls:
+        try:
+            options = json.loads(poll["options"] or "[]")
+        except ValueError:
+            options = []
+        votes = {opt: [] for opt in options}
+        for user_id, option_idx in by_poll.get(poll["message_id"], ()):
+            if 0 <= option_idx < len(options):
+                votes[options[option_idx]].append(user_id)
+        poll["votes"] = votes
+    return polls
+
+async def archive_finished_polls() -> int:
     conn = await get_db()
     async with _DB_LOCK:
+        cur = await conn.execute("""
+            INSERT OR REPLACE INTO poll_results
+            (message_id, guild_id, channel_id, author_id, question, counts, winners, total_votes, end_time)
+            SELECT message_id, guild_id, channel_id, author_id, question, counts, winners, total_votes, end_time
+            FROM polls WHERE ended = 1
+        """)
+        archived = cur.rowcount
+        await conn.execute("DELETE FROM poll_vote_journal WHERE message_id IN (SELECT message_id FROM polls WHERE ended=1)")
+        await conn.execute("DELETE FROM poll_votes WHERE message_id IN (SELECT message_id FROM polls WHERE ended=1)")
         await conn.execute("DELETE FROM polls WHERE ended=1")
         await conn.commit()
+    return max(archived, 0)
+
+class VoteState:
+    """Current choice per voter plus running per-option counts; every update is O(1)."""
+
+    __slots__ = ("choices", "counts")
+
+    def __init__(self, option_count: int = 0):
+        self.choices: Dict[int, int] = {}
+        self.counts = array("I", [0] * option_count)
+
+    @property
+    def total(self) -> int:
+        return len(self.choices)
+
+    def add_option(self):
+        self.counts.append(0)
+
+    def choice_of(self, user_id: int) -> Optional[int]:
+        return self.choices.get(user_id)
+
+    def cast(self, user_id: int, option_idx: int) -> Optional[int]:
+        previous = self.choices.get(user_id)
+        if previous == option_idx:
+            return previous
+        if previous is not None:
+            self.counts[previous] -= 1
+        self.choices[user_id] = option_idx
+        self.counts[option_idx] += 1
+        return previous
+
+    def remove(self, user_id: int) -> Optional[int]:
+        previous = self.choices.pop(user_id, None)
+        if previous is not None:
+            self.counts[previous] -= 1
+        return previous
+
+    def results(self, options: List[str]) -> Dict[str, int]:
+        return {opt: self.counts[i] for i, opt in enumerate(options)}
+
+    def snapshot(self, options: List[str]) -> Dict[str, List[int]]:
+        votes = {opt: [] for opt in options}
+        for user_id, idx in self.choices.items():
+            votes[options[idx]].append(user_id)
+        return votes
+
+    @classmethod
+    def restore(cls, options: List[str], votes: Dict[str, Iterable[int]]) -> "VoteState":
+        state = cls(len(options))
+        index = {opt: i for i, opt in enumerate(options)}
+        for opt, user_ids in votes.items():
+            idx = index.get(opt)
+            if idx is None:
+                continue
+            for user_id in user_ids:
+                state.cast(int(user_id), idx)
+        return state
+
+class PollScheduler:
+    """Owns every poll deadline in one heap and ends due polls from a single task."""
+
+    def __init__(self, batch_size: int = POLL_TIMEOUT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._heap: list = []
+        self._deadlines: Dict["PollView", float] = {}
+        self._seq = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, view: "PollView", end_time: datetime):
+        deadline = end_time.timestamp()
+        self._deadlines[view] = deadline
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, view))
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def reschedule(self, view: "PollView", end_time: datetime):
+        self.schedule(view, end_time)
+
+    def cancel(self, view: "PollView"):
+        # Heap entries are dropped lazily once they surface with a stale deadline.
+        self._deadlines.pop(view, None)
+
+    def _pop_due(self, now: float) -> List["PollView"]:
+        due = []
+        while self._heap and len(due) < self.batch_size:
+            deadline, _, view = self._heap[0]
+            if self._deadlines.get(view) != deadline:
+                heapq.heappop(self._heap)
+                continue
+            if deadline > now:
+                break
+            heapq.heappop(self._heap)
+            del self._deadlines[view]
+            due.append(view)
+        return due
+
+    async def _run(self):
+        while self._heap:
+            now = datetime.now(timezone.utc).timestamp()
+            due = self._pop_due(now)
+            if due:
+                results = await asyncio.gather(*(view.on_timeout() for view in due), return_exceptions=True)
+                for view, result in zip(due, results):
+                    if isinstance(result, Exception):
+                        print(f"[PollScheduler] failed to end poll {view.message.id if view.message else '?'}: {result}")
+                continue
+            if not self._heap:
+                break
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, self._heap[0][0] - now))
+            except asyncio.TimeoutError:
+                pass
+
+_SCHEDULER: Optional[PollScheduler] = None
+
+def get_poll_scheduler() -> PollScheduler:
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = PollScheduler()
+    return _SCHEDULER
+
+class PollRenderScheduler:
+    """Coalesces poll message edits so a burst of votes costs one edit per window."""
+
+    def __init__(self, view: "PollView", window: float = RENDER_COALESCE_SECONDS):
+        self.view = view
+        self.window = window
+        self.dirty = False
+        self.last_render = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+    def request(self):
+        self.dirty = True
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        # Votes that land while waiting or editing set dirty again, so the last state always gets flushed.
+        while self.dirty and not self.view.ended:
+            delay = self.last_render + self.window - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.view.ended:
+                break
+            self.dirty = False
+            self.last_render = time.monotonic()
+            try:
+                await self.view.push_embed()
+            except Exception as e:
+                print(f"[Poll Render] failed to update poll message: {e}")
+
+    def cancel(self):
+        self.dirty = False
+        if self.task and self.task is not asyncio.current_task() and not self.task.done():
+            self.task.cancel()
 
 class PollView(discord.ui.View):
-    def __init__(self, question: str, options: List[str], author: discord.Member, timeout: Optional[int] = None):
-        super().__init__(timeout=timeout)
+    def __init__(self, question: str, options: List[str], author: discord.Member, timeout: Optional[int] = None, chart: bool = False):
+        super().__init__(timeout=None)
         self.question = question
         self.options = options
-        self.votes = {opt: set() for opt in options}
+        self.votes = VoteState(len(options))
         self.author = author
         self.message: Optional[discord.Message] = None
-        self.updater_task: Optional[asyncio.Task] = None
         self.ended = False
         self.end_time = (datetime.now(timezone.utc) + timedelta(seconds=timeout)) if timeout else None
+        self.renderer = PollRenderScheduler(self)
+        self.chart = chart
+        self._chart_key = None
 
-        add_button = discord.ui.Button(label="Add Option", style=discord.ButtonStyle.green)
+        add_button = discord.ui.Button(label="Add Option", style=discord.ButtonStyle.green, custom_id="poll:add_option")
         add_button.callback = self.add_option
         self.add_item(add_button)
 
         select = discord.ui.Select(
             placeholder="Select one answer",
+            custom_id="poll:vote",
             options=[discord.SelectOption(label=opt, value=str(i)) for i, opt in enumerate(options)],
             min_values=1,
             max_values=1
@@ -153,28 +490,16 @@ class PollView(discord.ui.View):
         select.callback = self.select_callback
         self.add_item(select)
 
-        remove_button = discord.ui.Button(label="Remove Vote", style=discord.ButtonStyle.danger)
+        remove_button = discord.ui.Button(label="Remove Vote", style=discord.ButtonStyle.danger, custom_id="poll:remove_vote")
         remove_button.callback = self.remove_vote
         self.add_item(remove_button)
 
-        end_button = discord.ui.Button(label="End Poll", style=discord.ButtonStyle.red)
+        end_button = discord.ui.Button(label="End Poll", style=discord.ButtonStyle.red, custom_id="poll:end")
         end_button.callback = self.end_poll
         self.add_item(end_button)
 
         if self.end_time:
-            loop = asyncio.get_running_loop()
-            self.updater_task = loop.create_task(self._auto_end())
-
-    async def _auto_end(self):
-        if self.ended or not self.end_time:
-            return
-
-        remaining = (self.end_time - datetime.now(timezone.utc)).total_seconds()
-        if remaining > 0:
-            await asyncio.sleep(remaining)
-
-        if not self.ended:
-            await self.on_timeout()
+            get_poll_scheduler().schedule(self, self.end_time)
 
     async def _ensure_poll_active(self, interaction: discord.Interaction) -> bool:
         if self.ended:
@@ -187,11 +512,6 @@ class PollView(discord.ui.View):
                     pass
             return False
         if self.end_time and datetime.now(timezone.utc) >= self.end_time:
-            if self.updater_task and not self.updater_task.done():
-                try:
-                    self.updater_task.cancel()
-                except Exception:
-                    pass
             await self.on_timeout()
             try:
                 await interaction.response.send_message("⚠️ Poll has already ended.", ephemeral=True)
@@ -203,19 +523,8 @@ class PollView(discord.ui.View):
             return False
         return True
 
-    def _cancel_updater_if_needed(self):
-        try:
-            current = asyncio.current_task()
-        except Exception:
-            current = None
-        if self.updater_task and self.updater_task is not current and not self.updater_task.done():
-            try:
-                self.updater_task.cancel()
-            except Exception:
-                pass
-
     def _compute_results(self):
-        results = {opt: len(users) for opt, users in self.votes.items()}
+        results = self.votes.results(self.options)
         winners = []
         winner_text = ""
         if results:
@@ -250,12 +559,30 @@ class PollView(discord.ui.View):
         except aiosqlite.Error as e:
             print(f"[Poll DB Save Error] {e}")
 
+    async def chart_file(self, closed: bool = False) -> Optional[discord.File]:
+        counts = list(self.votes.counts)
+        key = poll_chart_key(self.question, self.options, counts, closed)
+        if key == self._chart_key:
+            return None
+        try:
+            data = await asyncio.to_thread(render_poll_chart, self.question, self.options, counts, closed)
+        except Exception as e:
+            print(f"[Poll Chart] render failed: {e}")
+            return None
+        self._chart_key = key
+        return discord.File(io.BytesIO(data), filename=POLL_CHART_FILENAME)
+
     async def _finalize_view(self, winner_text: str):
         self.clear_items()
         if self.message:
             final_embed = self.make_poll_embed(closed=True)
+            extra = {}
+            if self.chart:
+                chart = await self.chart_file(closed=True)
+                if chart:
+                    extra["attachments"] = [chart]
             try:
-                await self.message.edit(embed=final_embed, view=self)
+                await self.message.edit(embed=final_embed, view=self, **extra)
             except Exception as e:
                 print(f"[on_timeout] failed editing final embed: {e}")
             if winner_text:
@@ -268,7 +595,8 @@ class PollView(discord.ui.View):
         if self.ended:
             return
         self.ended = True
-        self._cancel_updater_if_needed()
+        get_poll_scheduler().cancel(self)
+        self.renderer.cancel()
         results, winners, winner_text = self._compute_results()
         await self._persist_results(results, winners)
         await self._finalize_view(winner_text)
@@ -287,27 +615,16 @@ class PollView(discord.ui.View):
 
         choice_label = self.options[idx]
 
-        for opt in self.votes:
-            self.votes[opt].discard(interaction.user.id)
-        self.votes[choice_label].add(interaction.user.id)
+        self.votes.cast(interaction.user.id, idx)
+
+        await self.update_poll(interaction, f"<:VERIFIED:1418921885692989532> You voted for **{choice_label}**")
 
         if self.message:
             try:
-                await save_active_poll(
-                    message_id=self.message.id,
-                    guild_id=self.message.guild.id,
-                    channel_id=self.message.channel.id,
-                    author_id=self.author.id,  
-                    question=self.question,
-                    options=self.options,
-                    votes=self.votes,
-                    end_time=self.end_time
-                )
+                await record_vote(self.message.id, interaction.user.id, idx)
             except aiosqlite.Error as e:
                 print(f"[Poll DB Save Error on vote] {e}")
 
-        await self.update_poll(interaction, f"<:VERIFIED:1418921885692989532> You voted for **{choice_label}**")
-
     async def add_option(self, interaction: discord.Interaction):
         if not await self._ensure_poll_active(interaction):
             return
@@ -322,28 +639,15 @@ class PollView(discord.ui.View):
         if not await self._ensure_poll_active(interaction):
             return
 
-        removed = False
-        for opt in self.votes:
-            if interaction.user.id in self.votes[opt]:
-                self.votes[opt].remove(interaction.user.id)
-                removed = True
+        removed = self.votes.remove(interaction.user.id) is not None
 
         if removed:
+            await self.update_poll(interaction, "❌ Your vote was removed.")
             if self.message:
                 try:
-                    await save_active_poll(
-                        message_id=self.message.id,
-                        guild_id=self.message.guild.id,
-                        channel_id=self.message.channel.id,
-                        author_id=self.author.id,         
-                        question=self.question,
-                        options=self.options,
-                        votes=self.votes,
-                        end_time=self.end_time
-                    )
+                    await record_vote(self.message.id, interaction.user.id, None)
                 except aiosqlite.Error as e:
                     print(f"[Poll DB Save Error on remove] {e}")
-            await self.update_poll(interaction, "❌ Your vote was removed.")
         else:
             await interaction.response.send_message("⚠️ You haven't voted yet.", ephemeral=True)
 
@@ -351,39 +655,58 @@ class PollView(discord.ui.View):
         if interaction.user.id != self.author.id:
             return await interaction.response.send_message("⚠️ Only the poll creator can end this poll.", ephemeral=True)
 
-        if self.updater_task and not self.updater_task.done():
-            self.updater_task.cancel()
-
         await interaction.response.defer(ephemeral=True)
         await self.on_timeout()
 
     async def update_poll(self, interaction: discord.Interaction, ephemeral_msg: str):
-        embed = self.make_poll_embed()
+        try:
+            await interaction.response.send_message(ephemeral_msg, ephemeral=True)
+        except discord.errors.InteractionResponded:
+            try:
+                await interaction.followup.send(ephemeral_msg, ephemeral=True)
+            except Exception:
+                pass
+        except Exception:
+            pass
+
         if self.message:
+            self.renderer.request()
+        else:
             try:
-                await self.message.edit(embed=embed, view=self)
-            except discord.errors.HTTPException as e:
-                err_str = str(e).lower()
-                if "embed size" in err_str or "exceeds" in err_str:
-                    for bl in (8, 6, 4, 2):
-                        try:
-                            smaller = self.make_poll_embed(bar_len=bl)
-                            await self.message.edit(embed=smaller, view=self)
-                            embed = smaller
-                            break
-                        except Exception:
-                            continue
-                    else:
-                        try:
-                            fetched = await self.message.channel.fetch_message(self.message.id)
-                            self.message = fetched
-                            await self.message.edit(embed=embed, view=self)
-                        except Exception:
-                            try:
-                                new_msg = await self.message.channel.send(embed=embed, view=self)
-                                self.message = new_msg
-                            except Exception as ex:
-                                print(f"[update_poll] failed to update/send poll message: {ex}")
+                sent = await interaction.channel.send(embed=self.make_poll_embed(), view=self)
+                self.message = sent
+            except Exception:
+                pass
+
+    async def push_embed(self):
+        if not self.message:
+            return
+        embed = self.make_poll_embed()
+        if self.chart:
+            # The chart keeps the embed small, so there is no size-limit fallback to walk through.
+            chart = await self.chart_file()
+            try:
+                if chart:
+                    await self.message.edit(embed=embed, view=self, attachments=[chart])
+                else:
+                    await self.message.edit(embed=embed, view=self)
+            except Exception as e:
+                self._chart_key = None
+                print(f"[update_poll] failed to update chart poll message: {e}")
+            return
+        try:
+            await self.message.edit(embed=embed, view=self)
+        except discord.errors.HTTPException as e:
+            err_str = str(e).lower()
+            if "embed size" in err_str or "exceeds" in err_str:
+                for bl in (8, 6, 4, 2):
+                    try:
+                        smaller = self.make_poll_embed(bar_len=bl)
+                        await self.message.edit(embed=smaller, view=self)
+                        embed = smaller
+                        break
+                    except Exception:
+                        continue
                 else:
                     try:
                         fetched = await self.message.channel.fetch_message(self.message.id)
@@ -394,31 +717,27 @@ class PollView(discord.ui.View):
                             new_msg = await self.message.channel.send(embed=embed, view=self)
                             self.message = new_msg
                         except Exception as ex:
-                            print(f"[update_poll] failed to recover from HTTPException: {ex}")
-            except Exception as e:
+                            print(f"[update_poll] failed to update/send poll message: {ex}")
+            else:
                 try:
-                    new_msg = await self.message.channel.send(embed=embed, view=self)
-                    self.message = new_msg
-                except Exception as ex:
-                    print(f"[update_poll] unexpected failure editing/sending message: {ex}")
-        else:
-            try:
-                sent = await interaction.channel.send(embed=embed, view=self)
-                self.message = sent
-            except Exception:
-                pass
-        try:
-            await interaction.response.send_message(ephemeral_msg, ephemeral=True)
-        except discord.errors.InteractionResponded:
+                    fetched = await self.message.channel.fetch_message(self.message.id)
+                    self.message = fetched
+                    await self.message.edit(embed=embed, view=self)
+                except Exception:
+                    try:
+                        new_msg = await self.message.channel.send(embed=embed, view=self)
+                        self.message = new_msg
+                    except Exception as ex:
+                        print(f"[update_poll] failed to recover from HTTPException: {ex}")
+        except Exception as e:
             try:
-                await interaction.followup.send(ephemeral_msg, ephemeral=True)
-            except Exception:
-                pass
-        except Exception:
-            pass
+                new_msg = await self.message.channel.send(embed=embed, view=self)
+                self.message = new_msg
+            except Exception as ex:
+                print(f"[update_poll] unexpected failure editing/sending message: {ex}")
 
     def make_poll_embed(self, closed: bool = False, bar_len: int = 10):
-        total_votes = sum(len(v) for v in self.votes.values())
+        total_votes = self.votes.total
         colors = ["🟦", "🟥", "🟩", "🟨", "🟪", "🟧", "🟫"]
 
         embed = discord.Embed(
@@ -426,8 +745,21 @@ class PollView(discord.ui.View):
             color=discord.Color.blurple()
         )
 
-        for i, (opt, users) in enumerate(self.votes.items(), 1):
-            count = len(users)
+        # One field per option plus the status field. AddOptionModal's MAX_OPTIONS (14) keeps this
+        # well under EMBED_MAX_FIELDS today; if it is ever raised, the tail folds into one field.
+        shown = self.options
+        if len(shown) > EMBED_MAX_FIELDS - 1:
+            shown = self.options[:EMBED_MAX_FIELDS - 2]
+        hidden = range(len(shown), len(self.options))
+
+        if self.chart:
+            embed.set_image(url=f"attachment://{POLL_CHART_FILENAME}")
+            for i, opt in enumerate(shown):
+                count = self.votes.counts[i]
+                embed.add_field(name=opt, value=f"`{count} vote{'s' if count != 1 else ''}`", inline=True)
+
+        for i, opt in enumerate([] if self.chart else shown, 1):
+            count = self.votes.counts[i - 1]
             percent = (count / total_votes * 100) if total_votes > 0 else 0
             filled = int(percent / 100 * bar_len) if bar_len > 0 else 0
             empty = max(0, bar_len - filled)
@@ -441,6 +773,10 @@ class PollView(discord.ui.View):
                 inline=False
             )
 
+        if hidden:
+            rest = sum(self.votes.counts[i] for i in hidden)
+            embed.add_field(name=f"+{len(hidden)} more options", value=f"`{rest} vote{'s' if rest != 1 else ''}`", inline=False)
+
         if closed:
             if self.end_time:
                 status = (
@@ -513,7 +849,7 @@ class AddOptionModal(ui.Modal, title="Add Poll Options"):
 
         for opt in new_opts:
             self.poll_view.options.append(opt)
-            self.poll_view.votes[opt] = set()
+            self.poll_view.votes.add_option()
             select: discord.ui.Select = next(
                 (i for i in self.poll_view.children if isinstance(i, discord.ui.Select)), None
             )
@@ -522,8 +858,7 @@ class AddOptionModal(ui.Modal, title="Add Poll Options"):
                                 for idx, opt in enumerate(self.poll_view.options)]
                 select.placeholder = "Select one answer (scroll for more)" if len(self.poll_view.options) > 10 else "Select one answer"
 
-        embed = self.poll_view.make_poll_embed()
-        await self.poll_view.message.edit(embed=embed, view=self.poll_view)
+        await self.poll_view.push_embed()
 
         try:
             await save_active_poll(
@@ -533,8 +868,8 @@ class AddOptionModal(ui.Modal, title="Add Poll Options"):
                 author_id=self.poll_view.author.id,          # <-- required now
                 question=self.poll_view.question,
                 options=self.poll_view.options,
-                votes=self.poll_view.votes,
-                end_time=self.poll_view.end_time
+                end_time=self.poll_view.end_time,
+                chart=self.poll_view.chart
             )
         except aiosqlite.Error as e:
             print(f"[Poll DB Save Error on add_option] {e}")
@@ -551,10 +886,11 @@ class PollInputModal(ui.Modal, title="Create Poll"):
     opt3 = ui.TextInput(label="Option 3 (optional)", placeholder="Third option (optional)", required=False, max_length=100)
     opt4 = ui.TextInput(label="Option 4 (optional)", placeholder="Fourth option (optional)", required=False, max_length=100)
 
-    def __init__(self, ctx: commands.Context, timeout_seconds: Optional[int] = None):
+    def __init__(self, ctx: commands.Context, timeout_seconds: Optional[int] = None, chart: bool = False):
         super().__init__()
         self.ctx = ctx
         self.timeout_seconds = timeout_seconds
+        self.chart = chart
         
     async def on_submit(self, interaction: discord.Interaction):
         raw_opts = [
@@ -578,9 +914,13 @@ class PollInputModal(ui.Modal, title="Create Poll"):
                 ephemeral=True
             )
         try:
-            view = PollView(self.question.value, opts, self.ctx.author, timeout=self.timeout_seconds)
+            view = PollView(self.question.value, opts, self.ctx.author, timeout=self.timeout_seconds, chart=self.chart)
             embed = view.make_poll_embed()
-            msg = await interaction.channel.send(embed=embed, view=view)
+            chart = await view.chart_file() if self.chart else None
+            if chart:
+                msg = await interaction.channel.send(embed=embed, view=view, file=chart)
+            else:
+                msg = await interaction.channel.send(embed=embed, view=view)
             view.message = msg
             end_time = (datetime.now(timezone.utc) + timedelta(seconds=self.timeout_seconds)) if self.timeout_seconds else None
             await save_active_poll(
@@ -590,8 +930,8 @@ class PollInputModal(ui.Modal, title="Create Poll"):
                 author_id=interaction.user.id,             
                 question=self.question.value,
                 options=opts,
-                votes=view.votes,
-                end_time=end_time
+                end_time=end_time,
+                chart=self.chart
             )
 
             try:
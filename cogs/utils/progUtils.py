@@ -1,6 +1,11 @@
 from PIL import Image, ImageDraw, ImageFont
-from cogs.utils.constants import BG_PATH, FONTS, ROOT_PATH, TITLE_EMOJI_FILES
-import traceback
+from cogs.utils.constants import BG_PATH, FONTS, ROOT_PATH
+from cogs.utils.titles import TITLE_COLORS, get_title, get_title_emoji, get_badge, has_badge, preload_badges
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+import contextvars
+import logging
+import time
 import discord
 import os
 import io
@@ -46,6 +51,28 @@ class ProfileCardLayout:
 
     PROGRESS_BAR_HEIGHT = 24
 
+    OUTPUT_SIZE = (360, 155)
+
+
+class AnimatedProfileBudget:
+    MAX_FRAMES = 24
+    MAX_BYTES = 2 * 1024 * 1024
+    TIME_BUDGET_SECONDS = 2.5
+
+
+class PollChartLayout:
+    WIDTH = 640
+    PADDING = 22
+    TITLE_HEIGHT = 46
+    ROW_HEIGHT = 54
+    LABEL_SIZE = 20
+    TITLE_SIZE = 24
+    BAR_HEIGHT = 16
+    BAR_RADIUS = 8
+    PERCENT_WIDTH = 64
+    BUCKET_PCT = 2
+    CACHE_MAX = 64
+
 
 class LeaderboardLayout:
     RANK_OFFSET_DEFAULT = -8   
@@ -88,25 +115,69 @@ _AVATAR_CACHE = {}
 _PANEL_GRAD_CACHE = {}
 _ICON_CACHE = {}
 _FONT_CACHE = {}
+_STATIC_CARD_CACHE = OrderedDict()
+_STATIC_CARD_CACHE_MAX = 32
+_POLL_CHART_CACHE = OrderedDict()
+
+RENDER_PROFILE_ENABLED = os.getenv("MINORI_RENDER_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+_render_logger = logging.getLogger("Minori.render")
+_ACTIVE_PROFILE = contextvars.ContextVar("minori_render_profile", default=None)
+
+
+class RenderProfile:
+    """Collects per-stage wall time and cache hit/miss counts for one render."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.stages_ms = {}
+        self.cache_hits = {}
+        self.cache_misses = {}
+        self._started = time.perf_counter()
 
-TITLE_COLORS = {
-    "Novice": discord.Color.light_gray(),
-    "Warrior": discord.Color.red(),
-    "Elite": discord.Color.orange(),
-    "Champion": discord.Color.gold(),
-    "Hero": discord.Color.green(),
-    "Legend": discord.Color.blue(),
-    "Mythic": discord.Color.purple(),
-    "Ascendant": discord.Color.teal(),
-    "Immortal": discord.Color.dark_red(),
-    "Celestial": discord.Color.dark_blue(),
-    "Transcendent": discord.Color.dark_purple(),
-    "Aetherborn": discord.Color.dark_teal(),
-    "Cosmic": discord.Color.dark_magenta(),
-    "Divine": discord.Color.green(),
-    "Eternal": discord.Color.red(),
-    "Enlightened": discord.Color.blue(),
-}
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages_ms[name] = self.stages_ms.get(name, 0.0) + elapsed
+
+    def count_cache(self, cache_name: str, hit: bool):
+        bucket = self.cache_hits if hit else self.cache_misses
+        bucket[cache_name] = bucket.get(cache_name, 0) + 1
+
+    def emit(self, ok: bool, **fields):
+        total_ms = (time.perf_counter() - self._started) * 1000
+        slowest = max(self.stages_ms, key=self.stages_ms.get) if self.stages_ms else None
+        _render_logger.info(
+            "%s render %s in %.1fms (slowest stage: %s)",
+            self.kind, "ok" if ok else "failed", total_ms, slowest,
+            extra={
+                "render_kind": self.kind,
+                "render_ok": ok,
+                "render_total_ms": round(total_ms, 2),
+                "render_stages_ms": {k: round(v, 2) for k, v in self.stages_ms.items()},
+                "render_slowest_stage": slowest,
+                "render_cache_hits": dict(self.cache_hits),
+                "render_cache_misses": dict(self.cache_misses),
+                **fields,
+            },
+        )
+
+
+def _start_profile(kind: str, enabled):
+    if enabled is None:
+        enabled = RENDER_PROFILE_ENABLED
+    return RenderProfile(kind) if enabled else None
+
+def _stage(profile, name: str):
+    return profile.stage(name) if profile else nullcontext()
+
+def _count_cache(cache_name: str, hit: bool):
+    profile = _ACTIVE_PROFILE.get()
+    if profile is not None:
+        profile.count_cache(cache_name, hit)
 
 
 def is_cjk_char(ch: str) -> bool: 
@@ -150,43 +221,6 @@ def split_into_runs(text: str):
     runs.append((current_run, current_is_cjk))
     return runs
 
-def get_title(level: int):
-    if level < 5: return "Novice"
-    elif level < 10: return "Warrior"
-    elif level < 15: return "Elite"
-    elif level < 20: return "Champion"
-    elif level < 25: return "Hero"
-    elif level < 30: return "Legend"
-    elif level < 35: return "Mythic"
-    elif level < 40: return "Ascendant"
-    elif level < 50: return "Immortal"
-    elif level < 60: return "Celestial"
-    elif level < 70: return "Transcendent"
-    elif level < 80: return "Aetherborn"
-    elif level < 90: return "Cosmic"
-    elif level < 100: return "Divine"
-    elif level < 125: return "Eternal"
-    else: return "Enlightened"
-
-def get_title_emoji(level: int):
-    if level < 5: return "<:NOVICE:1414508405002862663>"
-    elif level < 10: return "<:WARRIOR:1414508311650242661>"
-    elif level < 15: return "<:ELITE:1414508395301699724>"
-    elif level < 20: return "<:CHAMPION:1414508304448749568>"
-    elif level < 25: return "<:HERO:1414508388812853258>"
-    elif level < 30: return "<:LEGEND:1414508296269856768>"
-    elif level < 35: return "<:MYTHIC:1414508380172587099>"
-    elif level < 40: return "<:ASCENDANT:1414508291341684776>"
-    elif level < 50: return "<:IMMORTAL:1414508281543524454>"
-    elif level < 60: return "<:CELESTIAL:1414508342520320070>"
-    elif level < 70: return "<:TRANSCENDENT:1414508273767288832>"
-    elif level < 80: return "<:AETHERBORN:1414508333951483904>"
-    elif level < 90: return "<:COSMIC:1414508264695005184>"
-    elif level < 100: return "<:DIVINE:1414508323763388446>"
-    elif level < 125: return "<:ETERNAL:1414508351676481536>"
-    else: return "<:ENLIGHTENED:1414508255744360510>"
-
-
 DB_PATH = os.path.join(ROOT_PATH, "data", "minori.db")
 
 async def get_user_rank(user_id: int, guild_id: int, max_level: int):
@@ -366,17 +400,24 @@ def _profile_compute_layout():
         "name_y": name_y,
     }
 
-def _profile_draw_avatar(img, avatar_bytes, left_margin, top_margin):
-    avatar = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA").resize((ProfileCardLayout.AVATAR_SIZE, ProfileCardLayout.AVATAR_SIZE))
-    mask = Image.new("L", avatar.size, 0)
-    ImageDraw.Draw(mask).ellipse([0, 0, avatar.size[0], avatar.size[1]], fill=255)
-    avatar_circle = Image.new("RGBA", avatar.size, (0, 0, 0, 0))
-    avatar_circle.paste(avatar, (0, 0), mask)
-    glow_size = (avatar.size[0] + ProfileCardLayout.AVATAR_GLOW_EXTRA, avatar.size[1] + ProfileCardLayout.AVATAR_GLOW_EXTRA)
+def _profile_draw_avatar(img, avatar_bytes, left_margin, top_margin, glow_only=False):
+    size = ProfileCardLayout.AVATAR_SIZE
+    glow_size = (size + ProfileCardLayout.AVATAR_GLOW_EXTRA, size + ProfileCardLayout.AVATAR_GLOW_EXTRA)
     glow = Image.new("RGBA", glow_size, (0, 0, 0, 0))
     ImageDraw.Draw(glow).ellipse([0, 0, glow_size[0], glow_size[1]], fill=(255, 255, 255, 80))
     avatar_offset = ProfileCardLayout.AVATAR_OFFSET_X
     img.paste(glow, (left_margin + avatar_offset, top_margin + 5), glow)
+    if glow_only:
+        return
+    if not avatar_bytes:
+        x, y = left_margin + 6 + avatar_offset, top_margin + 11
+        ImageDraw.Draw(img).ellipse([x, y, x + size, y + size], fill=(100, 100, 100))
+        return
+    avatar = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA").resize((size, size))
+    mask = Image.new("L", avatar.size, 0)
+    ImageDraw.Draw(mask).ellipse([0, 0, avatar.size[0], avatar.size[1]], fill=255)
+    avatar_circle = Image.new("RGBA", avatar.size, (0, 0, 0, 0))
+    avatar_circle.paste(avatar, (0, 0), mask)
     img.paste(avatar_circle, (left_margin + 6 + avatar_offset, top_margin + 11), avatar_circle)
 
 def _profile_clean_name(display_name):
@@ -410,11 +451,10 @@ def _profile_draw_labels_values(draw, img, x, y, title_name, level, exp, next_ex
         _draw_cjk_profile(draw, (colon_x, y), ":", font_medium, cjk_font_medium, font_color)
         value_x = colon_x + 12
         _draw_cjk_profile(draw, (value_x, y), value, font_medium, cjk_font_medium, font_color)
-        if label.strip() == "Title":
-            emoji_path = title_emoji_files.get(title_name)
-            if emoji_path and os.path.exists(emoji_path):
+        if label.strip() == "Title" and title_name in title_emoji_files:
+            badge = get_badge(title_name, (ProfileCardLayout.TITLE_BADGE_W, ProfileCardLayout.TITLE_BADGE_H))
+            if badge is not None:
                 try:
-                    badge = Image.open(emoji_path).convert("RGBA").resize((ProfileCardLayout.TITLE_BADGE_W, ProfileCardLayout.TITLE_BADGE_H))
                     bx = int(value_x + draw.textlength(value, font=font_medium) + 10)
                     bbox = font_medium.getbbox(value)
                     text_height = bbox[3] - bbox[1]
@@ -475,6 +515,32 @@ def _profile_draw_progress_bar(draw, img, x, y, width, left_margin, exp, next_ex
                     width=1
                 )
 
+def _profile_compose(prof, avatar_bytes, display_name, title_name, level, exp, next_exp, fonts, title_emoji_files,
+                     bg_file, theme_name, font_color, user_rank, glow_only=False):
+    with _stage(prof, "_profile_prepare_fonts"):
+        fonts_pack = _profile_prepare_fonts(fonts)
+    width, height = ProfileCardLayout.WIDTH, ProfileCardLayout.HEIGHT
+    corner_radius = ProfileCardLayout.CORNER_RADIUS
+    with _stage(prof, "_profile_setup_canvas"):
+        img, draw = _profile_setup_canvas(theme_name, bg_file, width, height, corner_radius)
+    with _stage(prof, "_profile_resolve_font_color"):
+        font_color_resolved = _profile_resolve_font_color(font_color, theme_name, bg_file)
+    layout = _profile_compute_layout()
+    with _stage(prof, "_profile_draw_avatar"):
+        _profile_draw_avatar(img, avatar_bytes, layout["left_margin"], layout["top_margin"], glow_only=glow_only)
+    x, y = layout["name_x"], layout["name_y"]
+    display_name_only = _profile_clean_name(display_name)
+    with _stage(prof, "_profile_draw_name_and_rank"):
+        y = _profile_draw_name_and_rank(draw, x, y, display_name_only, fonts_pack["font_username"], fonts_pack["cjk_font_username"], font_color_resolved, user_rank)
+    with _stage(prof, "_profile_draw_labels_values"):
+        y = _profile_draw_labels_values(draw, img, x, y, title_name, level, exp, next_exp, fonts_pack["font_medium"], fonts_pack["cjk_font_medium"], font_color_resolved, title_emoji_files)
+    with _stage(prof, "_profile_draw_next_line"):
+        y = _profile_draw_next_line(draw, x, y, exp, next_exp, fonts_pack["font_small"], fonts_pack["cjk_font_small"])
+    with _stage(prof, "_profile_draw_progress_bar"):
+        _profile_draw_progress_bar(draw, img, x, y, width, layout["left_margin"], exp, next_exp)
+    with _stage(prof, "resize"):
+        return img.resize(ProfileCardLayout.OUTPUT_SIZE, Image.Resampling.LANCZOS)
+
 def render_profile_image(
     avatar_bytes: bytes,
     display_name: str,
@@ -487,35 +553,189 @@ def render_profile_image(
     bg_file: str = None,
     theme_name: str = "default",
     font_color: tuple = None,
-    user_rank: int = None
+    user_rank: int = None,
+    profile: bool = None
 ) -> bytes:
+    prof = _start_profile("profile", profile)
+    token = _ACTIVE_PROFILE.set(prof)
+    ok = False
     try:
-        fonts_pack = _profile_prepare_fonts(fonts)
-        width, height = ProfileCardLayout.WIDTH, ProfileCardLayout.HEIGHT
-        corner_radius = ProfileCardLayout.CORNER_RADIUS
-        img, draw = _profile_setup_canvas(theme_name, bg_file, width, height, corner_radius)
-        font_color_resolved = _profile_resolve_font_color(font_color, theme_name, bg_file)
-        layout = _profile_compute_layout()
-        _profile_draw_avatar(img, avatar_bytes, layout["left_margin"], layout["top_margin"])
-        x, y = layout["name_x"], layout["name_y"]
-        display_name_only = _profile_clean_name(display_name)
-        y = _profile_draw_name_and_rank(draw, x, y, display_name_only, fonts_pack["font_username"], fonts_pack["cjk_font_username"], font_color_resolved, user_rank)
-        y = _profile_draw_labels_values(draw, img, x, y, title_name, level, exp, next_exp, fonts_pack["font_medium"], fonts_pack["cjk_font_medium"], font_color_resolved, title_emoji_files)
-        y = _profile_draw_next_line(draw, x, y, exp, next_exp, fonts_pack["font_small"], fonts_pack["cjk_font_small"])
-        _profile_draw_progress_bar(draw, img, x, y, width, layout["left_margin"], exp, next_exp)
-        final_img = img.resize((360,155), Image.Resampling.LANCZOS)
-        out = io.BytesIO()
-        final_img.save(out, format="PNG")
-        return out.getvalue()
+        final_img = _profile_compose(
+            prof, avatar_bytes, display_name, title_name, level, exp, next_exp, fonts, title_emoji_files,
+            bg_file, theme_name, font_color, user_rank
+        )
+        with _stage(prof, "encode"):
+            out = io.BytesIO()
+            final_img.save(out, format="PNG")
+            data = out.getvalue()
+        ok = True
+        return data
     except Exception:
-        traceback.print_exc()
+        _render_logger.exception("Profile render failed", extra={"render_kind": "profile", "theme_name": theme_name})
         return None
+    finally:
+        _ACTIVE_PROFILE.reset(token)
+        if prof:
+            prof.emit(ok, theme_name=theme_name)
+
+def _get_static_profile_card(prof, display_name, title_name, level, exp, next_exp, fonts, title_emoji_files,
+                             bg_file, theme_name, font_color, user_rank):
+    key = (display_name, title_name, level, exp, next_exp, bg_file, theme_name, font_color, user_rank)
+    card = _STATIC_CARD_CACHE.get(key)
+    _count_cache("static_card", card is not None)
+    if card is not None:
+        _STATIC_CARD_CACHE.move_to_end(key)
+        return card
+    card = _profile_compose(
+        prof, None, display_name, title_name, level, exp, next_exp, fonts, title_emoji_files,
+        bg_file, theme_name, font_color, user_rank, glow_only=True
+    )
+    _STATIC_CARD_CACHE[key] = card
+    while len(_STATIC_CARD_CACHE) > _STATIC_CARD_CACHE_MAX:
+        _STATIC_CARD_CACHE.popitem(last=False)
+    return card
+
+def _animated_avatar_geometry():
+    sx = ProfileCardLayout.OUTPUT_SIZE[0] / ProfileCardLayout.WIDTH
+    sy = ProfileCardLayout.OUTPUT_SIZE[1] / ProfileCardLayout.HEIGHT
+    left = ProfileCardLayout.LEFT_MARGIN + 6 + ProfileCardLayout.AVATAR_OFFSET_X
+    top = ProfileCardLayout.TOP_MARGIN + 11
+    size = int(round(ProfileCardLayout.AVATAR_SIZE * min(sx, sy)))
+    return (int(round(left * sx)), int(round(top * sy))), size
+
+def _circle_mask(size, supersample=4):
+    big = Image.new("L", (size * supersample, size * supersample), 0)
+    ImageDraw.Draw(big).ellipse([0, 0, big.size[0], big.size[1]], fill=255)
+    return big.resize((size, size), Image.Resampling.LANCZOS)
+
+def _select_frames(n_frames, durations, max_frames):
+    if n_frames <= max_frames:
+        return list(range(n_frames)), list(durations)
+    picks = [int(i * n_frames / max_frames) for i in range(max_frames)]
+    bounds = picks[1:] + [n_frames]
+    merged = [sum(durations[start:end]) for start, end in zip(picks, bounds)]
+    return picks, merged
+
+def _quantize_shared(frames, transparent_mask):
+    reference = frames[0].convert("RGB").quantize(colors=255, method=Image.Quantize.MEDIANCUT)
+    palette = (reference.getpalette() or [])[:255 * 3]
+    palette += palette[-3:] * (256 - len(palette) // 3)
+    reference.putpalette(palette)
+    # Index 255 duplicates the last real colour so it can be reserved for transparency.
+    remap = list(range(255)) + [254]
+    out = []
+    for frame in frames:
+        p = frame.convert("RGB").quantize(palette=reference, dither=Image.Dither.NONE).point(remap)
+        p.paste(255, mask=transparent_mask)
+        out.append(p)
+    return out
+
+def render_animated_profile_image(
+    avatar_bytes: bytes,
+    display_name: str,
+    title_name: str,
+    level: int,
+    exp: int,
+    next_exp: int,
+    fonts: dict,
+    title_emoji_files: dict,
+    bg_file: str = None,
+    theme_name: str = "default",
+    font_color: tuple = None,
+    user_rank: int = None,
+    max_frames: int = AnimatedProfileBudget.MAX_FRAMES,
+    max_bytes: int = AnimatedProfileBudget.MAX_BYTES,
+    time_budget: float = AnimatedProfileBudget.TIME_BUDGET_SECONDS,
+    profile: bool = None
+) -> bytes:
+    """Returns GIF bytes, or None when the avatar is static or a budget is exceeded."""
+    prof = _start_profile("animated_profile", profile)
+    token = _ACTIVE_PROFILE.set(prof)
+    deadline = time.perf_counter() + time_budget
+    ok = False
+    reason = None
+    n_frames = used_frames = size = 0
+    try:
+        if not avatar_bytes:
+            reason = "no_avatar"
+            return None
+        with _stage(prof, "decode"):
+            avatar = Image.open(io.BytesIO(avatar_bytes))
+            n_frames = getattr(avatar, "n_frames", 1)
+        if not getattr(avatar, "is_animated", False) or n_frames < 2:
+            reason = "static_avatar"
+            return None
+
+        with _stage(prof, "static_card"):
+            base = _get_static_profile_card(
+                prof, display_name, title_name, level, exp, next_exp, fonts, title_emoji_files,
+                bg_file, theme_name, font_color, user_rank
+            )
+        pos, av_size = _animated_avatar_geometry()
+        mask = _circle_mask(av_size)
+        transparent_mask = base.getchannel("A").point(lambda a: 255 if a < 128 else 0)
+
+        durations = []
+        for i in range(n_frames):
+            avatar.seek(i)
+            durations.append(max(20, int(avatar.info.get("duration", 100) or 100)))
+        frame_limit = max(2, int(max_frames))
+
+        while True:
+            indices, frame_durations = _select_frames(n_frames, durations, frame_limit)
+            frames = []
+            with _stage(prof, "composite"):
+                for idx in indices:
+                    if time.perf_counter() > deadline:
+                        reason = "time_budget"
+                        return None
+                    avatar.seek(idx)
+                    frame = avatar.convert("RGBA").resize((av_size, av_size), Image.Resampling.LANCZOS)
+                    canvas = base.copy()
+                    canvas.paste(frame, pos, mask)
+                    frames.append(canvas)
+            with _stage(prof, "quantize"):
+                paletted = _quantize_shared(frames, transparent_mask)
+            if time.perf_counter() > deadline:
+                reason = "time_budget"
+                return None
+            with _stage(prof, "encode"):
+                out = io.BytesIO()
+                paletted[0].save(
+                    out,
+                    format="GIF",
+                    save_all=True,
+                    append_images=paletted[1:],
+                    duration=frame_durations,
+                    loop=0,
+                    transparency=255,
+                    disposal=1,
+                )
+                data = out.getvalue()
+            used_frames, size = len(frames), len(data)
+            if size <= max_bytes:
+                ok = True
+                return data
+            if frame_limit <= 2 or time.perf_counter() > deadline:
+                reason = "byte_budget"
+                return None
+            frame_limit = max(2, frame_limit // 2)
+    except Exception:
+        reason = "error"
+        _render_logger.exception("Animated profile render failed", extra={"render_kind": "animated_profile", "theme_name": theme_name})
+        return None
+    finally:
+        _ACTIVE_PROFILE.reset(token)
+        if prof:
+            prof.emit(ok, theme_name=theme_name, fallback_reason=reason, source_frames=n_frames, frames=used_frames, bytes=size)
 
 def _safe_load_font(path, size):
     key = (path, int(size))
     f = _FONT_CACHE.get(key)
     if f:
+        _count_cache("font", True)
         return f
+    _count_cache("font", False)
     try:
         f = ImageFont.truetype(path, int(size))
     except Exception:
@@ -622,6 +842,7 @@ def _load_avatar_cached(avatar_bytes, size):
     if not key:
         return None
     img = _AVATAR_CACHE.get(key)
+    _count_cache("avatar", img is not None)
     if img is None:
         try:
             avatar = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
@@ -635,6 +856,7 @@ def _load_avatar_cached(avatar_bytes, size):
 def load_icon_cached(path, size):
     key = (path, int(size))
     img = _ICON_CACHE.get(key)
+    _count_cache("icon", key in _ICON_CACHE)
     if img is None and path and os.path.exists(path):
         try:
             img = Image.open(path).convert("RGBA").resize((int(size), int(size)), Image.Resampling.LANCZOS)
@@ -646,6 +868,7 @@ def load_icon_cached(path, size):
 def get_panel_gradient(colors, size, direction):
     key = (tuple(tuple(c) for c in colors), size, direction)
     img = _PANEL_GRAD_CACHE.get(key)
+    _count_cache("panel_gradient", img is not None)
     if img is None:
         img = _make_linear_gradient(size, colors, direction=direction)
         _PANEL_GRAD_CACHE[key] = img
@@ -984,12 +1207,11 @@ def _draw_leaderboard_row(im, draw, r, i, layout, res, rank_offset):
     _draw_lb_cjk(draw, (lvl_x, lvl_y), level_text, lvl_font, cjk_font_medium, (255,255,255))
 
     title_name = (r.get("title") or "").strip()
-    badge_path = TITLE_EMOJI_FILES.get(title_name) if isinstance(TITLE_EMOJI_FILES, dict) else None
-    if badge_path and os.path.exists(badge_path):
+    if has_badge(title_name):
         try:
             bx = lvl_x + fixed_level_w + badge_shift
             by = int(center_y - layout["badge_size"]/2)
-            badge_img = load_icon_cached(badge_path, layout["badge_size"])
+            badge_img = get_badge(title_name, (layout["badge_size"], layout["badge_size"]))
             if badge_img:
                 im.paste(badge_img, (int(bx), int(by)), badge_img)
         except Exception:
@@ -1030,8 +1252,13 @@ def create_leaderboard_image(
     gradient_noise=True,
     gradient_seed=None,
     debug_save_path: str = None,
-    rank_offset: int = LeaderboardLayout.RANK_OFFSET_DEFAULT
+    rank_offset: int = LeaderboardLayout.RANK_OFFSET_DEFAULT,
+    profile: bool = None
 ) -> bytes:
+    prof = _start_profile("leaderboard", profile)
+    token = _ACTIVE_PROFILE.set(prof)
+    ok = False
+    n = 0
     try:
         fonts = fonts or FONTS
         rows = list(rows or [])
@@ -1042,50 +1269,139 @@ def create_leaderboard_image(
         gap_between_rows = max(8, int(row_height * 0.2))
         height = padding*2 + header_height + n * (row_height + gap_between_rows)
 
-        im, draw = _setup_leaderboard_canvas(
-            width=width,
-            height=height,
-            gradient=gradient,
-            gradient_direction=gradient_direction,
-            gradient_colors=gradient_colors,
-            gradient_noise=gradient_noise,
-            gradient_seed=gradient_seed,
-            background_color=background_color
-        )
+        with _stage(prof, "_setup_leaderboard_canvas"):
+            im, draw = _setup_leaderboard_canvas(
+                width=width,
+                height=height,
+                gradient=gradient,
+                gradient_direction=gradient_direction,
+                gradient_colors=gradient_colors,
+                gradient_noise=gradient_noise,
+                gradient_seed=gradient_seed,
+                background_color=background_color
+            )
 
-        res = _prepare_leaderboard_resources(draw, row_height, fonts, exp_icon_path)
-
-        layout = _compute_leaderboard_layout(
-            rows=rows,
-            width=width,
-            row_height=row_height,
-            padding=padding,
-            header_height=header_height,
-            panel_color=panel_color,
-            gradient_direction=gradient_direction,
-            draw=draw,
-            res=res
-        )
+        with _stage(prof, "_prepare_leaderboard_resources"):
+            res = _prepare_leaderboard_resources(draw, row_height, fonts, exp_icon_path)
+
+        with _stage(prof, "_compute_leaderboard_layout"):
+            layout = _compute_leaderboard_layout(
+                rows=rows,
+                width=width,
+                row_height=row_height,
+                padding=padding,
+                header_height=header_height,
+                panel_color=panel_color,
+                gradient_direction=gradient_direction,
+                draw=draw,
+                res=res
+            )
 
         for i, r in enumerate(rows):
-            _draw_leaderboard_row(im, draw, r, i, layout, res, rank_offset)
+            with _stage(prof, "_draw_leaderboard_row"):
+                _draw_leaderboard_row(im, draw, r, i, layout, res, rank_offset)
 
-        out = io.BytesIO()
-        im.save(out, format="PNG")
-        out.seek(0)
+        with _stage(prof, "encode"):
+            out = io.BytesIO()
+            im.save(out, format="PNG")
+            out.seek(0)
         if debug_save_path:
             try:
                 with open(debug_save_path, "wb") as fh:
                     fh.write(out.getvalue())
             except Exception:
                 pass
+        ok = True
         return out.getvalue()
 
     except Exception:
-        traceback.print_exc()
+        _render_logger.exception("Leaderboard render failed", extra={"render_kind": "leaderboard", "rows": n})
         fallback = Image.new("RGBA", (4,4), (255,0,0,255))
         b = io.BytesIO()
         fallback.save(b, format="PNG")
         b.seek(0)
         return b.getvalue()
-
+    finally:
+        _ACTIVE_PROFILE.reset(token)
+        if prof:
+            prof.emit(ok, rows=n, gradient=bool(gradient), gradient_noise=bool(gradient_noise))
+
+
+POLL_CHART_COLORS = [
+    ((88, 101, 242), (138, 150, 255)),
+    ((237, 66, 69), (255, 128, 120)),
+    ((59, 165, 93), (120, 220, 140)),
+    ((250, 168, 26), (255, 210, 110)),
+    ((155, 89, 182), (205, 150, 230)),
+    ((230, 126, 34), (255, 180, 110)),
+    ((26, 188, 156), (110, 235, 205)),
+]
+
+def poll_chart_key(question, options, counts, closed=False):
+    # Percentages are bucketed so a trickle of votes reuses the last chart until a bar visibly moves.
+    total = sum(counts)
+    buckets = tuple(int(c * 100 / total) // PollChartLayout.BUCKET_PCT if total else 0 for c in counts)
+    return (question, tuple(options), buckets, bool(closed))
+
+def render_poll_chart(question, options, counts, closed=False, fonts=None) -> bytes:
+    key = poll_chart_key(question, options, counts, closed)
+    data = _POLL_CHART_CACHE.get(key)
+    _count_cache("poll_chart", data is not None)
+    if data is not None:
+        _POLL_CHART_CACHE.move_to_end(key)
+        return data
+
+    fonts = fonts or FONTS
+    L = PollChartLayout
+    width = L.WIDTH
+    height = L.PADDING * 2 + L.TITLE_HEIGHT + L.ROW_HEIGHT * max(1, len(options))
+    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.rounded_rectangle([0, 0, width - 1, height - 1], radius=18, fill=(43, 45, 49, 255))
+
+    title_font = _safe_load_font(fonts.get("bold"), L.TITLE_SIZE)
+    label_font = _safe_load_font(fonts.get("medium"), L.LABEL_SIZE)
+    pct_font = _safe_load_font(fonts.get("semibold"), L.LABEL_SIZE)
+    inner_w = width - L.PADDING * 2
+    bar_w = inner_w - L.PERCENT_WIDTH
+
+    title = truncate_to_width(strip_emojis(question) or "Poll", title_font, inner_w, draw)
+    draw.text((L.PADDING, L.PADDING), title, font=title_font, fill=(255, 255, 255, 255))
+
+    total = sum(counts)
+    top = max(counts) if counts else 0
+    y = L.PADDING + L.TITLE_HEIGHT
+    for i, (opt, count) in enumerate(zip(options, counts)):
+        pct = (count / total * 100) if total else 0
+        colors = POLL_CHART_COLORS[i % len(POLL_CHART_COLORS)]
+        label = truncate_to_width(strip_emojis(opt) or opt, label_font, inner_w, draw)
+        label_fill = (255, 255, 255, 255) if closed and top and count == top else (220, 221, 222, 255)
+        draw.text((L.PADDING, y), label, font=label_font, fill=label_fill)
+
+        bar_y = y + L.ROW_HEIGHT - L.BAR_HEIGHT - 10
+        draw.rounded_rectangle(
+            [L.PADDING, bar_y, L.PADDING + bar_w, bar_y + L.BAR_HEIGHT],
+            radius=L.BAR_RADIUS, fill=(64, 66, 72, 255)
+        )
+        fill_w = int(bar_w * pct / 100)
+        if fill_w > 0:
+            grad = get_panel_gradient(colors, (bar_w, L.BAR_HEIGHT), "horizontal").crop((0, 0, fill_w, L.BAR_HEIGHT))
+            mask = Image.new("L", (fill_w, L.BAR_HEIGHT), 0)
+            ImageDraw.Draw(mask).rounded_rectangle([0, 0, fill_w - 1, L.BAR_HEIGHT - 1], radius=L.BAR_RADIUS, fill=255)
+            img.paste(grad, (L.PADDING, bar_y), mask)
+
+        pct_text = f"{pct:.0f}%"
+        pct_x = width - L.PADDING - draw.textlength(pct_text, font=pct_font)
+        draw.text((pct_x, bar_y - 4), pct_text, font=pct_font, fill=(255, 255, 255, 255))
+        y += L.ROW_HEIGHT
+
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    data = out.getvalue()
+    _POLL_CHART_CACHE[key] = data
+    while len(_POLL_CHART_CACHE) > L.CACHE_MAX:
+        _POLL_CHART_CACHE.popitem(last=False)
+    return data
+
+
+preload_badges((ProfileCardLayout.TITLE_BADGE_W, ProfileCardLayout.TITLE_BADGE_H))
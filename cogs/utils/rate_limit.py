@@ -0,0 +1,203 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional
+import aiohttp
+
+# User-facing calls sleep through short blocks (a Retry-After: 1, a drained bucket) instead of failing.
+DEFAULT_MAX_WAIT = 1.5
+
+
+class RateLimitedError(RuntimeError):
+    """Raised when a provider has no request budget or its circuit is open."""
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, per_second: float):
+        self.capacity = capacity
+        self.per_second = per_second
+        self.tokens = capacity
+        self.blocked_until = 0.0
+        self._last = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.per_second)
+        self._last = now
+
+    def wait_time(self) -> float:
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.per_second
+
+    def try_acquire(self) -> bool:
+        if self.wait_time() > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+    def block_for(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + max(0.0, seconds))
+
+    def update_from_headers(self, headers, status: int):
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None and (status == 429 or status == 503):
+            self.block_for(retry_after)
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            try:
+                self.tokens = min(self.tokens, float(remaining))
+            except ValueError:
+                pass
+            if self.tokens < 1:
+                # Without a usable Reset header, Retry-After is the best hint; a minute only when neither is sent.
+                fallback = retry_after if retry_after is not None else 60.0
+                reset = headers.get("X-RateLimit-Reset")
+                try:
+                    self.block_for(float(reset) - time.time() if reset else fallback)
+                except ValueError:
+                    self.block_for(fallback)
+        if status == 429 and retry_after is None:
+            self.block_for(60.0)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 4, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self):
+        # The trial ended without a verdict (e.g. cancelled); let the next caller probe instead.
+        if self._state == self.HALF_OPEN:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class ProviderGuard:
+    def __init__(self, name: str, capacity: float, per_minute: float, failure_threshold: int = 4, reset_timeout: float = 30.0):
+        self.name = name
+        self.bucket = TokenBucket(capacity, per_minute / 60.0)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency: Optional[float] = None
+        self.samples = 0
+
+    def record_latency(self, seconds: float, alpha: float = 0.3):
+        self.latency = seconds if self.latency is None else (1 - alpha) * self.latency + alpha * seconds
+        self.samples += 1
+
+    def available(self) -> bool:
+        return self.breaker.state != CircuitBreaker.OPEN and self.bucket.wait_time() == 0
+
+    async def acquire(self, max_wait: float = 0.0) -> bool:
+        """Takes a token, waiting up to max_wait; returns True when this call is the half-open trial."""
+        deadline = time.monotonic() + max_wait
+        wait = self.bucket.wait_time()
+        while 0 < wait <= deadline - time.monotonic():
+            await asyncio.sleep(wait)
+            wait = self.bucket.wait_time()
+        if wait > 0:
+            raise RateLimitedError(f"{self.name}: rate limited for {wait:.1f}s")
+        trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+        if not self.breaker.allow():
+            raise RateLimitedError(f"{self.name}: circuit open")
+        self.bucket.try_acquire()
+        return trial
+
+    def observe(self, resp: aiohttp.ClientResponse):
+        self.bucket.update_from_headers(resp.headers, resp.status)
+        if resp.status == 429 or resp.status >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+
+PROVIDERS: Dict[str, ProviderGuard] = {
+    "anilist": ProviderGuard("anilist", capacity=20, per_minute=85),
+    "jikan": ProviderGuard("jikan", capacity=3, per_minute=55),
+    "google": ProviderGuard("google", capacity=5, per_minute=100 / (24 * 60), failure_threshold=2, reset_timeout=300.0),
+}
+
+
+def get_guard(provider: str) -> ProviderGuard:
+    key = provider.lower().split()[0]
+    guard = PROVIDERS.get(key)
+    if guard is None:
+        guard = PROVIDERS[key] = ProviderGuard(key, capacity=10, per_minute=60)
+    return guard
+
+def rank_providers(providers: Iterable[str], prefer_margin: float = 0.25) -> List[str]:
+    """Providers with budget first, then by observed latency; the first listed wins ties within the margin."""
+    def key(item):
+        idx, provider = item
+        guard = get_guard(provider)
+        latency = guard.latency if guard.latency is not None else 0.0
+        return (not guard.available(), latency - (prefer_margin if idx == 0 else 0.0))
+    return [p for _, p in sorted(enumerate(providers), key=key)]
+
+@asynccontextmanager
+async def guarded(provider: str, max_wait: float = DEFAULT_MAX_WAIT):
+    guard = get_guard(provider)
+    trial = await guard.acquire(max_wait=max_wait)
+    started = time.monotonic()
+    try:
+        yield guard
+        guard.record_latency(time.monotonic() - started)
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+        guard.breaker.record_failure()
+        guard.record_latency(time.monotonic() - started)
+        raise
+    finally:
+        if trial:
+            guard.breaker.release_trial()
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+import aiosqlite
+
+CACHE_DB_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "data", "api_cache.db")
+
+MAX_ENTRIES = 5000
+EVICT_EVERY_WRITES = 50
+
+
+class CachePolicy(NamedTuple):
+    ttl: float
+    stale_ttl: float
+    negative_ttl: float
+
+
+DEFAULT_POLICY = CachePolicy(ttl=6 * 3600, stale_ttl=7 * 24 * 3600, negative_ttl=1800)
+POLICIES: Dict[str, CachePolicy] = {
+    "character": CachePolicy(ttl=24 * 3600, stale_ttl=14 * 24 * 3600, negative_ttl=6 * 3600),
+    "character_page": CachePolicy(ttl=12 * 3600, stale_ttl=14 * 24 * 3600, negative_ttl=600),
+    "media_search": CachePolicy(ttl=6 * 3600, stale_ttl=7 * 24 * 3600, negative_ttl=1800),
+}
+
+_DB: Optional[aiosqlite.Connection] = None
+_DB_LOCK = asyncio.Lock()
+_CLOSED = False
+_INFLIGHT: Dict[str, asyncio.Task] = {}
+_TOUCHED: Dict[str, float] = {}
+_writes_since_evict = 0
+_ws_re = re.compile(r"\s+")
+
+stats = {"fresh": 0, "stale": 0, "negative": 0, "miss": 0, "refresh_errors": 0}
+
+
+async def get_db() -> aiosqlite.Connection:
+    global _DB
+    if _DB is not None:
+        return _DB
+    if _CLOSED:
+        raise aiosqlite.Error("response cache is closed")
+    async with _DB_LOCK:
+        # Re-check under the lock: concurrent first callers must share one connection.
+        if _CLOSED:
+            raise aiosqlite.Error("response cache is closed")
+        if _DB is None:
+            os.makedirs(os.path.dirname(CACHE_DB_FILE), exist_ok=True)
+            conn = await aiosqlite.connect(CACHE_DB_FILE)
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    value TEXT,
+                    negative INTEGER DEFAULT 0,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_api_cache_last_access ON api_cache(last_access)")
+            await conn.commit()
+            _DB = conn
+    return _DB
+
+async def close_db():
+    global _DB, _CLOSED
+    _CLOSED = True
+    pending = list(_INFLIGHT.values())
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    await _flush_touched()
+    async with _DB_LOCK:
+        if _DB is not None:
+            await _DB.close()
+            _DB = None
+
+def make_key(provider: str, kind: str, query: Any) -> str:
+    if isinstance(query, (dict, list, tuple)):
+        norm = json.dumps(query, sort_keys=True, separators=(",", ":"))
+    else:
+        norm = _ws_re.sub(" ", str(query)).strip().casefold()
+    return f"{provider.lower()}:{kind}:{norm}"
+
+async def _read(key: str):
+    conn = await get_db()
+    async with conn.execute("SELECT value, negative, fetched_at FROM api_cache WHERE cache_key = ?", (key,)) as cur:
+        return await cur.fetchone()
+
+async def _write(key: str, provider: str, value: Any):
+    global _writes_since_evict
+    if _CLOSED:
+        return
+    conn = await get_db()
+    now = time.time()
+    async with _DB_LOCK:
+        await conn.execute(
+            "INSERT OR REPLACE INTO api_cache (cache_key, provider, value, negative, fetched_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, provider, None if value is None else json.dumps(value), 1 if value is None else 0, now, now),
+        )
+        await conn.commit()
+    _writes_since_evict += 1
+    if _writes_since_evict >= EVICT_EVERY_WRITES:
+        _writes_since_evict = 0
+        await evict()
+
+async def _flush_touched():
+    if not _TOUCHED or _DB is None:
+        return
+    touched = list(_TOUCHED.items())
+    _TOUCHED.clear()
+    async with _DB_LOCK:
+        await _DB.executemany("UPDATE api_cache SET last_access = ? WHERE cache_key = ?", [(t, k) for k, t in touched])
+        await _DB.commit()
+
+async def evict(max_entries: int = MAX_ENTRIES):
+    if _CLOSED:
+        return
+    conn = await get_db()
+    await _flush_touched()
+    async with _DB_LOCK:
+        async with conn.execute("SELECT COUNT(*) FROM api_cache") as cur:
+            (count,) = await cur.fetchone()
+        if count <= max_entries:
+            return
+        await conn.execute(
+            "DELETE FROM api_cache WHERE cache_key IN (SELECT cache_key FROM api_cache ORDER BY last_access ASC LIMIT ?)",
+            (count - max_entries,),
+        )
+        await conn.commit()
+
+async def _load_and_store(key: str, provider: str, loader: Callable[[], Awaitable[Any]]):
+    value = await loader()
+    await _write(key, provider, value)
+    return value
+
+def _refresh(key: str, provider: str, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(_load_and_store(key, provider, loader))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda t, k=key: _on_refresh_done(k, t))
+    return task
+
+def _on_refresh_done(key: str, task: asyncio.Task):
+    _INFLIGHT.pop(key, None)
+    if not task.cancelled() and task.exception() is not None:
+        stats["refresh_errors"] += 1
+        print(f"[response_cache] refresh failed for {key}: {task.exception()}")
+
+async def cached_call(provider: str, kind: str, query: Any, loader: Callable[[], Awaitable[Any]],
+                      policy: Optional[CachePolicy] = None) -> Any:
+    """Loader returns None for "not found" (negatively cached) and raises on transient errors."""
+    policy = policy or POLICIES.get(kind, DEFAULT_POLICY)
+    key = make_key(provider, kind, query)
+    try:
+        row = await _read(key)
+    except aiosqlite.Error as e:
+        print(f"[response_cache] read failed for {key}: {e}")
+        return await loader()
+
+    if row is not None:
+        value_json, negative, fetched_at = row
+        age = time.time() - fetched_at
+        _TOUCHED[key] = time.time()
+        if negative:
+            if age < policy.negative_ttl:
+                stats["negative"] += 1
+                return None
+        else:
+            value = json.loads(value_json)
+            if age < policy.ttl:
+                stats["fresh"] += 1
+                return value
+            if age < policy.ttl + policy.stale_ttl:
+                stats["stale"] += 1
+                _refresh(key, provider, loader)
+                return value
+
+    stats["miss"] += 1
+    try:
+        return await asyncio.shield(_refresh(key, provider, loader))
+    except Exception:
+        if row is not None and not row[1]:
+            return json.loads(row[0])
+        raise
@@ -0,0 +1,91 @@
+import os
+import threading
+from bisect import bisect_right
+from typing import Dict, NamedTuple, Optional, Tuple
+import discord
+from PIL import Image
+from cogs.utils.constants import EMOJI_PATH
+
+
+class TitleTier(NamedTuple):
+    min_level: int
+    name: str
+    emoji: str
+    badge_file: str
+    color: discord.Color
+
+
+def _tier(min_level: int, name: str, emoji: str, color: discord.Color) -> TitleTier:
+    return TitleTier(min_level, name, emoji, os.path.join(EMOJI_PATH, f"{name.upper()}.png"), color)
+
+
+# Single source of truth for level titles; every lookup below is derived from it.
+TITLE_TABLE: Tuple[TitleTier, ...] = (
+    _tier(0, "Novice", "<:NOVICE:1414508405002862663>", discord.Color.light_gray()),
+    _tier(5, "Warrior", "<:WARRIOR:1414508311650242661>", discord.Color.red()),
+    _tier(10, "Elite", "<:ELITE:1414508395301699724>", discord.Color.orange()),
+    _tier(15, "Champion", "<:CHAMPION:1414508304448749568>", discord.Color.gold()),
+    _tier(20, "Hero", "<:HERO:1414508388812853258>", discord.Color.green()),
+    _tier(25, "Legend", "<:LEGEND:1414508296269856768>", discord.Color.blue()),
+    _tier(30, "Mythic", "<:MYTHIC:1414508380172587099>", discord.Color.purple()),
+    _tier(35, "Ascendant", "<:ASCENDANT:1414508291341684776>", discord.Color.teal()),
+    _tier(40, "Immortal", "<:IMMORTAL:1414508281543524454>", discord.Color.dark_red()),
+    _tier(50, "Celestial", "<:CELESTIAL:1414508342520320070>", discord.Color.dark_blue()),
+    _tier(60, "Transcendent", "<:TRANSCENDENT:1414508273767288832>", discord.Color.dark_purple()),
+    _tier(70, "Aetherborn", "<:AETHERBORN:1414508333951483904>", discord.Color.dark_teal()),
+    _tier(80, "Cosmic", "<:COSMIC:1414508264695005184>", discord.Color.dark_magenta()),
+    _tier(90, "Divine", "<:DIVINE:1414508323763388446>", discord.Color.green()),
+    _tier(100, "Eternal", "<:ETERNAL:1414508351676481536>", discord.Color.red()),
+    _tier(125, "Enlightened", "<:ENLIGHTENED:1414508255744360510>", discord.Color.blue()),
+)
+
+_THRESHOLDS = [t.min_level for t in TITLE_TABLE]
+_TIERS_BY_NAME: Dict[str, TitleTier] = {t.name: t for t in TITLE_TABLE}
+
+TITLE_ORDER = [t.name for t in TITLE_TABLE]
+TITLE_NAMES_LOWER = frozenset(t.name.lower() for t in TITLE_TABLE)
+TITLE_EMOJI_FILES = {t.name: t.badge_file for t in TITLE_TABLE}
+TITLE_COLORS = {t.name: t.color for t in TITLE_TABLE}
+_BADGE_EXISTS = {t.name: os.path.exists(t.badge_file) for t in TITLE_TABLE}
+
+_BADGE_CACHE: Dict[Tuple[str, int, int], Optional[Image.Image]] = {}
+_BADGE_SIZES_LOADED = set()
+_BADGE_LOCK = threading.Lock()
+
+
+def get_tier(level: int) -> TitleTier:
+    idx = bisect_right(_THRESHOLDS, level) - 1
+    return TITLE_TABLE[max(0, idx)]
+
+def get_tier_by_name(title_name: str) -> Optional[TitleTier]:
+    return _TIERS_BY_NAME.get((title_name or "").strip())
+
+def get_title(level: int) -> str:
+    return get_tier(level).name
+
+def get_title_emoji(level: int) -> str:
+    return get_tier(level).emoji
+
+def has_badge(title_name: str) -> bool:
+    return _BADGE_EXISTS.get((title_name or "").strip(), False)
+
+def preload_badges(size: Tuple[int, int]) -> None:
+    w, h = int(size[0]), int(size[1])
+    with _BADGE_LOCK:
+        if (w, h) in _BADGE_SIZES_LOADED:
+            return
+        for tier in TITLE_TABLE:
+            img = None
+            if _BADGE_EXISTS[tier.name]:
+                try:
+                    img = Image.open(tier.badge_file).convert("RGBA").resize((w, h), Image.Resampling.LANCZOS)
+                except (OSError, ValueError):
+                    img = None
+            _BADGE_CACHE[(tier.name, w, h)] = img
+        _BADGE_SIZES_LOADED.add((w, h))
+
+def get_badge(title_name: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+    w, h = int(size[0]), int(size[1])
+    if (w, h) not in _BADGE_SIZES_LOADED:
+        preload_badges((w, h))
+    return _BADGE_CACHE.get(((title_name or "").strip(), w, h))
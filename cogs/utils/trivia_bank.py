@@ -0,0 +1,15 @@
+from typing import List, Optional
+from cogs.utils.content_bank import ContentBank
+
+
+class TriviaBank(ContentBank):
+    def __init__(self, path: str):
+        super().__init__(path, fields=("question", "options", "answer"), name="TriviaBank")
+        self.load()
+
+    @property
+    def total(self) -> int:
+        return len(self)
+
+    def sample(self, guild_id: Optional[int], k: int) -> List[dict]:
+        return super().sample(guild_id or 0, k)
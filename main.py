@@ -4,6 +4,9 @@ import discord
 from discord.ext import commands
 import logging
 from cogs.utils.logging_setup import setup_logging
+from cogs.utils.member_cache import MemberCache
+from cogs.utils.http_client import create_http_session
+from cogs.utils import response_cache
 
 setup_logging(
     level=logging.INFO,
@@ -23,9 +26,14 @@ class Minori(commands.Bot):
         super().__init__(command_prefix='!', intents=intents, help_command=None)
         self.logger = logging.getLogger("Minori")
         self.logger.setLevel(logging.INFO)
+        self.member_cache = MemberCache(self)
+        self.http_session = None
 
     async def setup_hook(self):
         self.logger.info("Running setup_hook...", extra={"phase": "startup"})
+        self.http_session = create_http_session()
+        for event in ("on_member_join", "on_member_update", "on_member_remove", "on_user_update"):
+            self.add_listener(getattr(self.member_cache, event), event)
         extensions = [
             "cogs.general",
             "cogs.search",
@@ -50,6 +58,12 @@ class Minori(commands.Bot):
         except Exception:
             self.logger.exception("Failed to sync slash commands")
 
+    async def close(self):
+        await super().close()
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+        await response_cache.close_db()
+
     async def on_ready(self):
         self.logger.info("Logged in as %s", self.user, extra={"user": str(self.user)})
 
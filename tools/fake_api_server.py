@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import json
+import random
+import re
+import struct
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from aiohttp import web
+
+BASE_NAMES = [
+    "Naruto Uzumaki", "Monkey D. Luffy", "Goku", "Light Yagami", "Eren Yeager", "Levi Ackerman",
+    "Saitama", "Edward Elric", "Spike Spiegel", "Lelouch Lamperouge", "Killua Zoldyck", "Gon Freecss",
+    "Mikasa Ackerman", "Rem", "Megumin", "Kurisu Makise", "Zero Two", "Itachi Uchiha", "Gojo Satoru",
+    "Anya Forger", "Power", "Makima", "Marin Kitagawa", "Frieren",
+]
+ANIME_TITLES = [
+    "Naruto", "One Piece", "Dragon Ball", "Death Note", "Shingeki no Kyojin", "One Punch Man",
+    "Fullmetal Alchemist", "Cowboy Bebop", "Code Geass", "Hunter x Hunter", "Re:Zero", "Konosuba",
+]
+PAGE_SIZE = 50
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+
+
+@dataclass
+class FakeConfig:
+    default: FaultConfig = field(default_factory=FaultConfig)
+    providers: Dict[str, FaultConfig] = field(default_factory=dict)
+    seed: int = 1234
+
+    def for_provider(self, provider: str) -> FaultConfig:
+        return self.providers.get(provider, self.default)
+
+
+def _tiny_png() -> bytes:
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+    raw = b"\x00\xff\x66\xcc"
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+class Fixtures:
+    def __init__(self, base_url: str, path: Optional[str] = None):
+        self.base_url = base_url
+        data = {}
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        names = data.get("characters") or [
+            f"{name} {i}" if i else name for i in range(8) for name in BASE_NAMES
+        ]
+        self.characters = [
+            {
+                "id": idx + 1,
+                "name": name,
+                "anime": ANIME_TITLES[idx % len(ANIME_TITLES)],
+                "image": f"{base_url}/images/char-{idx + 1}.png",
+            }
+            for idx, name in enumerate(names)
+        ]
+        self.by_name = {c["name"].casefold(): c for c in self.characters}
+
+    def page(self, page: int) -> List[dict]:
+        if not self.characters:
+            return []
+        start = ((max(1, page) - 1) * PAGE_SIZE) % len(self.characters)
+        return [self.characters[(start + i) % len(self.characters)] for i in range(PAGE_SIZE)]
+
+    def find(self, search: str) -> Optional[dict]:
+        if not search or "missing" in search.casefold():
+            return None
+        key = search.casefold().strip()
+        if key in self.by_name:
+            return self.by_name[key]
+        for c in self.characters:
+            if key in c["name"].casefold():
+                return c
+        return None
+
+    def anilist_character(self, c: dict) -> dict:
+        return {
+            "id": c["id"],
+            "name": {"full": c["name"]},
+            "image": {"large": c["image"], "medium": c["image"]},
+            "media": {"nodes": [{"id": c["id"], "type": "ANIME", "format": "TV", "title": {"romaji": c["anime"]}}]},
+        }
+
+    def anilist_media(self, search: str) -> List[dict]:
+        matches = [t for t in ANIME_TITLES if search.casefold() in t.casefold()] or ANIME_TITLES[:3]
+        return [
+            {
+                "id": 1000 + i,
+                "title": {"romaji": t, "english": t, "native": t},
+                "description": f"Fixture description for {t}.",
+                "episodes": 12 + i,
+                "status": "FINISHED",
+                "duration": 24,
+                "startDate": {"year": 2010, "month": 1, "day": 1},
+                "endDate": {"year": 2010, "month": 3, "day": 31},
+                "season": "WINTER",
+                "averageScore": 80,
+                "popularity": 100000,
+                "favourites": 5000,
+                "format": "TV",
+                "source": "MANGA",
+                "studios": {"nodes": [{"name": "Fixture Studio"}]},
+                "genres": ["Action"],
+                "coverImage": {"large": f"{self.base_url}/images/cover-{i}.png", "medium": f"{self.base_url}/images/cover-{i}.png"},
+                "bannerImage": None,
+                "siteUrl": f"https://anilist.co/anime/{1000 + i}",
+            }
+            for i, t in enumerate(matches[:5])
+        ]
+
+    def jikan_character(self, c: dict) -> dict:
+        return {
+            "mal_id": c["id"],
+            "name": c["name"],
+            "images": {"jpg": {"image_url": c["image"]}},
+            "anime": [{"title": c["anime"]}],
+        }
+
+
+_ALIAS_RE = re.compile(r"^(q\d+):\s*(\w+)", re.MULTILINE)
+
+
+class FakeAPIServer:
+    def __init__(self, config: Optional[FakeConfig] = None, fixtures_path: Optional[str] = None):
+        self.config = config or FakeConfig()
+        self.fixtures_path = fixtures_path
+        self.fixtures: Optional[Fixtures] = None
+        self.requests = Counter()
+        self.faults = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._png = _tiny_png()
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    def env(self) -> Dict[str, str]:
+        return {
+            "MINORI_ANILIST_URL": f"{self.base_url}/anilist",
+            "MINORI_JIKAN_URL": f"{self.base_url}/jikan",
+            "MINORI_GOOGLE_CSE_URL": f"{self.base_url}/google/customsearch/v1",
+            "MINORI_WAIFU_URL": f"{self.base_url}/waifu/sfw/waifu",
+            "GOOGLE_API_KEY": "fake-key",
+            "SEARCH_ENGINE_ID": "fake-cx",
+        }
+
+    def _app(self) -> web.Application:
+        app = web.Application(middlewares=[self._faults])
+        app.router.add_post("/anilist", self.anilist)
+        app.router.add_get("/jikan/top/characters", self.jikan_top)
+        app.router.add_get("/jikan/characters", self.jikan_search)
+        app.router.add_get("/google/customsearch/v1", self.google_cse)
+        app.router.add_get("/images/{name}", self.image)
+        app.router.add_get("/waifu/sfw/waifu", self.waifu)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self._app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets if site._server else []
+        bound_port = sockets[0].getsockname()[1] if sockets else port
+        self.base_url = f"http://{host}:{bound_port}"
+        self.fixtures = Fixtures(self.base_url, self.fixtures_path)
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _faults(self, request: web.Request, handler):
+        provider = request.path.strip("/").split("/")[0]
+        self.requests[provider] += 1
+        fault = self.config.for_provider(provider)
+        delay = fault.latency_ms + (self._rng.random() * fault.jitter_ms if fault.jitter_ms else 0.0)
+        if delay:
+            await asyncio.sleep(delay / 1000.0)
+        roll = self._rng.random()
+        if roll < fault.rate_limit_rate:
+            self.faults[f"{provider}:429"] += 1
+            return web.json_response(
+                {"error": "rate limited"},
+                status=429,
+                headers={"Retry-After": str(fault.retry_after), "X-RateLimit-Remaining": "0"},
+            )
+        if roll < fault.rate_limit_rate + fault.error_rate:
+            self.faults[f"{provider}:500"] += 1
+            return web.json_response({"error": "fixture failure"}, status=500)
+        return await handler(request)
+
+    async def anilist(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        query = body.get("query") or ""
+        variables = body.get("variables") or {}
+        matches = list(_ALIAS_RE.finditer(query))
+        data, errors = {}, []
+        for i, m in enumerate(matches):
+            alias, root = m.group(1), m.group(2)
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(query)
+            segment = query[m.start():end]
+            if root == "Character":
+                c = self.fixtures.find(variables.get(f"{alias}_search", ""))
+                if c is None:
+                    data[alias] = None
+                    errors.append({"message": "Not Found.", "status": 404, "path": [alias]})
+                else:
+                    data[alias] = self.fixtures.anilist_character(c)
+            elif root == "Page" and "media(" in segment:
+                data[alias] = {"media": self.fixtures.anilist_media(variables.get(f"{alias}_search", ""))}
+            elif root == "Page":
+                page = int(variables.get(f"{alias}_page", 1) or 1)
+                data[alias] = {"characters": [self.fixtures.anilist_character(c) for c in self.fixtures.page(page)]}
+            else:
+                data[alias] = None
+                errors.append({"message": f"Unknown field {root}", "status": 400, "path": [alias]})
+        payload = {"data": data}
+        status = 200
+        if errors:
+            payload["errors"] = errors
+            status = 404 if all(e["status"] == 404 for e in errors) else 400
+        return web.json_response(payload, status=status, headers={"X-RateLimit-Remaining": "80"})
+
+    async def jikan_top(self, request: web.Request) -> web.Response:
+        page = int(request.query.get("page", "1") or 1)
+        return web.json_response({"data": [self.fixtures.jikan_character(c) for c in self.fixtures.page(page)]})
+
+    async def jikan_search(self, request: web.Request) -> web.Response:
+        c = self.fixtures.find(request.query.get("q", ""))
+        return web.json_response({"data": [self.fixtures.jikan_character(c)] if c else []})
+
+    async def google_cse(self, request: web.Request) -> web.Response:
+        q = request.query.get("q", "")
+        seed = zlib.crc32(q.encode("utf-8"))
+        items = []
+        for i in range(6):
+            # Every third link is dead so validators have something to reject.
+            name = f"broken-{seed}-{i}.png" if i % 3 == 0 else f"google-{seed}-{i}.png"
+            items.append({"link": f"{self.base_url}/images/{name}"})
+        return web.json_response({"items": items})
+
+    async def image(self, request: web.Request) -> web.Response:
+        name = request.match_info["name"]
+        if name.startswith("broken"):
+            return web.Response(status=404, text="not found")
+        if request.headers.get("Range"):
+            return web.Response(
+                status=206,
+                body=self._png[:1],
+                headers={"Content-Type": "image/png", "Content-Range": f"bytes 0-0/{len(self._png)}"},
+            )
+        return web.Response(body=self._png, content_type="image/png")
+
+    async def waifu(self, request: web.Request) -> web.Response:
+        n = self._rng.randint(1, 10000)
+        return web.json_response({"url": f"{self.base_url}/images/waifu-{n}.png"})
+
+
+def _fault_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--jitter-ms", type=float, default=60.0)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.02)
+    parser.add_argument("--slow-provider", default=None, help="Provider name (anilist/jikan/google/images) to slow down")
+    parser.add_argument("--slow-latency-ms", type=float, default=1500.0)
+    parser.add_argument("--fixtures", default=None, help="Optional JSON file with a 'characters' name list")
+
+def config_from_args(args) -> FakeConfig:
+    default = FaultConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+    providers = {}
+    if args.slow_provider:
+        providers[args.slow_provider] = FaultConfig(args.slow_latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+    return FakeConfig(default=default, providers=providers)
+
+
+async def _serve(args):
+    server = FakeAPIServer(config_from_args(args), fixtures_path=args.fixtures)
+    base_url = await server.start(args.host, args.port)
+    print(f"Fake API server listening on {base_url}")
+    for key, value in server.env().items():
+        print(f"export {key}={value}")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in for AniList, Jikan, Google CSE and waifu.pics")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    _fault_args(parser)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
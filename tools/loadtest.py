@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tools.fake_api_server import BASE_NAMES, ANIME_TITLES, FakeAPIServer, _fault_args, config_from_args
+
+PFP_QUERIES = [f"{n} pfp" for n in BASE_NAMES] + [n for n in BASE_NAMES] + ["missing person", "someone missing hd"]
+ANIME_QUERIES = ANIME_TITLES + ["piece", "alchemist", "no such show"]
+
+
+def _leaked_threads():
+    return [t for t in threading.enumerate() if t is not threading.main_thread() and not t.daemon]
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+async def run(args):
+    server = FakeAPIServer(config_from_args(args), fixtures_path=args.fixtures)
+    await server.start()
+    os.environ.update(server.env())
+
+    # Imported after the environment points the API URLs at the fake server.
+    from cogs.utils import response_cache, character_pool
+    from cogs.utils.anilist_batch import get_batcher
+    from cogs.utils.http_client import IMAGE_CHECK_TIMEOUT, create_http_session
+    from cogs.utils.rate_limit import PROVIDERS
+    from cogs.utils.anime_api import search_anime_media, fetch_random_character, build_character_select_options
+    from cogs.search import Search
+
+    tmpdir = tempfile.mkdtemp(prefix="minori-loadtest-")
+    response_cache.CACHE_DB_FILE = os.path.join(tmpdir, "api_cache.db")
+    character_pool.PAGE_DELAY_SECONDS = 0.0
+    pool = character_pool.CharacterPool(path=os.path.join(tmpdir, "character_pool.json"))
+
+    session = create_http_session()
+    search = Search(SimpleNamespace(http_session=session))
+    rng = random.Random(args.seed)
+
+    async def flow_anime():
+        results = await search_anime_media(rng.choice(ANIME_QUERIES), session=session)
+        return results is not None
+
+    async def flow_animepfp():
+        name = rng.choice(PFP_QUERIES)
+        char, official = await search._find_official_image(name, IMAGE_CHECK_TIMEOUT)
+        if official:
+            return True
+        character_name = (char.get("name") or {}).get("full") if char else name
+        return bool(await search._find_google_image(character_name, None, IMAGE_CHECK_TIMEOUT))
+
+    async def flow_guesscharacter():
+        picked = pool.pick_game()
+        if picked:
+            return True
+        character = await fetch_random_character(prefer="AniList", session=session)
+        options = await build_character_select_options(character["name"], character["source"], session=session)
+        return len(options) >= 2
+
+    flows = {"anime": flow_anime, "animepfp": flow_animepfp, "guesscharacter": flow_guesscharacter}
+    selected = [f for f in args.flows.split(",") if f in flows]
+    latencies = defaultdict(list)
+    failures = defaultdict(int)
+
+    if args.pool:
+        started = time.perf_counter()
+        size = await pool.refill(session=session)
+        print(f"Character pool refilled with {size} entries in {time.perf_counter() - started:.2f}s")
+
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        name = selected[i % len(selected)]
+        async with sem:
+            started = time.perf_counter()
+            try:
+                ok = await asyncio.wait_for(flows[name](), timeout=args.timeout)
+            except Exception:
+                ok = False
+            latencies[name].append((time.perf_counter() - started) * 1000.0)
+            if not ok:
+                failures[name] += 1
+
+    wall = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(args.iterations)))
+    finally:
+        wall = time.perf_counter() - wall
+        await session.close()
+        await response_cache.close_db()
+        await server.stop()
+
+    print(f"\n{args.iterations} flows in {wall:.2f}s (concurrency {args.concurrency})")
+    print(f"{'flow':<16}{'n':>6}{'fail':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name in selected:
+        vals = latencies[name]
+        if not vals:
+            continue
+        print(f"{name:<16}{len(vals):>6}{failures[name]:>6}"
+              f"{statistics.median(vals):>9.1f}{_percentile(vals, 95):>9.1f}{_percentile(vals, 99):>9.1f}{max(vals):>9.1f}")
+
+    cache = response_cache.stats
+    lookups = cache["fresh"] + cache["stale"] + cache["negative"] + cache["miss"]
+    hit_rate = (lookups - cache["miss"]) / lookups if lookups else 0.0
+    print(f"\nresponse cache: {dict(cache)} hit rate {hit_rate:.1%}")
+    batcher = get_batcher().stats
+    print(f"anilist batcher: {batcher['lookups']} lookups in {batcher['requests']} requests")
+    for name, guard in PROVIDERS.items():
+        latency = f"{guard.latency * 1000:.0f}ms" if guard.latency is not None else "n/a"
+        print(f"provider {name:<8} breaker={guard.breaker.state:<9} failures={guard.breaker.failures} ewma={latency}")
+    print(f"server requests: {dict(server.requests)}")
+    print(f"injected faults: {dict(server.faults)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive /anime, /animepfp and /guesscharacter flows against the fake API server")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--flows", default="anime,animepfp,guesscharacter")
+    parser.add_argument("--pool", action="store_true", help="Refill the character pool before the run")
+    parser.add_argument("--seed", type=int, default=7)
+    _fault_args(parser)
+    asyncio.run(run(parser.parse_args()))
+    # A leftover non-daemon thread (e.g. an unclosed aiosqlite connection) would keep the
+    # interpreter alive after the report; fail loudly instead of hanging a CI run.
+    leaked = _leaked_threads()
+    if leaked:
+        print(f"\nleaked threads after shutdown: {', '.join(t.name for t in leaked)}", flush=True)
+        os._exit(1)